@@ -1,28 +1,22 @@
 
-import requests
-from bs4 import BeautifulSoup
 import re
+import os
+import sys
 
-def extrair_dados_ministro():
-    """
-    Realiza o web scraping dos dados do Ministro a partir do site oficial do MAPA.
-    """
-    url = "https://www.gov.br/agricultura/pt-br/acesso-a-informacao/institucional/quem-e-quem-novo/ministro-e-staff"
-    headers = {
-        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
-    }
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from coleta import cache_http, contatos, expressoes, parsers
+from coleta.indice import IndiceTexto
 
-    try:
-        # Fazer a requisição HTTP
-        response = requests.get(url, headers=headers, timeout=15)
-        response.raise_for_status()
-    except Exception as e:
-        print(f"Erro ao acessar a página: {e}")
-        return None
+# Telefone com barras, 10+ caracteres. Sem o prefixo "(?:Tel:)?\s*", que não muda o
+# grupo mas deixava a busca quadrática em sequências longas de espaços.
+TEL_RE = expressoes.compilar(r"(\(?\d{2}\)?[\s\d/-]{8,})")
 
-    # Ler o HTML retornado
-    soup = BeautifulSoup(response.content, "html.parser")
+URL = "https://www.gov.br/agricultura/pt-br/acesso-a-informacao/institucional/quem-e-quem-novo/ministro-e-staff"
 
+def extract_minister(soup):
+    """
+    Extrai os dados do Ministro da página "Ministro e staff" do MAPA.
+    """
     # Estrutura para os dados finais
     dados = {
         "nome": "Não encontrado",
@@ -34,13 +28,13 @@ def extrair_dados_ministro():
     # Padrão para identificar a linha do Ministro/Ministra
     padrao_ministro = re.compile(r"Ministr[ao] de Estado", re.I)
     
-    # Busca dinâmica no HTML
-    for div in soup.find_all("div"):
-        texto_div = div.get_text(strip=True)
-        
+    # Busca dinâmica no HTML (o índice calcula o texto de todas as divs em uma única passada)
+    indice = IndiceTexto(soup)
+    for div in indice.por_tag("div"):
         # Identifica se a div contém o cargo de Ministro (e não é gabinete ou assessoria)
-        if padrao_ministro.search(texto_div) and not any(x in texto_div for x in ["Gabinete", "Assessoria", "Adjunto"]):
-            
+        if indice.busca(padrao_ministro, div) and not any(indice.contem(div, x) for x in ["Gabinete", "Assessoria", "Adjunto"]):
+            texto_div = indice.texto(div)
+
             # 1. Extrair Nome
             # Geralmente no formato: "Cargo – NOME – Curriculum" ou similar
             match_nome = re.search(r"–\s*([^–-]+?)\s*-", texto_div)
@@ -62,15 +56,15 @@ def extrair_dados_ministro():
                 
                 # Procura telefone se ainda não tiver encontrado
                 if dados["telefone"] == "Não encontrado":
-                    match_tel = re.search(r"(?:Tel:)?\s*(\(?\d{2}\)?[\s\d/-]{8,})", txt)
+                    match_tel = TEL_RE.search(txt)
                     if match_tel:
                         dados["telefone"] = match_tel.group(1).strip()
 
                 # Procura e-mail se ainda não tiver encontrado
                 if dados["e-mail"] == "Não encontrado":
-                    match_email = re.search(r"([a-z0-9._%+-]+@[a-z0-9.-]+\.[a-z]{2,})", txt, re.I)
+                    match_email = contatos.EMAIL_ASCII.search(txt)
                     if match_email:
-                        dados["e-mail"] = match_email.group(1).strip()
+                        dados["e-mail"] = match_email.group().strip()
                 
                 if dados["telefone"] != "Não encontrado" and dados["e-mail"] != "Não encontrado":
                     break
@@ -80,6 +74,25 @@ def extrair_dados_ministro():
 
     return dados
 
+def extrair_dados_ministro():
+    """
+    Realiza o web scraping dos dados do Ministro a partir do site oficial do MAPA.
+    """
+    headers = {
+        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
+    }
+
+    try:
+        # Fazer a requisição HTTP
+        response = cache_http.get(URL, headers=headers, timeout=15)
+        response.raise_for_status()
+    except Exception as e:
+        print(f"Erro ao acessar a página: {e}")
+        return None
+
+    # Ler o HTML retornado
+    return extract_minister(parsers.criar_soup(response.content))
+
 if __name__ == "__main__":
     print("Iniciando Web Scraping...")
     resultado = extrair_dados_ministro()
@@ -1,26 +1,17 @@
 
-import requests
-from bs4 import BeautifulSoup
 import re
+import os
+import sys
 
-def extrair_dados_ministra_cultura():
-    """
-    Realiza o web scraping dos dados da Ministra da Cultura a partir da URL informada.
-    """
-    url = "https://www.gov.br/cultura/pt-br/composicao/gabinete-da-ministra"
-    headers = {
-        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
-    }
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from coleta import cache_http, contatos, parsers
 
-    try:
-        response = requests.get(url, headers=headers, timeout=15)
-        response.raise_for_status()
-    except Exception as e:
-        print(f"Erro ao acessar a página: {e}")
-        return None
-
-    soup = BeautifulSoup(response.content, "html.parser")
+URL = "https://www.gov.br/cultura/pt-br/composicao/gabinete-da-ministra"
 
+def extract_minister(soup):
+    """
+    Extrai os dados da Ministra da Cultura da página do gabinete.
+    """
     dados = {
         "nome": "Não encontrado",
         "cargo": "Ministro de Estado da Cultura", # Normalizado conforme solicitação posterior
@@ -51,14 +42,14 @@ def extrair_dados_ministra_cultura():
     
     # Busca de Telefone (padrão Brasil)
     # Tenta encontrar algo no formato (XX) XXXX-XXXX ou similar
-    match_tel = re.search(r"\(?\d{2}\)?\s?\d{4,5}-?\d{4}", conteudo_texto)
+    match_tel = contatos.TELEFONE.search(conteudo_texto)
     if match_tel:
         dados["telefone"] = match_tel.group(0).strip()
     
     # Busca de E-mail
-    match_email = re.search(r"([a-z0-9._%+-]+@[a-z0-9.-]+\.[a-z]{2,})", conteudo_texto, re.I)
+    match_email = contatos.EMAIL_ASCII.search(conteudo_texto)
     if match_email:
-        dados["e-mail"] = match_email.group(1).strip()
+        dados["e-mail"] = match_email.group().strip()
     
     # Caso especial: se houver contato no rodapé ou em blocos específicos
     # No caso do MinC, se não encontrarmos, verificamos se há algum link 'mailto'
@@ -69,6 +60,23 @@ def extrair_dados_ministra_cultura():
 
     return dados
 
+def extrair_dados_ministra_cultura():
+    """
+    Realiza o web scraping dos dados da Ministra da Cultura a partir da URL informada.
+    """
+    headers = {
+        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
+    }
+
+    try:
+        response = cache_http.get(URL, headers=headers, timeout=15)
+        response.raise_for_status()
+    except Exception as e:
+        print(f"Erro ao acessar a página: {e}")
+        return None
+
+    return extract_minister(parsers.criar_soup(response.content))
+
 if __name__ == "__main__":
     print("Iniciando Web Scraping (Ministério da Cultura)...")
     resultado = extrair_dados_ministra_cultura()
@@ -1,9 +1,11 @@
-import requests
-from bs4 import BeautifulSoup
 import re
 import json
 import csv
 import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from coleta import cache_http, contatos, parsers, telefones
 
 URL = "https://www.gov.br/saude/pt-br/composicao/quem-e-quem"
 
@@ -12,9 +14,9 @@ def get_soup(url):
         "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
     }
     try:
-        resp = requests.get(url, headers=headers, timeout=15)
+        resp = cache_http.get(url, headers=headers, timeout=15)
         resp.raise_for_status()
-        return BeautifulSoup(resp.content, "html.parser")
+        return parsers.criar_soup(resp.content)
     except Exception as e:
         print(f"Erro ao acessar {url}: {e}")
         return None
@@ -50,27 +52,12 @@ def extract_minister(soup, base_url=URL):
                 phone_p = container.find("p", class_="telefone")
                 if phone_p:
                     phone_text = phone_p.get_text(" ", strip=True)
-                    # Pattern for full numbers
-                    full_pattern = r'\(?\d{2}\)?\s?\d{4,5}-?\d{4}'
-                    primary_numbers = re.findall(full_pattern, phone_text)
-                    
-                    # Look for suffixes (like /2580)
-                    suffixes = re.findall(r'/(\d{4})', phone_text)
-                    
-                    final_phones = []
-                    for p in primary_numbers:
-                        final_phones.append(p)
-                        if suffixes:
-                            # Reconstruct from prefix (e.g., (61) 3315-XXXX)
-                            prefix_match = re.match(r'(\(?\d{2}\)?\s?\d{4,5}-?)', p)
-                            if prefix_match:
-                                prefix = prefix_match.group(1)
-                                for s in suffixes:
-                                    final_phones.append(f"{prefix}{s}")
+                    # Full numbers and suffixes (like /2580) expanded against the prefix
+                    final_phones = telefones.expandir(phone_text, soltos=False)
                     
                     if not final_phones:
                         # Fallback to general regex if no primary found with full pattern
-                        final_phones = re.findall(full_pattern, phone_text)
+                        final_phones = contatos.TELEFONE.findall(phone_text)
                         
                     phones = final_phones
                 
@@ -78,11 +65,11 @@ def extract_minister(soup, base_url=URL):
                 email_p = container.find("p", class_="email")
                 if email_p:
                     email_text = email_p.get_text(" ", strip=True)
-                    emails = re.findall(r'[\w\.-]+@[\w\.-]+', email_text)
+                    emails = contatos.EMAIL.findall(email_text)
                 
                 # If emails not found in dedicated p, search whole container
                 if not emails:
-                    emails = re.findall(r'[\w\.-]+@[\w\.-]+', container.get_text())
+                    emails = contatos.EMAIL.findall(container.get_text())
                 
                 break
 
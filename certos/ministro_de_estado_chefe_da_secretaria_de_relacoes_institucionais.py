@@ -1,7 +1,10 @@
 import re
 import json
-import requests
-from bs4 import BeautifulSoup
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from coleta import cache_http, parsers
 
 URL = "https://www.gov.br/sri/pt-br/composicao/ministra-1"
 
@@ -77,9 +80,9 @@ def clean_cargo_text(text: str) -> str:
 
 def scrape(url=URL):
 	headers = {"User-Agent": "Mozilla/5.0 (compatible; scraper/1.0)"}
-	r = requests.get(url, headers=headers, timeout=15)
+	r = cache_http.get(url, headers=headers, timeout=15)
 	r.raise_for_status()
-	soup = BeautifulSoup(r.text, 'html.parser')
+	soup = parsers.criar_soup(r.text)
 
 	# Nome: normalmente no primeiro h1
 	name_tag = soup.find(['h1', 'h2'])
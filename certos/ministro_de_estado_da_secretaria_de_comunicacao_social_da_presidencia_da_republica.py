@@ -1,18 +1,14 @@
 import requests
-from bs4 import BeautifulSoup
 import json
+import os
+import sys
 
-def get_minister_info():
-    url = "https://www.gov.br/secom/pt-br/acesso-a-informacao/institucional/quem-e-quem"
-    try:
-        response = requests.get(url, timeout=10)
-        response.raise_for_status()
-    except requests.RequestException as e:
-        print(f"Error fetching URL: {e}")
-        return
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from coleta import cache_http, parsers
 
-    soup = BeautifulSoup(response.content, 'html.parser')
+URL = "https://www.gov.br/secom/pt-br/acesso-a-informacao/institucional/quem-e-quem"
 
+def extract_minister(soup):
     # Strategy: Find the cargo paragraph that contains "Ministro de Estado" or "Ministra de Estado"
     # and then get the parent container to extract other details.
     
@@ -20,8 +16,7 @@ def get_minister_info():
                              ("Ministro de Estado" in tag.text or "Ministra de Estado" in tag.text))
 
     if not cargo_element:
-        print("Minister information not found.")
-        return
+        return None
 
     # normalization: "Ministra" -> "Ministro"
     cargo_text = cargo_element.get_text(strip=True)
@@ -33,8 +28,7 @@ def get_minister_info():
     container = cargo_element.find_parent("div")
     
     if not container:
-        print("Container for minister details not found.")
-        return
+        return None
 
     # Name
     name_tag = container.find("p", class_="nome")
@@ -64,6 +58,21 @@ def get_minister_info():
         "Telefone": phone,
         "Email": email
     }
+    return data
+
+def get_minister_info():
+    try:
+        response = cache_http.get(URL, timeout=10)
+        response.raise_for_status()
+    except requests.RequestException as e:
+        print(f"Error fetching URL: {e}")
+        return
+
+    soup = parsers.criar_soup(response.content)
+    data = extract_minister(soup)
+    if not data:
+        print("Minister information not found.")
+        return
 
     # Print nicely formatted JSON
     print(json.dumps(data, indent=4, ensure_ascii=False))
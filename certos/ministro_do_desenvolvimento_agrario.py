@@ -1,9 +1,10 @@
-import requests
-from bs4 import BeautifulSoup
-import re
 import json
 import csv
 import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from coleta import cache_http, contatos, parsers, telefones
 
 URL = "https://www.gov.br/mda/pt-br/acesso-a-informacao/institucional/quem-e-quem/gabinete-do-ministro"
 
@@ -12,9 +13,9 @@ def get_soup(url):
         "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
     }
     try:
-        resp = requests.get(url, headers=headers, timeout=15)
+        resp = cache_http.get(url, headers=headers, timeout=15)
         resp.raise_for_status()
-        return BeautifulSoup(resp.content, "html.parser")
+        return parsers.criar_soup(resp.content)
     except Exception as e:
         print(f"Erro ao acessar {url}: {e}")
         return None
@@ -51,25 +52,10 @@ def extract_minister(soup, base_url=URL):
                 
                 text = container.get_text(" ", strip=True)
                 
-                # Extract phones
-                phones_found = re.findall(r'\(?\d{2}\)?\s?\d{4,5}-?\d{4}', text)
-                # Handle suffixes like / 2672
-                suffixes = re.findall(r'/\s*(\d{4})', text)
-                
-                final_phones = []
-                for p in phones_found:
-                    final_phones.append(p)
-                    if suffixes:
-                        prefix_match = re.match(r'(\(?\d{2}\)?\s?\d{4,5}-?)', p)
-                        if prefix_match:
-                            prefix = prefix_match.group(1)
-                            for s in suffixes:
-                                final_phones.append(f"{prefix}{s}")
-                
-                phones = list(dict.fromkeys(final_phones))
+                # Extract emails, and phones with suffixes like / 2672 expanded
+                emails = contatos.EMAIL.findall(text)
+                phones = telefones.expandir(text, soltos=False)
                 
-                # Extract emails
-                emails = re.findall(r'[\w\.-]+@[\w\.-]+', text)
                 # Cleanup mailto: if any
                 emails = [e.replace("mailto:", "") for e in emails]
 
@@ -1,8 +1,13 @@
 import requests
-from bs4 import BeautifulSoup
 import pandas as pd
 import json
 from datetime import datetime
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from coleta import cache_http, contatos, parsers, telefones
+from coleta.indice import IndiceTexto
 
 # URL do site
 URL = "https://www.gov.br/casacivil/pt-br/composicao/gabinete-do-ministro/quem-e-quem-1"
@@ -15,7 +20,7 @@ def fazer_requisicao(url):
         headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
         }
-        response = requests.get(url, headers=headers, timeout=10)
+        response = cache_http.get(url, headers=headers, timeout=10)
         response.raise_for_status()
         return response.text
     except requests.exceptions.RequestException as e:
@@ -26,7 +31,7 @@ def extrair_dados(html):
     """
     Extrai os dados dos ministros e membros do gabinete
     """
-    soup = BeautifulSoup(html, 'html.parser')
+    soup = parsers.criar_soup(html)
     dados = []
 
     # 1) Localiza a célula que contém o Ministro (normalmente a primeira tabela/linha relevante)
@@ -63,7 +68,9 @@ def extrair_dados(html):
     gabinete_telefone = ''
     gabinete_email = ''
     # varre blocos de texto procurando por palavras-chave
-    all_blocks = [b.get_text(separator='\n', strip=True) for b in soup.find_all(['div','section','table','td','p'])]
+    # (o índice calcula o texto de todos os blocos em uma única passada; só os que citam o Gabinete são copiados)
+    indice = IndiceTexto(soup, separador='\n')
+    all_blocks = (indice.texto(b) for b in indice.por_tag(['div','section','table','td','p']) if indice.contem(b, 'Gabinete'))
     for block in all_blocks:
         if 'Gabinete' in block or 'Gabinete do Ministro' in block or 'Chefe de Gabinete' in block:
             # procura telefones e emails no bloco
@@ -79,15 +86,13 @@ def extrair_dados(html):
 
     # fallback: busca global por qualquer email/telefone se não encontrado no bloco "Gabinete"
     if not gabinete_email:
-        import re as _re
         all_text = soup.get_text('\n')
-        emails = _re.findall(r'[\w\.-]+@[\w\.-]+\.[A-Za-z]{2,}', all_text)
+        emails = contatos.EMAIL_COMPLETO.findall(all_text)
         if emails:
             gabinete_email = emails[0]
     if not gabinete_telefone:
-        import re as _re
         all_text = soup.get_text('\n')
-        phones = _re.findall(r'\(?\d{2}\)?\s*\d{4,5}[-/\s]?\d{4}', all_text)
+        phones = telefones.expandir(all_text, soltos=False)
         if phones:
             gabinete_telefone = ' / '.join(phones[:3])
 
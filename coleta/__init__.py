@@ -0,0 +1,3 @@
+"""
+Código compartilhado pelos scripts de coleta dos ministros (certos/, falta/ e raiz).
+"""
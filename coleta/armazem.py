@@ -0,0 +1,323 @@
+"""
+Armazém em disco das páginas baixadas, endereçado por conteúdo.
+
+Estrutura do diretório:
+    corpos/<sha256>.html   corpo da página (corpos idênticos são gravados uma vez)
+    urls/<sha1 da url>.json  metadados por URL: hash do corpo, status, cabeçalhos,
+                             ETag/Last-Modified, horário da busca e registros extraídos
+
+- TTL: dentro do prazo a página é servida direto do disco, sem rede;
+- limite de tamanho: ao passar do limite, as URLs menos usadas recentemente
+  (LRU, pelo mtime do arquivo de metadados) são removidas junto com os corpos
+  que deixaram de ser referenciados. A poda lê os metadados de todas as URLs,
+  então não roda a cada gravação: um contador em disco (.pendentes) soma os
+  bytes de corpos novos e ela roda quando eles passam de PODA_BYTES;
+- vários scrapers podem usar o mesmo diretório ao mesmo tempo: toda gravação é
+  atômica (arquivo temporário + os.replace) e as alterações de metadados usam
+  uma trava de arquivo.
+
+Uso:
+    python -m coleta.armazem            # estatísticas
+    python -m coleta.armazem --podar    # aplica o limite de tamanho
+"""
+import argparse
+import hashlib
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+from coleta.ministerios import RAIZ
+
+DIRETORIO = os.environ.get("COLETA_CACHE", os.path.join(RAIZ, ".cache", "http"))
+TTL = float(os.environ.get("COLETA_CACHE_TTL", 15 * 60))
+LIMITE_BYTES = int(float(os.environ.get("COLETA_CACHE_LIMITE_MB", 200)) * 1024 * 1024)
+# Bytes de corpos novos entre uma poda e a próxima (padrão: um décimo do limite)
+PODA_BYTES = int(float(os.environ.get("COLETA_CACHE_PODA_MB", 0)) * 1024 * 1024) or None
+
+_trava_threads = threading.Lock()
+_travas_por_arquivo = {}
+
+
+def gravar_atomico(caminho, dados):
+    temporario = f"{caminho}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(temporario, "wb") as f:
+        f.write(dados)
+    os.replace(temporario, caminho)
+
+
+@contextmanager
+def trava_de_arquivo(caminho):
+    """
+    Trava exclusiva entre threads e entre processos sobre o arquivo caminho
+    """
+    with _trava_threads:
+        trava = _travas_por_arquivo.setdefault(os.path.abspath(caminho), threading.Lock())
+    with trava:
+        with open(caminho, "a+b") as f:
+            if fcntl:
+                fcntl.flock(f, fcntl.LOCK_EX)
+            else:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+            try:
+                yield
+            finally:
+                if fcntl:
+                    fcntl.flock(f, fcntl.LOCK_UN)
+                else:
+                    f.seek(0)
+                    msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def hash_conteudo(conteudo):
+    return hashlib.sha256(conteudo).hexdigest()
+
+
+class ArmazemHTML:
+    """
+    Cache de páginas em disco com TTL, limite de tamanho e remoção LRU
+    """
+
+    def __init__(self, diretorio=DIRETORIO, ttl=TTL, limite_bytes=LIMITE_BYTES, poda_bytes=PODA_BYTES):
+        self.diretorio = diretorio
+        self.ttl = ttl
+        self.limite_bytes = limite_bytes
+        self.poda_bytes = poda_bytes or max(1, limite_bytes // 10)
+        self.dir_corpos = os.path.join(diretorio, "corpos")
+        self.dir_urls = os.path.join(diretorio, "urls")
+        # Bytes de corpos gravados desde a última poda, somados por todos os processos
+        self.arquivo_pendentes = os.path.join(diretorio, ".pendentes")
+
+    # --- caminhos e trava -------------------------------------------------
+
+    def _caminho_url(self, url):
+        return os.path.join(self.dir_urls, hashlib.sha1(url.encode("utf-8")).hexdigest() + ".json")
+
+    def _caminho_corpo(self, sha256):
+        return os.path.join(self.dir_corpos, sha256 + ".html")
+
+    def _trava(self):
+        """
+        Trava entre threads e entre processos (arquivo .trava no diretório)
+        """
+        os.makedirs(self.diretorio, exist_ok=True)
+        return trava_de_arquivo(os.path.join(self.diretorio, ".trava"))
+
+    # --- leitura ------------------------------------------------------------
+
+    def ler(self, url):
+        """
+        Retorna os metadados da URL ou None. Marca a URL como usada (LRU).
+        """
+        caminho = self._caminho_url(url)
+        try:
+            with open(caminho, encoding="utf-8") as f:
+                entrada = json.load(f)
+        except (OSError, ValueError):
+            return None
+        try:
+            os.utime(caminho)
+        except OSError:
+            pass
+        return entrada
+
+    def corpo(self, entrada):
+        """
+        Retorna o corpo referenciado pela entrada (ou None se já foi removido)
+        """
+        if not entrada or not entrada.get("sha256"):
+            return None
+        try:
+            with open(self._caminho_corpo(entrada["sha256"]), "rb") as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def fresco(self, entrada):
+        """
+        True se a entrada ainda está dentro do TTL
+        """
+        if not entrada or self.ttl <= 0:
+            return False
+        return time.time() - entrada.get("buscado_em", 0) < self.ttl
+
+    # --- escrita ------------------------------------------------------------
+
+    def guardar(self, url, conteudo, status=200, headers=None, encoding=None):
+        """
+        Salva o corpo (uma vez por conteúdo) e atualiza os metadados da URL.
+        Se o conteúdo não mudou, os registros já extraídos são mantidos.
+        Retorna (entrada, conteudo_mudou).
+        """
+        headers = dict(headers or {})
+        minusculas = {k.lower(): v for k, v in headers.items()}
+        sha256 = hash_conteudo(conteudo)
+        caminho_corpo = self._caminho_corpo(sha256)
+        with self._trava():
+            os.makedirs(self.dir_corpos, exist_ok=True)
+            os.makedirs(self.dir_urls, exist_ok=True)
+            podar = False
+            if not os.path.exists(caminho_corpo):
+                gravar_atomico(caminho_corpo, conteudo)
+                podar = self._somar_pendentes(len(conteudo)) >= self.poda_bytes
+
+            anterior = self.ler(url)
+            mudou = not anterior or anterior.get("sha256") != sha256
+            entrada = {
+                "url": url,
+                "sha256": sha256,
+                "tamanho": len(conteudo),
+                "status": status,
+                "headers": headers,
+                "etag": minusculas.get("etag"),
+                "last_modified": minusculas.get("last-modified"),
+                "encoding": encoding,
+                "buscado_em": time.time(),
+                "registros": {} if mudou else anterior.get("registros", {}),
+            }
+            self._salvar_entrada(url, entrada)
+        if podar:
+            self.podar()
+        return entrada, mudou
+
+    def revalidar(self, url):
+        """
+        Marca a entrada como buscada agora (após um 304), renovando o TTL
+        """
+        with self._trava():
+            entrada = self.ler(url)
+            if entrada is not None:
+                entrada["buscado_em"] = time.time()
+                self._salvar_entrada(url, entrada)
+        return entrada
+
+    def salvar_registro(self, url, chave, registro):
+        """
+        Associa um registro extraído à versão atual da página
+        """
+        with self._trava():
+            entrada = self.ler(url)
+            if entrada is not None:
+                entrada.setdefault("registros", {})[chave] = registro
+                self._salvar_entrada(url, entrada)
+
+    def _somar_pendentes(self, tamanho):
+        """
+        Soma tamanho ao contador de bytes desde a última poda (com a trava
+        tomada) e retorna o novo total
+        """
+        try:
+            with open(self.arquivo_pendentes, encoding="utf-8") as f:
+                pendentes = int(f.read() or 0)
+        except (OSError, ValueError):
+            pendentes = 0
+        pendentes += tamanho
+        gravar_atomico(self.arquivo_pendentes, str(pendentes).encode("utf-8"))
+        return pendentes
+
+    def _salvar_entrada(self, url, entrada):
+        dados = json.dumps(entrada, ensure_ascii=False).encode("utf-8")
+        gravar_atomico(self._caminho_url(url), dados)
+
+    # --- tamanho e remoção --------------------------------------------------
+
+    def _entradas(self):
+        """
+        Lista (mtime, caminho, entrada) de todas as URLs salvas
+        """
+        itens = []
+        if not os.path.isdir(self.dir_urls):
+            return itens
+        for nome in os.listdir(self.dir_urls):
+            if not nome.endswith(".json"):
+                continue
+            caminho = os.path.join(self.dir_urls, nome)
+            try:
+                mtime = os.path.getmtime(caminho)
+                with open(caminho, encoding="utf-8") as f:
+                    itens.append((mtime, caminho, json.load(f)))
+            except (OSError, ValueError):
+                continue
+        return itens
+
+    def podar(self):
+        """
+        Remove URLs menos usadas recentemente até o total de corpos caber no
+        limite, e apaga corpos que não são mais referenciados. Retorna o número
+        de URLs removidas.
+        """
+        with self._trava():
+            itens = sorted(self._entradas(), key=lambda i: i[0])
+            referencias = {}
+            for _, _, entrada in itens:
+                referencias[entrada.get("sha256")] = referencias.get(entrada.get("sha256"), 0) + 1
+            tamanhos = {e.get("sha256"): e.get("tamanho", 0) for _, _, e in itens}
+            total = sum(tamanhos.values())
+
+            removidas = 0
+            for _, caminho, entrada in itens:
+                if total <= self.limite_bytes:
+                    break
+                os.remove(caminho)
+                removidas += 1
+                sha256 = entrada.get("sha256")
+                referencias[sha256] -= 1
+                if referencias[sha256] == 0:
+                    total -= tamanhos[sha256]
+
+            if os.path.isdir(self.dir_corpos):
+                for nome in os.listdir(self.dir_corpos):
+                    sha256 = nome.split(".", 1)[0]
+                    if nome.endswith(".html") and referencias.get(sha256, 0) == 0:
+                        os.remove(os.path.join(self.dir_corpos, nome))
+            if os.path.isdir(self.diretorio):
+                gravar_atomico(self.arquivo_pendentes, b"0")
+        return removidas
+
+    def estatisticas(self):
+        itens = self._entradas()
+        corpos = {e.get("sha256"): e.get("tamanho", 0) for _, _, e in itens}
+        return {
+            "urls": len(itens),
+            "corpos": len(corpos),
+            "bytes": sum(corpos.values()),
+            "limite_bytes": self.limite_bytes,
+            "ttl": self.ttl,
+        }
+
+
+_padrao = None
+
+
+def armazem_padrao():
+    """
+    Armazém configurado pelas variáveis de ambiente (COLETA_CACHE, COLETA_CACHE_TTL,
+    COLETA_CACHE_LIMITE_MB)
+    """
+    global _padrao
+    if _padrao is None:
+        _padrao = ArmazemHTML()
+    return _padrao
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Estatísticas e manutenção do cache de páginas")
+    parser.add_argument("--podar", action="store_true", help="aplica o limite de tamanho (LRU)")
+    args = parser.parse_args()
+
+    armazem = armazem_padrao()
+    if args.podar:
+        print(f"URLs removidas: {armazem.podar()}")
+    print(json.dumps(armazem.estatisticas(), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,198 @@
+"""
+Benchmark de parse e extração por página de ministério (offline).
+
+Para cada script com extrator cuja URL tem snapshot (snapshots.json), mede em
+N repetições o tempo do parse (BeautifulSoup) e o tempo do extrator
+separadamente (mínimo, mediana e p95), além do pico de memória de uma execução
+completa (tracemalloc). Snapshots que nenhum script usa entram só com o parse.
+Com --parser selectolax, os scripts que têm extract_minister_fast são medidos
+com a árvore do selectolax; compare com uma execução do html.parser.
+O resultado pode ser salvo em JSON e comparado com uma execução anterior.
+
+Uso:
+    python -m coleta.benchmark [-n 5] [--parser lxml] [--saida benchmark.json] [--comparar anterior.json]
+    python -m coleta.benchmark --parser selectolax --comparar html_parser.json
+"""
+import argparse
+import json
+import platform
+import statistics
+import time
+import tracemalloc
+from datetime import datetime
+
+import bs4
+
+from coleta import offline, parsers
+from coleta.ministerios import descobrir_ministerios, montar_soup, usa_rapido
+
+REPETICOES = 5
+
+
+def percentil(valores, p):
+    """
+    Percentil p (0-100) por interpolação linear
+    """
+    ordenados = sorted(valores)
+    if len(ordenados) == 1:
+        return ordenados[0]
+    k = (len(ordenados) - 1) * p / 100
+    inferior = int(k)
+    superior = min(inferior + 1, len(ordenados) - 1)
+    return ordenados[inferior] + (ordenados[superior] - ordenados[inferior]) * (k - inferior)
+
+
+def resumo(tempos):
+    """
+    Estatísticas em milissegundos
+    """
+    return {
+        "min_ms": round(min(tempos) * 1000, 3),
+        "mediana_ms": round(statistics.median(tempos) * 1000, 3),
+        "p95_ms": round(percentil(tempos, 95) * 1000, 3),
+    }
+
+
+def _executar(ministerio, conteudo):
+    """
+    Faz parse e extração uma vez; retorna (segundos_parse, segundos_extracao).
+    Com ministerio=None mede só o parse.
+    """
+    if ministerio and ministerio["tipo"] == "html":
+        # extrair_dados recebe o HTML e faz o próprio parse
+        inicio = time.perf_counter()
+        ministerio["extrator"](conteudo.decode("utf-8", "replace"))
+        return 0.0, time.perf_counter() - inicio
+
+    rapido = usa_rapido(ministerio) if ministerio else parsers.rapido()
+    inicio = time.perf_counter()
+    if rapido:
+        somente_conteudo = bool(ministerio and ministerio["somente_conteudo"])
+        arvore = parsers.criar_arvore_rapida(conteudo, somente_conteudo=somente_conteudo)
+    elif ministerio:
+        arvore = montar_soup(ministerio, conteudo)
+    else:
+        arvore = parsers.criar_soup(conteudo)
+    meio = time.perf_counter()
+    if ministerio:
+        ministerio["extrator_rapido" if rapido else "extrator"](arvore)
+    return meio - inicio, time.perf_counter() - meio
+
+
+def medir(ministerio, conteudo, repeticoes=REPETICOES, url=None):
+    """
+    Mede parse e extração de um ministério sobre o conteúdo do snapshot
+    (ministerio=None: só o parse da página da url)
+    """
+    parse, extracao = [], []
+    for _ in range(repeticoes):
+        t_parse, t_extracao = _executar(ministerio, conteudo)
+        parse.append(t_parse)
+        extracao.append(t_extracao)
+
+    tracemalloc.start()
+    try:
+        _executar(ministerio, conteudo)
+        _, pico = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "modulo": ministerio["modulo"] if ministerio else None,
+        "url": ministerio["url"] if ministerio else url,
+        "bytes": len(conteudo),
+        "parse": resumo(parse),
+        "extracao": resumo(extracao) if ministerio else None,
+        "pico_memoria_kb": round(pico / 1024, 1),
+    }
+
+
+def executar(repeticoes=REPETICOES):
+    """
+    Roda o benchmark sobre todos os ministérios com snapshot
+    """
+    ministerios, _ = descobrir_ministerios()
+    resultados = []
+    medidas = set()
+    for ministerio in ministerios:
+        caminho = offline.snapshot_de(ministerio["url"])
+        if not caminho:
+            continue
+        with open(caminho, "rb") as f:
+            conteudo = f.read()
+        resultados.append(medir(ministerio, conteudo, repeticoes))
+        medidas.add(ministerio["url"])
+
+    for url, caminho in sorted(offline.carregar_mapeamento().items()):
+        if url in medidas:
+            continue
+        with open(caminho, "rb") as f:
+            conteudo = f.read()
+        resultados.append(medir(None, conteudo, repeticoes, url=url))
+
+    return {
+        "data": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        "python": platform.python_version(),
+        "bs4": bs4.__version__,
+        "parser": parsers.parser_atual(),
+        "repeticoes": repeticoes,
+        "resultados": resultados,
+    }
+
+
+def exibir(relatorio, anterior=None):
+    """
+    Exibe a tabela de resultados (e a variação da mediana contra uma execução anterior)
+    """
+    def identificador(r):
+        return r["modulo"] or r["url"]
+
+    def mediana_total(r):
+        return r["parse"]["mediana_ms"] + (r["extracao"]["mediana_ms"] if r["extracao"] else 0)
+
+    medianas_anteriores = {}
+    if anterior:
+        for r in anterior["resultados"]:
+            medianas_anteriores[identificador(r)] = mediana_total(r)
+
+    print(f"{'módulo / url':<82} {'KB':>6} {'parse med/p95 (ms)':>20} {'extr. med/p95 (ms)':>20} {'pico KB':>9}")
+    for r in relatorio["resultados"]:
+        extracao = (f"{r['extracao']['mediana_ms']:>9.1f}/{r['extracao']['p95_ms']:<10.1f}"
+                    if r["extracao"] else f"{'-':>9}/{'-':<10}")
+        linha = (f"{identificador(r)[-82:]:<82} {r['bytes'] // 1024:>6} "
+                 f"{r['parse']['mediana_ms']:>9.1f}/{r['parse']['p95_ms']:<10.1f} "
+                 f"{extracao} {r['pico_memoria_kb']:>9.0f}")
+        if medianas_anteriores.get(identificador(r)):
+            linha += f"  x{mediana_total(r) / medianas_anteriores[identificador(r)]:.2f}"
+        print(linha)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de parse e extração sobre os snapshots")
+    parser.add_argument("-n", "--repeticoes", type=int, default=REPETICOES,
+                        help="repetições por página (padrão: %(default)s)")
+    parser.add_argument("--saida", help="arquivo JSON para salvar os resultados")
+    parser.add_argument("--comparar", help="JSON de uma execução anterior para comparar")
+    parser.add_argument("--parser", choices=parsers.BACKENDS, default=parsers.parser_atual(),
+                        help="backend do BeautifulSoup, ou selectolax para os extratores que têm a "
+                             "versão rápida (padrão: %(default)s)")
+    args = parser.parse_args()
+
+    parsers.configurar(args.parser)
+
+    relatorio = executar(args.repeticoes)
+
+    anterior = None
+    if args.comparar:
+        with open(args.comparar, encoding="utf-8") as f:
+            anterior = json.load(f)
+    exibir(relatorio, anterior)
+
+    if args.saida:
+        with open(args.saida, "w", encoding="utf-8") as f:
+            json.dump(relatorio, f, ensure_ascii=False, indent=2)
+        print(f"[OK] Resultados salvos em {args.saida}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""
+Cache HTTP condicional (ETag / Last-Modified) sobre o armazém em disco.
+
+As páginas "quem é quem" mudam poucas vezes por ano. Cada resposta é guardada
+no armazém (coleta/armazem.py) com seus validadores e com os registros já
+extraídos. Na próxima requisição:
+
+- dentro do TTL do armazém, a página é servida do disco sem acessar a rede;
+- fora do TTL, enviamos If-None-Match / If-Modified-Since; num 304 (ou num 200
+  com o mesmo conteúdo) get() devolve o corpo salvo com nao_modificado=True e
+  extrair() devolve o registro já extraído, sem nem passar pelo parser.
+
+Com uma URL base (coleta/sessao.py) o armazém guarda as páginas pela URL
+efetiva: as respostas do simulador local não se misturam com as do gov.br.
+"""
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from coleta import offline, sessao
+from coleta.armazem import armazem_padrao
+
+
+def cabecalhos_condicionais(entrada):
+    """
+    Monta If-None-Match / If-Modified-Since a partir da entrada salva
+    """
+    cabecalhos = {}
+    if entrada:
+        if entrada.get("etag"):
+            cabecalhos["If-None-Match"] = entrada["etag"]
+        if entrada.get("last_modified"):
+            cabecalhos["If-Modified-Since"] = entrada["last_modified"]
+    return cabecalhos
+
+
+def _resposta_salva(url, entrada, corpo):
+    """
+    Monta um requests.Response a partir do que está no armazém
+    """
+    resp = requests.Response()
+    resp.url = url
+    resp.status_code = entrada.get("status", 200)
+    resp.headers = CaseInsensitiveDict(entrada.get("headers", {}))
+    resp.encoding = entrada.get("encoding")
+    resp._content = corpo
+    resp.nao_modificado = True
+    resp.do_cache = True
+    return resp
+
+
+def get(url, headers=None, timeout=sessao.TIMEOUT, armazem=None):
+    """
+    GET pela sessão compartilhada, consultando o armazém antes da rede.
+
+    A resposta tem os atributos nao_modificado (o conteúdo é o mesmo da versão
+    salva) e do_cache (o corpo veio do disco, sem download). No modo offline
+    a página vem do snapshot (coleta/offline.py) e a rede nunca é usada.
+    """
+    if offline.ativo():
+        return offline.get(url)
+
+    url = sessao.url_efetiva(url)
+    armazem = armazem or armazem_padrao()
+    entrada = armazem.ler(url)
+    corpo_salvo = armazem.corpo(entrada)
+
+    if corpo_salvo is not None and armazem.fresco(entrada):
+        return _resposta_salva(url, entrada, corpo_salvo)
+
+    cabecalhos = dict(headers or {})
+    if corpo_salvo is not None:
+        cabecalhos.update(cabecalhos_condicionais(entrada))
+
+    resp = sessao.get(url, headers=cabecalhos, timeout=timeout)
+    resp.nao_modificado = False
+    resp.do_cache = False
+
+    if resp.status_code == 304 and corpo_salvo is not None:
+        armazem.revalidar(url)
+        return _resposta_salva(url, entrada, corpo_salvo)
+
+    if resp.status_code == 200:
+        _, mudou = armazem.guardar(url, resp.content, resp.status_code, resp.headers, resp.encoding)
+        resp.nao_modificado = not mudou
+    return resp
+
+
+def registro_salvo(url, chave, armazem=None):
+    """
+    Retorna o registro já extraído por chave para a versão salva da página, ou None
+    """
+    entrada = (armazem or armazem_padrao()).ler(sessao.url_efetiva(url)) or {}
+    return entrada.get("registros", {}).get(chave)
+
+
+def salvar_registro(url, chave, registro, armazem=None):
+    """
+    Associa o registro extraído por chave à versão salva da página
+    """
+    if offline.ativo():
+        # Snapshots não fazem parte do armazém
+        return
+    (armazem or armazem_padrao()).salvar_registro(sessao.url_efetiva(url), chave, registro)
+
+
+def extrair(url, chave, extrator, headers=None, timeout=sessao.TIMEOUT, armazem=None):
+    """
+    Baixa a URL condicionalmente e aplica extrator(resp).
+
+    chave identifica o extrator (ex.: nome do módulo). Se a página não mudou
+    e já existe um registro para essa chave, ele é devolvido sem parse.
+    Retorna (registro, veio_do_cache).
+    """
+    resp = get(url, headers=headers, timeout=timeout, armazem=armazem)
+    resp.raise_for_status()
+
+    if resp.nao_modificado:
+        registro = registro_salvo(url, chave, armazem)
+        if registro is not None:
+            return registro, True
+
+    registro = extrator(resp)
+    salvar_registro(url, chave, registro, armazem)
+    return registro, False
@@ -0,0 +1,270 @@
+"""
+Um só conjunto de dados com os registros de todos os ministérios.
+
+Cada script grava o seu <ministerio>.json / .csv no diretório atual, com
+esquemas diferentes (name/title/emails/phones/source, nome/cargo/telefone/e-mail,
+Nome/Cargo/Telefone/Email, telefone_gabinete/email_gabinete), e o
+certos/ministro_estado.py sobrescreve o ministros.csv / ministros.json
+genéricos. Consolidado junta os registros de todos os extratores em um esquema
+único e grava cada formato uma vez por execução, de forma atômica (arquivo
+temporário + os.replace): quem lê nunca vê um arquivo pela metade.
+
+Esquema (CAMPOS): modulo, name, title, emails (lista), phones (lista, como
+vieram), phones_e164 (coleta/telefones.py), source, extracted_at (quando o
+registro foi coletado ou o arquivo gravado) e erro. No JSON, os campos que
+vieram dos últimos valores bons mantêm o "last_good" (coleta/ultimos.py).
+
+    consolidado = Consolidado()
+    consolidado.adicionar("falta.ministro_do_turismo", registro)
+    consolidado.gravar("ministros_consolidado")    # .json e .csv
+
+O crawler grava o conjunto da coleta com --consolidado. Com --gravar, a coleta
+não guarda os resultados: EscritorConsolidado grava cada registro em arquivos
+temporários assim que ele chega e os coloca no lugar ao fechar (na ordem de
+chegada, não de módulo). Sem argumentos, este módulo consolida os
+<ministerio>.json já gravados pelos scripts na raiz.
+
+Uso:
+    python -m coleta.crawler --consolidado ministros_consolidado
+    python -m coleta.consolidado [--saida ministros_consolidado] [--formatos json,csv] [ARQUIVO.json ...]
+"""
+import argparse
+import csv
+import glob
+import io
+import json
+import os
+import tempfile
+import threading
+from datetime import datetime, timezone
+
+from coleta import esquema, telefones, ultimos
+from coleta.armazem import gravar_atomico
+from coleta.ministerios import RAIZ
+
+CAMPOS = ["modulo", "name", "title", "emails", "phones", "phones_e164", "source", "extracted_at", "erro"]
+FORMATOS = ("json", "csv")
+SAIDA = "ministros_consolidado"
+
+# JSONs da raiz que não são registros de ministro
+IGNORADOS = {"snapshots.json", "ultimos_registros.json"}
+
+
+def _agora():
+    return datetime.now(timezone.utc).isoformat(timespec="seconds")
+
+
+def normalizar(registro, modulo, erro=None, extraido_em=None):
+    """
+    Registro de qualquer esquema dos scripts no esquema único (sem phones_e164).
+    De uma lista de registros (Casa Civil), fica o do ministro: o primeiro com
+    nome (coleta/esquema.py).
+    """
+    padrao = esquema.padronizar(registro) or esquema.padronizar({})
+    unico = {
+        "modulo": modulo,
+        **{c: padrao[c] for c in esquema.CAMPOS},
+        "extracted_at": padrao.get("extracted_at") or extraido_em or _agora(),
+        "erro": erro,
+    }
+    if padrao.get(ultimos.CHAVE_IDADE):
+        unico[ultimos.CHAVE_IDADE] = padrao[ultimos.CHAVE_IDADE]
+    return unico
+
+
+def _finalizar(lote):
+    """
+    Registros normalizados com os telefones em E.164, na ordem das colunas
+    """
+    ordem = CAMPOS + [ultimos.CHAVE_IDADE]
+    return [{c: r[c] for c in ordem if c in r} for r in telefones.normalizar_registros(lote)]
+
+
+def do_resultado(resultado, extraido_em=None):
+    """
+    Resultado do crawler ({modulo, registro, erro, ...}) no esquema único, com phones_e164
+    """
+    return _finalizar([normalizar(resultado["registro"], resultado["modulo"], resultado["erro"], extraido_em)])[0]
+
+
+def _linha_csv(registro):
+    return {c: "; ".join(v) if isinstance(v, list) else v for c, v in registro.items()}
+
+
+def _validar(formatos):
+    desconhecidos = [f for f in formatos if f not in ("json", "jsonl", "csv")]
+    if desconhecidos:
+        raise ValueError(f"formatos desconhecidos: {', '.join(desconhecidos)} (opções: json, jsonl, csv)")
+
+
+class Consolidado:
+    """
+    Registros de uma execução, um por módulo (o último adicionado vale)
+    """
+
+    def __init__(self):
+        self._registros = {}
+        self._trava = threading.Lock()
+        self.iniciado_em = _agora()
+
+    def __len__(self):
+        with self._trava:
+            return len(self._registros)
+
+    def adicionar(self, modulo, registro, erro=None, extraido_em=None):
+        unico = normalizar(registro, modulo, erro, extraido_em or self.iniciado_em)
+        with self._trava:
+            self._registros[modulo] = unico
+
+    def adicionar_resultado(self, resultado):
+        """
+        Resultado do crawler ({modulo, registro, erro, ...})
+        """
+        self.adicionar(resultado["modulo"], resultado["registro"], resultado["erro"])
+
+    def registros(self):
+        """
+        Registros em ordem de módulo, com os telefones em E.164
+        """
+        with self._trava:
+            lote = [self._registros[m] for m in sorted(self._registros)]
+        return _finalizar(lote)
+
+    def gravar(self, base, formatos=FORMATOS):
+        """
+        Grava <base>.<formato> para cada formato, cada um de uma vez e
+        atomicamente. Retorna os caminhos.
+        """
+        _validar(formatos)
+        registros = self.registros()
+        caminhos = []
+        for formato in formatos:
+            if formato == "json":
+                conteudo = json.dumps(registros, ensure_ascii=False, indent=2) + "\n"
+            elif formato == "jsonl":
+                conteudo = "".join(json.dumps(r, ensure_ascii=False) + "\n" for r in registros)
+            else:
+                buffer = io.StringIO(newline="")
+                escritor = csv.DictWriter(buffer, fieldnames=CAMPOS, extrasaction="ignore")
+                escritor.writeheader()
+                for r in registros:
+                    escritor.writerow(_linha_csv(r))
+                conteudo = buffer.getvalue()
+            caminho = f"{base}.{formato}"
+            gravar_atomico(caminho, conteudo.encode("utf-8"))
+            caminhos.append(caminho)
+        return caminhos
+
+
+class EscritorConsolidado:
+    """
+    Escritor do fluxo (coleta/fluxo.py) para o conjunto consolidado: cada
+    registro (esquema único, de do_resultado()) vai para arquivos temporários
+    ao chegar, e fechar() coloca <base>.<formato> no lugar de uma vez. Se a
+    coleta for interrompida (saída do with com exceção), os arquivos
+    anteriores ficam como estavam.
+    """
+
+    def __init__(self, base, formatos=FORMATOS):
+        _validar(formatos)
+        self.caminhos = [f"{base}.{formato}" for formato in formatos]
+        self._arquivos = {}
+        self._csv = None
+        self._registros = 0
+        diretorio = os.path.dirname(os.path.abspath(base))
+        for formato, caminho in zip(formatos, self.caminhos):
+            arquivo = tempfile.NamedTemporaryFile("w", encoding="utf-8", newline="", dir=diretorio,
+                                                  prefix=os.path.basename(caminho) + ".", suffix=".tmp", delete=False)
+            self._arquivos[formato] = arquivo
+            if formato == "json":
+                arquivo.write("[")
+            elif formato == "csv":
+                self._csv = csv.DictWriter(arquivo, fieldnames=CAMPOS, extrasaction="ignore")
+                self._csv.writeheader()
+
+    def escrever(self, registro):
+        for formato, arquivo in self._arquivos.items():
+            if formato == "json":
+                texto = json.dumps(registro, ensure_ascii=False, indent=2).replace("\n", "\n  ")
+                arquivo.write(("," if self._registros else "") + "\n  " + texto)
+            elif formato == "jsonl":
+                arquivo.write(json.dumps(registro, ensure_ascii=False) + "\n")
+            else:
+                self._csv.writerow(_linha_csv(registro))
+        self._registros += 1
+
+    def fechar(self, concluir=True):
+        """
+        Termina os arquivos e os coloca no lugar (concluir=False os descarta).
+        Retorna os caminhos.
+        """
+        for formato, arquivo in self._arquivos.items():
+            if formato == "json":
+                arquivo.write("\n]\n" if self._registros else "]\n")
+            arquivo.close()
+        for (formato, arquivo), caminho in zip(self._arquivos.items(), self.caminhos):
+            if concluir:
+                os.replace(arquivo.name, caminho)
+            else:
+                os.remove(arquivo.name)
+        self._arquivos = {}
+        return self.caminhos
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, tipo, *exc):
+        self.fechar(concluir=tipo is None)
+
+
+def ler_arquivos(caminhos, consolidado=None):
+    """
+    Adiciona os registros dos <ministerio>.json gravados pelos scripts (um
+    registro ou uma lista deles; o módulo é o nome do arquivo). Retorna o
+    Consolidado e os arquivos ignorados [(caminho, motivo)].
+    """
+    consolidado = consolidado or Consolidado()
+    ignorados = []
+    for caminho in caminhos:
+        modulo = os.path.splitext(os.path.basename(caminho))[0]
+        try:
+            with open(caminho, encoding="utf-8") as f:
+                dados = json.load(f)
+        except (OSError, ValueError) as e:
+            ignorados.append((caminho, f"{type(e).__name__}: {e}"))
+            continue
+        extraido_em = datetime.fromtimestamp(os.path.getmtime(caminho), timezone.utc).isoformat(timespec="seconds")
+        lista = dados if isinstance(dados, list) else [dados]
+        validos = [r for r in lista if isinstance(r, dict) and esquema.valor(r, "name") is not None]
+        if not validos:
+            ignorados.append((caminho, "sem registro de ministro"))
+            continue
+        for numero, registro in enumerate(validos):
+            chave = modulo if len(validos) == 1 else f"{modulo}[{numero}]"
+            consolidado.adicionar(chave, registro, extraido_em=extraido_em)
+    return consolidado, ignorados
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Consolida os registros dos ministros em um só conjunto")
+    parser.add_argument("arquivos", nargs="*",
+                        help="JSONs gravados pelos scripts (padrão: os *.json da raiz do repositório)")
+    parser.add_argument("--saida", default=SAIDA, help="caminho sem extensão (padrão: %(default)s)")
+    parser.add_argument("--formatos", default=",".join(FORMATOS), help="json, jsonl, csv (padrão: %(default)s)")
+    args = parser.parse_args()
+
+    saidas = {os.path.abspath(f"{args.saida}.{f}") for f in ("json", "jsonl")}
+    arquivos = args.arquivos or [c for c in sorted(glob.glob(os.path.join(RAIZ, "*.json")))
+                                 if os.path.basename(c) not in IGNORADOS and os.path.abspath(c) not in saidas]
+    consolidado, ignorados = ler_arquivos(arquivos)
+    for caminho, motivo in ignorados:
+        print(f"[--] {os.path.relpath(caminho)}: {motivo}")
+    try:
+        caminhos = consolidado.gravar(args.saida, args.formatos.split(","))
+    except ValueError as e:
+        parser.error(str(e))
+    print(f"[OK] {len(consolidado)} registros em {', '.join(caminhos)}")
+
+
+if __name__ == "__main__":
+    main()
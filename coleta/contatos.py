@@ -0,0 +1,176 @@
+"""
+Padrões de contato (telefone, e-mail) compilados uma vez para todos os scripts.
+
+Os scripts declaravam cada um a sua variação das mesmas expressões e rodavam um
+re.findall por padrão sobre o mesmo texto. Aqui ficam as versões de referência
+e um varredor que percorre o texto uma única vez e devolve, com a posição,
+todos os telefones, e-mails, sufixos ("/2580"), rótulos "Telefone(s):" /
+"E-mail:" e marcadores de fax:
+
+    telefones, emails, sufixos = contatos.extrair(texto)
+    for achado in contatos.varrer(texto):
+        achado.tipo, achado.valor, achado.inicio, achado.fim
+
+extrair() devolve as mesmas listas que re.findall(TELEFONE, texto),
+re.findall(EMAIL, texto) e re.findall(SUFIXO, texto), exceto quando um trecho
+casaria com dois padrões ao mesmo tempo: um telefone dentro de um e-mail, por
+exemplo, conta só como e-mail.
+
+Uso:
+    python -m coleta.contatos [-n 20]    # compara a varredura com os findall separados
+"""
+import argparse
+import re
+import time
+from typing import NamedTuple
+
+from coleta import expressoes
+
+TELEFONE = expressoes.compilar(r"\(?\d{2}\)?\s?\d{4,5}-?\d{4}")
+# Aceita mais espaço e "/" ou espaço entre as partes: "(61)  2020 4000", "61 2020/4000"
+TELEFONE_FLEXIVEL = expressoes.compilar(r"\(?\d{2}\)?\s*\d{4,5}[-/\s]?\d{4}")
+# Campos p.telefone, em que o DDD às vezes é omitido: "2032-5401"
+TELEFONE_DDD_OPCIONAL = expressoes.compilar(r"(?:\(\d{2}\)\s*)?\d{4,5}-?\d{4}")
+SUFIXO = expressoes.compilar(r"/\s*(\d{4})")
+# Os e-mails só começam no início de uma palavra: sem o lookbehind o re tenta
+# cada posição de uma sequência longa de letras, em tempo quadrático
+EMAIL = expressoes.compilar(r"(?<![\w\.-])[\w\.-]+@[\w\.-]+")
+# E-mail com domínio de topo (descarta "nome@servidor" e restos como "a@b.")
+EMAIL_COMPLETO = expressoes.compilar(r"(?<![\w\.-])[\w\.-]+@[\w\.-]+\.[A-Za-z]{2,}")
+# Só ASCII, como nos scripts de agricultura, cultura e scraper_ministro
+EMAIL_ASCII = expressoes.compilar(r"(?<![a-z0-9._%+-])[a-z0-9._%+-]+@[a-z0-9.-]+\.[a-z]{2,}", re.I)
+ROTULO_TELEFONE = expressoes.compilar(r"Telefones?(?:\(s\))?\s*:", re.I)
+ROTULO_EMAIL = expressoes.compilar(r"E-?mails?\s*:", re.I)
+FAX = expressoes.compilar(r"\bFax\b", re.I)
+
+# Varredura única. Todo telefone, sufixo, rótulo ou fax começa por um destes
+# caracteres; com a classe na frente do padrão o re pula o resto do texto em C
+# em vez de tentar cada alternativa em cada posição. O primeiro caractere já é
+# consumido pela classe e cada alternativa confere, com lookbehind, qual foi.
+_VARREDURA = expressoes.compilar(r"""[(\d/EeFfTt](?:
+    (?P<telefone>(?<=\()\d{2}\)?\s?\d{4,5}-?\d{4}|(?<=\d)\d\)?\s?\d{4,5}-?\d{4})
+  | (?P<sufixo>(?<=/)\s*(?P<digitos_sufixo>\d{4}))
+  | (?P<rotulo_telefone>(?<=[Tt])(?i:elefones?(?:\(s\))?\s*:))
+  | (?P<rotulo_email>(?<=[Ee])(?i:-?mails?\s*:))
+  | (?P<fax>(?<=[Ff])(?<!\w[Ff])(?i:ax\b))
+)""", re.X)
+# E-mails são achados a partir de cada "@" (str.find): a parte antes dele é a
+# sequência de [\w.-] que termina no "@", a parte depois é PARTE_EMAIL.match
+PARTE_EMAIL = re.compile(r"[\w\.-]+")
+_CARACTERE_EMAIL = re.compile(r"[\w\.-]")
+
+TIPOS = ("email", "telefone", "sufixo", "rotulo_telefone", "rotulo_email", "fax")
+
+
+class Achado(NamedTuple):
+    tipo: str
+    valor: str
+    inicio: int
+    fim: int
+
+
+class Contatos(NamedTuple):
+    telefones: list
+    emails: list
+    sufixos: list
+
+
+def _emails(texto):
+    """
+    Intervalos (inicio, fim) dos e-mails, como EMAIL.finditer, saltando de "@" em "@"
+    """
+    fim_anterior = 0
+    arroba = texto.find("@")
+    while arroba != -1:
+        inicio = arroba
+        while inicio > fim_anterior and _CARACTERE_EMAIL.match(texto, inicio - 1):
+            inicio -= 1
+        depois = PARTE_EMAIL.match(texto, arroba + 1)
+        if inicio < arroba and depois:
+            yield inicio, depois.end()
+            fim_anterior = depois.end()
+            arroba = texto.find("@", fim_anterior)
+        else:
+            arroba = texto.find("@", arroba + 1)
+
+
+def varrer(texto):
+    """
+    Gera os achados do texto em ordem de posição, em uma única passada.
+    O que estiver dentro de um e-mail não é lido como telefone.
+    """
+    posicao = 0
+    for inicio, fim in _emails(texto):
+        yield from _varrer_trecho(texto, posicao, inicio)
+        yield Achado("email", texto[inicio:fim], inicio, fim)
+        posicao = fim
+    yield from _varrer_trecho(texto, posicao, len(texto))
+
+
+def _varrer_trecho(texto, inicio, fim):
+    for m in _VARREDURA.finditer(texto, inicio, fim):
+        tipo = m.lastgroup
+        valor = m.group("digitos_sufixo") if tipo == "sufixo" else m.group()
+        yield Achado(tipo, valor, m.start(), m.end())
+
+
+def extrair(texto):
+    """
+    Telefones, e-mails e sufixos do texto (com repetições, em ordem de ocorrência)
+    """
+    telefones, emails, sufixos = [], [], []
+    destino = {"telefone": telefones, "email": emails, "sufixo": sufixos}
+    for achado in varrer(texto):
+        lista = destino.get(achado.tipo)
+        if lista is not None:
+            lista.append(achado.valor)
+    return Contatos(telefones, emails, sufixos)
+
+
+def telefones(texto):
+    return TELEFONE.findall(texto)
+
+
+def emails(texto):
+    return EMAIL.findall(texto)
+
+
+def _separados(texto):
+    return Contatos(TELEFONE.findall(texto), EMAIL.findall(texto), SUFIXO.findall(texto))
+
+
+def main():
+    from coleta import offline, parsers
+
+    parser = argparse.ArgumentParser(description="Compara a varredura única com os findall separados nos snapshots")
+    parser.add_argument("-n", "--repeticoes", type=int, default=20, help="repetições por página (padrão: %(default)s)")
+    args = parser.parse_args()
+
+    total_separados = total_varredura = 0.0
+    divergencias = 0
+    for url, caminho in sorted(offline.carregar_mapeamento().items()):
+        with open(caminho, "rb") as f:
+            texto = parsers.criar_soup(f.read()).get_text(" ", strip=True)
+
+        inicio = time.perf_counter()
+        for _ in range(args.repeticoes):
+            esperado = _separados(texto)
+        meio = time.perf_counter()
+        for _ in range(args.repeticoes):
+            obtido = extrair(texto)
+        fim = time.perf_counter()
+
+        total_separados += meio - inicio
+        total_varredura += fim - meio
+        igual = obtido == esperado
+        divergencias += not igual
+        print(f"{'OK' if igual else 'DIFERENTE':<9} {url[-80:]:<80} "
+              f"{(meio - inicio) / args.repeticoes * 1000:>7.2f} ms -> {(fim - meio) / args.repeticoes * 1000:>7.2f} ms")
+
+    print(f"\nfindall separados: {total_separados / args.repeticoes * 1000:.1f} ms/rodada, "
+          f"varredura única: {total_varredura / args.repeticoes * 1000:.1f} ms/rodada, "
+          f"{divergencias} página(s) com diferença")
+
+
+if __name__ == "__main__":
+    main()
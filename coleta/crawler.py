@@ -0,0 +1,398 @@
+"""
+Coleta concorrente de todos os ministérios.
+
+Em vez de rodar cada script de certos/ e falta/ em sequência, este módulo lê a
+constante URL de cada script (ou a url de cada regra em regras/), baixa todas as
+páginas ao mesmo tempo (com limite de conexões simultâneas por host) e entrega
+cada resposta ao extract_minister / extrair_dados já existente no script ou ao
+motor de regras.
+
+As páginas são pedidas primeiro na forma mais leve que o Plone oferecer (JSON
+da API ou fragmento, coleta/plone.py); se o extrator não achar o ministro nela,
+a próxima forma é baixada, até a página inteira.
+
+Cada extração tem um orçamento de tempo (coleta/expressoes.py): uma página que
+faça um padrão travar é interrompida e entra como erro, sem segurar a coleta.
+Para o SIGALRM interromper o padrão, coletar() sem pool de processos extrai na
+thread principal, em uma etapa de coleta/fluxo.py, enquanto as threads de
+download continuam baixando; coletar_async() não bloqueia o laço e extrai nas
+threads do executor (o estouro é apontado ao final da extração).
+
+Com --processos N o parse e a extração saem do processo do download e rodam em
+um pool de N processos (coleta/processos.py), que devolve só os registros.
+
+Com --gravar, a coleta roda em etapas com filas limitadas (coleta/fluxo.py) e
+cada resultado é gravado (JSON Lines, CSV ou, para .sqlite/.db, o histórico de
+coleta/historico.py) assim que fica pronto, sem guardar as respostas nem os
+resultados até o fim. --consolidado e --historico também são gravados registro
+a registro nesse modo.
+
+Uso:
+    python -m coleta.crawler [--limite-por-host 8] [--saida ministerios.json] [--offline]
+                             [--parser lxml] [--orcamento 10] [--formas api,fragmento,pagina]
+                             [--base-url http://127.0.0.1:8765] [--processos 4]
+                             [--gravar ministros.jsonl --gravar ministros.csv]
+                             [--consolidado ministros_consolidado] [--historico historico.sqlite]
+"""
+import argparse
+import asyncio
+import contextlib
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+
+from coleta import cache_http, consolidado, esquema, expressoes, fluxo, historico, offline, parsers, plone, processos, sessao, ultimos
+from coleta.ministerios import descobrir_ministerios
+
+LIMITE_POR_HOST = 8
+# Segundos de extração por página
+ORCAMENTO_EXTRACAO = 10.0
+
+
+def baixar(url, alternativas=()):
+    """
+    Faz a requisição HTTP condicional (bloqueante; roda em uma thread do executor)
+    na forma mais leve disponível. Se a URL falhar, tenta as alternativas em
+    ordem. A resposta guarda em url_pedida a URL que deu certo.
+    """
+    return plone.baixar([url, *alternativas])
+
+
+def registro_salvo(ministerio, resp):
+    """
+    Registro salvo da versão baixada, se ela não mudou (304); senão None
+    """
+    if not resp.nao_modificado:
+        return None
+    # O registro fica junto da versão salva do que foi baixado (página, JSON ou fragmento);
+    # os salvos por versões anteriores podem estar no esquema do script
+    return esquema.padronizar(cache_http.registro_salvo(getattr(resp, "url_fonte", ministerio["url"]),
+                                                        ministerio["modulo"]))
+
+
+def salvar_registro(ministerio, resp, registro):
+    cache_http.salvar_registro(getattr(resp, "url_fonte", ministerio["url"]), ministerio["modulo"], registro)
+
+
+def extrair_registro(ministerio, resp):
+    """
+    Entrega a resposta ao extrator do script, no formato que ele espera.
+    Se a página não mudou (304), devolve o registro salvo sem fazer o parse.
+    Retorna (registro, veio_do_cache), no esquema da coleta (coleta/esquema.py)
+    e sem os últimos valores bons.
+    """
+    registro = registro_salvo(ministerio, resp)
+    if registro is not None:
+        return registro, True
+    registro = processos.extrair(ministerio, processos.dados_da_resposta(ministerio, resp))
+    salvar_registro(ministerio, resp, registro)
+    return registro, False
+
+
+def baixar_e_extrair(ministerio, urls, orcamento=ORCAMENTO_EXTRACAO, pool=None):
+    """
+    Versão síncrona de uma coleta: baixa a primeira URL que responder, extrai
+    dentro do orçamento (no pool de processos, se houver) e passa para a
+    próxima forma se a reduzida não trouxer o ministro. Retorna o registro
+    completado.
+    """
+    registro, resp = plone.buscar(urls, lambda resp: _extrair_sincrono(ministerio, resp, orcamento, pool)[0])
+    return ultimos.completar(ministerio["modulo"], registro, resp.url_pedida)
+
+
+def _extrair_sincrono(ministerio, resp, orcamento, pool):
+    """
+    extrair_registro() dentro do orçamento, no pool de processos se houver
+    """
+    if pool is None:
+        with expressoes.orcamento(orcamento, ministerio["url"]):
+            return extrair_registro(ministerio, resp)
+    registro = registro_salvo(ministerio, resp)
+    if registro is not None:
+        return registro, True
+    registro = processos.submeter(pool, ministerio, resp, orcamento).result()
+    salvar_registro(ministerio, resp, registro)
+    return registro, False
+
+
+def _novo_resultado(ministerio):
+    return {"modulo": ministerio["modulo"], "url": ministerio["url"], "registro": None, "erro": None,
+            "nao_modificado": False, "forma": None}
+
+
+def _falhou(ministerio, resultado, erro):
+    resultado["erro"] = f"{type(erro).__name__}: {erro}"
+    # Sem página ou sem extração: o último registro bom, se houver (com "last_good")
+    resultado["registro"] = ultimos.completar(ministerio["modulo"], None, ministerio["url"])
+
+
+async def _extrair_async(ministerio, resp, executor, orcamento, pool):
+    """
+    extrair_registro() para o laço, sem bloqueá-lo: no pool de processos, se
+    houver, ou nas threads do executor
+    """
+    if pool is None:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(executor, _extrair_sincrono, ministerio, resp, orcamento, None)
+    registro = registro_salvo(ministerio, resp)
+    if registro is not None:
+        return registro, True
+    registro = await asyncio.wrap_future(processos.submeter(pool, ministerio, resp, orcamento))
+    salvar_registro(ministerio, resp, registro)
+    return registro, False
+
+
+async def _coletar_um(ministerio, semaforos, limite_por_host, executor, orcamento, pool):
+    loop = asyncio.get_running_loop()
+    host = urlparse(ministerio["url"]).netloc
+    semaforo = semaforos.setdefault(host, asyncio.Semaphore(limite_por_host))
+
+    inicio = time.perf_counter()
+    resultado = _novo_resultado(ministerio)
+    try:
+        # A URL que rendeu o último registro bom é tentada primeiro
+        urls = ultimos.urls(ministerio["modulo"], ministerio["url"], ministerio.get("urls_alternativas", ()))
+        while True:
+            async with semaforo:
+                resp = await loop.run_in_executor(executor, baixar, urls[0], urls[1:])
+            # O parse não segura a vaga do host: a conexão já foi liberada
+            registro, resultado["nao_modificado"] = await _extrair_async(ministerio, resp, executor, orcamento, pool)
+            if not plone.incompleto(resp, registro):
+                break
+            # O JSON ou o fragmento não trouxe o ministro: próxima forma, até a página inteira
+            plone.descartar(resp.url_pedida, resp.forma)
+            urls = [resp.url_pedida]
+        resultado["forma"] = resp.forma
+        resultado["registro"] = ultimos.completar(ministerio["modulo"], registro, resp.url_pedida)
+    except Exception as e:
+        _falhou(ministerio, resultado, e)
+    resultado["segundos"] = round(time.perf_counter() - inicio, 3)
+    return resultado
+
+
+async def coletar_async(ministerios, limite_por_host=LIMITE_POR_HOST, max_workers=None,
+                        orcamento=ORCAMENTO_EXTRACAO, pool=None):
+    """
+    Baixa e extrai todos os ministérios concorrentemente, na ordem recebida.
+    Com pool (processos.criar_pool()), o parse e a extração rodam nos processos.
+    """
+    semaforos = {}
+    hosts = {urlparse(m["url"]).netloc for m in ministerios}
+    # Uma conexão no pool para cada requisição simultânea permitida no host
+    sessao.configurar(tamanho_pool=limite_por_host, max_hosts=max(1, len(hosts)))
+    if max_workers is None:
+        max_workers = max(1, limite_por_host * len(hosts))
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        tarefas = [_coletar_um(m, semaforos, limite_por_host, executor, orcamento, pool) for m in ministerios]
+        return await asyncio.gather(*tarefas)
+
+
+def coletar(ministerios, limite_por_host=LIMITE_POR_HOST, max_workers=None, orcamento=ORCAMENTO_EXTRACAO,
+            pool=None):
+    """
+    Versão síncrona de coletar_async. Sem pool, roda por coletar_em_fluxo():
+    a extração fica na thread que chamou (o orçamento interrompe um padrão
+    travado) sem parar os downloads.
+    """
+    if pool is not None:
+        return asyncio.run(coletar_async(ministerios, limite_por_host, max_workers, orcamento, pool))
+    resultados = {}
+
+    def guardar(resultado):
+        resultados[resultado["modulo"]] = resultado
+
+    coletar_em_fluxo(ministerios, guardar, limite_por_host=limite_por_host, orcamento=orcamento,
+                     max_workers=max_workers)
+    return [resultados[m["modulo"]] for m in ministerios]
+
+
+def coletar_em_fluxo(ministerios, gravar, limite_por_host=LIMITE_POR_HOST, orcamento=ORCAMENTO_EXTRACAO,
+                     pool=None, extracoes=1, tamanho_fila=fluxo.TAMANHO_FILA, max_workers=None):
+    """
+    Como coletar(), em etapas com filas limitadas (coleta/fluxo.py): cada
+    resultado é entregue a gravar(resultado) assim que a extração termina e
+    não fica guardado. Sem pool, a extração roda na thread que chamou (o
+    orçamento interrompe padrões travados) e a gravação em outra; com pool,
+    extracoes threads entregam as respostas aos processos.
+    """
+    hosts = {urlparse(m["url"]).netloc for m in ministerios}
+    sessao.configurar(tamanho_pool=limite_por_host, max_hosts=max(1, len(hosts)))
+    semaforos = {host: threading.BoundedSemaphore(limite_por_host) for host in hosts}
+
+    def etapa_baixar(ministerio):
+        inicio = time.perf_counter()
+        resultado = _novo_resultado(ministerio)
+        try:
+            urls = ultimos.urls(ministerio["modulo"], ministerio["url"], ministerio.get("urls_alternativas", ()))
+            with semaforos[urlparse(ministerio["url"]).netloc]:
+                return ministerio, resultado, inicio, baixar(urls[0], urls[1:]), None
+        except Exception as e:
+            return ministerio, resultado, inicio, None, e
+
+    def etapa_extrair(pacote):
+        ministerio, resultado, inicio, resp, erro = pacote
+        try:
+            if erro is not None:
+                raise erro
+            while True:
+                registro, resultado["nao_modificado"] = _extrair_sincrono(ministerio, resp, orcamento, pool)
+                if not plone.incompleto(resp, registro):
+                    break
+                plone.descartar(resp.url_pedida, resp.forma)
+                with semaforos[urlparse(ministerio["url"]).netloc]:
+                    resp = baixar(resp.url_pedida)
+            resultado["forma"] = resp.forma
+            resultado["registro"] = ultimos.completar(ministerio["modulo"], registro, resp.url_pedida)
+        except Exception as e:
+            _falhou(ministerio, resultado, e)
+        resultado["segundos"] = round(time.perf_counter() - inicio, 3)
+        return resultado
+
+    threads_download = max_workers or max(1, limite_por_host * len(hosts))
+    if pool is None:
+        etapas = [(etapa_baixar, threads_download), (etapa_extrair, 0), (gravar, 1)]
+    else:
+        etapas = [(etapa_baixar, threads_download), (etapa_extrair, max(1, extracoes)), (gravar, 0)]
+    fluxo.executar(ministerios, etapas, tamanho_fila)
+
+
+def _mostrar(r):
+    status = "ERRO" if r["erro"] is not None else ("304" if r["nao_modificado"] else "OK")
+    forma = f", {r['forma']}" if r["forma"] else ""
+    print(f"[{status}] {r['modulo']} ({r['segundos']}s{forma}){'' if r['erro'] is None else ' - ' + r['erro']}")
+
+
+# Extensões gravadas no histórico SQLite por --gravar
+EXTENSOES_BANCO = (".sqlite", ".db")
+
+
+def _mostrar_historico(caminho, contagem):
+    print(f"[OK] Histórico em {caminho}: {contagem['novas']} versões novas, "
+          f"{contagem['confirmadas']} sem mudança, {contagem['ignoradas']} sem dados novos")
+
+
+def _coletar_e_gravar(ministerios, args, pool):
+    """
+    Coleta em fluxo gravando cada resultado nos destinos de --gravar,
+    --consolidado e --historico assim que ele fica pronto. Retorna os
+    escritores de consolidado e de histórico, já fechados.
+    """
+    with contextlib.ExitStack() as pilha:
+        brutos, tabelas, unicos, bancos = [], [], [], []
+        for caminho in args.gravar:
+            extensao = os.path.splitext(caminho)[1].lower()
+            if extensao in EXTENSOES_BANCO:
+                bancos.append(pilha.enter_context(historico.EscritorHistorico(caminho)))
+            elif extensao == ".csv":
+                # Uma linha por resultado, no esquema único (coleta/consolidado.py)
+                tabelas.append(pilha.enter_context(fluxo.abrir_escritor(caminho, consolidado.CAMPOS)))
+            else:
+                brutos.append(pilha.enter_context(fluxo.abrir_escritor(caminho, fluxo.CAMPOS_MINISTRO)))
+        if args.historico:
+            bancos.append(pilha.enter_context(historico.EscritorHistorico(args.historico)))
+        if args.consolidado:
+            unicos.append(pilha.enter_context(consolidado.EscritorConsolidado(args.consolidado)))
+
+        def gravar(r):
+            for escritor in brutos:
+                escritor.escrever(r)
+            if tabelas or unicos or bancos:
+                # Os destinos no esquema único (CSV, consolidado, histórico) recebem o
+                # registro normalizado, sem guardá-lo
+                unico = consolidado.do_resultado(r)
+                for escritor in tabelas + unicos + bancos:
+                    escritor.escrever(unico)
+            _mostrar(r)
+
+        coletar_em_fluxo(ministerios, gravar, limite_por_host=args.limite_por_host, orcamento=args.orcamento,
+                         pool=pool, extracoes=args.processos)
+    return unicos, bancos
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Coleta concorrente dos ministros de todos os ministérios")
+    parser.add_argument("--limite-por-host", type=int, default=LIMITE_POR_HOST,
+                        help="conexões simultâneas por host (padrão: %(default)s)")
+    parser.add_argument("--saida", help="arquivo JSON para salvar os resultados")
+    parser.add_argument("--consolidado", metavar="BASE",
+                        help="grava BASE.json e BASE.csv com todos os registros no esquema único (coleta/consolidado.py)")
+    parser.add_argument("--historico", metavar="SQLITE",
+                        help="registra a coleta no histórico SQLite (coleta/historico.py), versão nova só se mudou")
+    parser.add_argument("--gravar", action="append", default=[],
+                        help="grava cada resultado assim que ele fica pronto, em .jsonl, .csv ou no histórico "
+                             "(.sqlite/.db); pode ser repetido")
+    parser.add_argument("--offline", action="store_true",
+                        help="usa os snapshots HTML (snapshots.json) em vez da rede")
+    parser.add_argument("--parser", choices=parsers.BACKENDS, default=parsers.parser_atual(),
+                        help="backend do BeautifulSoup, ou selectolax para os extratores que têm a "
+                             "versão rápida (padrão: %(default)s)")
+    parser.add_argument("--orcamento", type=float, default=ORCAMENTO_EXTRACAO,
+                        help="segundos de extração por página; 0 desliga (padrão: %(default)s)")
+    parser.add_argument("--formas", default=",".join(plone.formas_atuais()),
+                        help="formas tentadas em ordem: api, fragmento, pagina (padrão: %(default)s)")
+    parser.add_argument("--processos", type=int, default=processos.PROCESSOS,
+                        help="processos para o parse e a extração; 0 faz na thread principal (padrão: %(default)s)")
+    parser.add_argument("--base-url", default=sessao.base_url(),
+                        help="origem no lugar de https://www.gov.br, ex.: o simulador local (coleta/simulador.py)")
+    args = parser.parse_args()
+    if args.saida and args.gravar:
+        parser.error("use --saida (JSON no fim) ou --gravar (um resultado por vez), não os dois")
+
+    if args.offline:
+        offline.ativar()
+    parsers.configurar(args.parser)
+    if args.base_url:
+        sessao.configurar(base_url=args.base_url)
+    try:
+        plone.configurar(args.formas.split(","))
+    except ValueError as e:
+        parser.error(str(e))
+
+    ministerios, _ = descobrir_ministerios()
+
+    print(f"Coletando {len(ministerios)} ministérios...")
+    inicio = time.perf_counter()
+    pool = processos.criar_pool(args.processos) if args.processos else None
+    conjunto = None
+    unicos = bancos = ()
+    try:
+        if args.gravar:
+            unicos, bancos = _coletar_e_gravar(ministerios, args, pool)
+        else:
+            conjunto = consolidado.Consolidado()
+            resultados = coletar(ministerios, limite_por_host=args.limite_por_host, orcamento=args.orcamento,
+                                 pool=pool)
+            for r in resultados:
+                conjunto.adicionar_resultado(r)
+                _mostrar(r)
+    finally:
+        if pool is not None:
+            pool.shutdown()
+    total = time.perf_counter() - inicio
+    print(f"\nTempo total: {total:.2f}s")
+    stats = sessao.estatisticas()
+    print(f"Conexões abertas: {stats['conexoes_abertas']} | reutilizadas: {stats['conexoes_reutilizadas']}")
+
+    if args.gravar:
+        print(f"[OK] Dados gravados em {', '.join(args.gravar)}")
+        for escritor in unicos:
+            print(f"[OK] Conjunto consolidado em {', '.join(escritor.caminhos)}")
+        for escritor in bancos:
+            _mostrar_historico(escritor.caminho, escritor.contagem)
+    else:
+        if args.consolidado:
+            print(f"[OK] Conjunto consolidado em {', '.join(conjunto.gravar(args.consolidado))}")
+        if args.historico:
+            with historico.Historico(args.historico) as banco:
+                _mostrar_historico(args.historico, banco.registrar(conjunto.registros()))
+    if args.saida:
+        with open(args.saida, "w", encoding="utf-8") as f:
+            json.dump(resultados, f, ensure_ascii=False, indent=2, default=str)
+        print(f"[OK] Dados salvos em {args.saida}")
+
+
+if __name__ == "__main__":
+    main()
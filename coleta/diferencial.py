@@ -0,0 +1,114 @@
+"""
+Teste diferencial dos backends de parser sobre os snapshots.
+
+Roda cada extrator sobre o snapshot da sua URL com todos os backends
+compatíveis com BeautifulSoup instalados (html.parser, lxml, html5lib) e
+compara os registros com os do html.parser sobre a página inteira. Scripts com
+SOMENTE_CONTEUDO também são conferidos com o parse restrito à div#content-core.
+Com o selectolax instalado, o extract_minister_fast dos scripts que o têm é
+conferido do mesmo jeito contra o extract_minister.
+Sai com código 1 se algum registro for diferente.
+
+Uso:
+    python -m coleta.diferencial
+"""
+import json
+import sys
+
+from coleta import offline, parsers
+from coleta.ministerios import descobrir_ministerios, montar_soup
+
+REFERENCIA = "html.parser"
+
+# Campos que mudam a cada execução e não entram na comparação
+CAMPOS_VOLATEIS = {"data_coleta"}
+
+
+def _normalizar(registro):
+    if isinstance(registro, dict):
+        return {k: _normalizar(v) for k, v in registro.items() if k not in CAMPOS_VOLATEIS}
+    if isinstance(registro, list):
+        return [_normalizar(v) for v in registro]
+    return registro
+
+
+def extrair_com(ministerio, conteudo, backend, somente_conteudo=False):
+    """
+    Executa o extrator do ministério com o backend informado (o selectolax
+    roda o extrator rápido)
+    """
+    anterior = parsers.parser_atual()
+    parsers.configurar(backend)
+    try:
+        if backend == parsers.BACKEND_RAPIDO:
+            arvore = parsers.criar_arvore_rapida(conteudo, somente_conteudo=somente_conteudo)
+            registro = ministerio["extrator_rapido"](arvore)
+        elif ministerio["tipo"] == "soup":
+            soup = montar_soup(ministerio, conteudo, somente_conteudo=somente_conteudo)
+            registro = ministerio["extrator"](soup)
+        else:
+            registro = ministerio["extrator"](conteudo.decode("utf-8", "replace"))
+    finally:
+        parsers.configurar(anterior)
+    return _normalizar(registro)
+
+
+def backends_a_comparar():
+    """
+    Backends do BeautifulSoup instalados, mais o selectolax se estiver instalado
+    """
+    return parsers.disponiveis() + ([parsers.BACKEND_RAPIDO] if parsers.rapido_disponivel() else [])
+
+
+def comparar(backends=None):
+    """
+    Retorna a lista de divergências: {modulo, backend, somente_conteudo, esperado, obtido}
+    """
+    backends = backends or backends_a_comparar()
+    ministerios, _ = descobrir_ministerios()
+    divergencias = []
+    for ministerio in ministerios:
+        caminho = offline.snapshot_de(ministerio["url"])
+        if not caminho:
+            continue
+        with open(caminho, "rb") as f:
+            conteudo = f.read()
+
+        esperado = extrair_com(ministerio, conteudo, REFERENCIA)
+        modos = [False, True] if ministerio["somente_conteudo"] else [False]
+        for backend in backends:
+            for somente_conteudo in modos:
+                if backend == REFERENCIA and not somente_conteudo:
+                    continue
+                if backend == parsers.BACKEND_RAPIDO and not ministerio.get("extrator_rapido"):
+                    continue
+                obtido = extrair_com(ministerio, conteudo, backend, somente_conteudo)
+                if obtido != esperado:
+                    divergencias.append({
+                        "modulo": ministerio["modulo"],
+                        "backend": backend,
+                        "somente_conteudo": somente_conteudo,
+                        "esperado": esperado,
+                        "obtido": obtido,
+                    })
+    return divergencias
+
+
+def main():
+    # Snapshots antigos não devem renovar os últimos valores bons (coleta/ultimos.py)
+    offline.ativar()
+    backends = backends_a_comparar()
+    print(f"Backends: {', '.join(backends)} (referência: {REFERENCIA})")
+    divergencias = comparar(backends)
+    for d in divergencias:
+        modo = " (só #content-core)" if d["somente_conteudo"] else ""
+        print(f"\n[DIFERENTE] {d['modulo']} com {d['backend']}{modo}")
+        print("  esperado:", json.dumps(d["esperado"], ensure_ascii=False))
+        print("  obtido:  ", json.dumps(d["obtido"], ensure_ascii=False))
+    if divergencias:
+        sys.exit(1)
+    print("[OK] Todos os extratores produzem os mesmos registros em todos os backends")
+
+
+if __name__ == "__main__":
+    main()
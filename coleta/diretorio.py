@@ -0,0 +1,212 @@
+"""
+Diretório completo: todas as pessoas de uma página "quem é quem".
+
+As páginas com cartões dados-pessoa (fazenda, mds, mme, mpo...) trazem toda a
+estrutura do ministério, não só o ministro. pessoas() percorre a árvore uma
+única vez, em ordem de documento, e gera um registro por pessoa com nome,
+cargo, telefones, e-mails e a unidade (o título do grupo da lista-pessoas ou,
+fora dela, o último h2/h3/h4 visto).
+
+    for pessoa in diretorio.pessoas(soup, url):
+        ...
+
+Uso:
+    python -m coleta.diretorio [--offline] [--saida diretorio.jsonl|diretorio.csv] [--processos 4] [URL ...]
+"""
+import argparse
+import sys
+
+from bs4.element import Tag
+
+from coleta import cache_http, contatos, fluxo, offline, parsers
+
+CLASSES_CARTAO = {"dados-pessoa", "dados-possoa"}
+TITULOS = {"h2", "h3", "h4"}
+# Downloads simultâneos no main()
+DOWNLOADS = 4
+
+_RE_TELEFONE = contatos.TELEFONE_DDD_OPCIONAL
+_RE_EMAIL = contatos.EMAIL_COMPLETO
+
+
+def _texto(tag):
+    return tag.get_text(" ", strip=True) if tag else ""
+
+
+def _valor(campo):
+    """
+    Valor de um p.telefone / p.email ("Telefone(s) : (61) ..."), sem o rótulo
+    """
+    if campo is None:
+        return ""
+    partes = [s.strip() for s in campo.stripped_strings]
+    if ":" in partes:
+        partes = partes[partes.index(":") + 1:]
+    return " ".join(partes)
+
+
+def _emails(campo):
+    if campo is None:
+        return []
+    emails = [a["href"].split("mailto:", 1)[1].strip()
+              for a in campo.find_all("a", href=True) if a["href"].startswith("mailto:")]
+    return list(dict.fromkeys(emails + _RE_EMAIL.findall(_valor(campo))))
+
+
+def _unidades(cartao, titulos):
+    """
+    Títulos dos grupos (<li> com a.toggle) que contêm o cartão, do mais externo
+    para o mais interno
+    """
+    caminho = []
+    for pai in cartao.parents:
+        titulo = titulos.get(id(pai))
+        if titulo:
+            caminho.append(titulo)
+    return caminho[::-1]
+
+
+def _registro(nome, cargo, telefones, emails, unidades, perfil, base_url):
+    return {
+        "name": nome or None,
+        "title": cargo or None,
+        "unit": unidades[-1] if unidades else None,
+        "units": unidades,
+        "phones": telefones,
+        "emails": emails,
+        "profile": perfil,
+        "source": base_url,
+    }
+
+
+def _pessoa_do_cartao(cartao, unidades, base_url):
+    """
+    Cartão div.dados-pessoa: p.nome, p.cargo, p.telefone, p.email
+    """
+    nome = cartao.find("p", class_="nome")
+    link = nome.find("a", href=True) if nome else None
+    telefone = _valor(cartao.find("p", class_="telefone"))
+    return _registro(
+        _texto(nome),
+        _texto(cartao.find("p", class_="cargo")),
+        list(dict.fromkeys(_RE_TELEFONE.findall(telefone))),
+        _emails(cartao.find("p", class_="email")),
+        unidades,
+        link["href"] if link else None,
+        base_url,
+    )
+
+
+def _pessoa_do_item(item, unidades, base_url):
+    """
+    div.item com p.nome-autoridade e p.cargo-autoridade
+    """
+    nome = item.find(class_="nome-autoridade")
+    link = nome.find("a", href=True) if nome else None
+    return _registro(_texto(nome), _texto(item.find(class_="cargo-autoridade")), [], [], unidades,
+                     link["href"] if link else None, base_url)
+
+
+def pessoas(soup, base_url=None):
+    """
+    Gera um registro por pessoa da página, em ordem de documento, em uma única
+    passada pela árvore
+    """
+    titulos = {}
+    ultimo_titulo = None
+    for no in soup.descendants:
+        if not isinstance(no, Tag):
+            continue
+        classes = no.get("class") or ()
+
+        if no.name == "a" and "toggle" in classes and no.parent is not None and no.parent.name == "li":
+            titulos[id(no.parent)] = _texto(no)
+        elif no.name in TITULOS:
+            ultimo_titulo = _texto(no) or ultimo_titulo
+        elif no.name == "div" and CLASSES_CARTAO.intersection(classes):
+            unidades = _unidades(no, titulos) or ([ultimo_titulo] if ultimo_titulo else [])
+            yield _pessoa_do_cartao(no, unidades, base_url)
+        elif no.name == "p" and "nome-autoridade" in classes:
+            item = no.find_parent(class_="item") or no.parent
+            unidades = _unidades(item, titulos) or ([ultimo_titulo] if ultimo_titulo else [])
+            yield _pessoa_do_item(item, unidades, base_url)
+
+
+def pessoas_da_url(url, headers=None):
+    """
+    Baixa a página (pelo cache HTTP / modo offline) e gera as pessoas
+    """
+    resp = cache_http.get(url, headers=headers)
+    resp.raise_for_status()
+    yield from pessoas(parsers.criar_soup(resp.content), url)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Lista todas as pessoas das páginas 'quem é quem'")
+    parser.add_argument("urls", nargs="*",
+                        help="páginas a ler (padrão: todas as URLs com snapshot em snapshots.json)")
+    parser.add_argument("--offline", action="store_true",
+                        help="usa os snapshots HTML (snapshots.json) em vez da rede")
+    parser.add_argument("--saida", help="arquivo JSON Lines (um registro por linha) ou .csv; padrão: saída padrão")
+    parser.add_argument("--processos", type=int, default=0,
+                        help="processos para o parse; 0 faz no processo principal (padrão: %(default)s)")
+    args = parser.parse_args()
+
+    if args.offline:
+        offline.ativar()
+    urls = args.urls or sorted(offline.carregar_mapeamento())
+
+    campos = ["name", "title", "unit", "units", "phones", "emails", "profile", "source"]
+    escritor = fluxo.abrir_escritor(args.saida, campos) if args.saida else fluxo.EscritorJSONL(sys.stdout)
+    pool = None
+    if args.processos:
+        # Importado aqui: coleta.processos usa pessoas() deste módulo nos processos
+        from coleta import processos
+        pool = processos.criar_pool(args.processos)
+    total = [0]
+
+    def baixar(url):
+        try:
+            resp = cache_http.get(url)
+            resp.raise_for_status()
+            return url, resp.content, None
+        except Exception as e:
+            return url, None, e
+
+    def extrair(pacote):
+        url, conteudo, erro = pacote
+        if erro is None:
+            try:
+                # A árvore só existe aqui dentro; segue adiante só a lista de pessoas
+                if pool is None:
+                    return url, list(pessoas(parsers.criar_soup(conteudo), url)), None
+                return url, processos.submeter_pessoas(pool, conteudo, url).result(), None
+            except Exception as e:
+                erro = e
+        return url, None, erro
+
+    def gravar(pacote):
+        url, encontradas, erro = pacote
+        if erro is not None:
+            print(f"[ERRO] {url}: {type(erro).__name__}: {erro}", file=sys.stderr)
+            return
+        for pessoa in encontradas:
+            escritor.escrever(pessoa)
+        total[0] += len(encontradas)
+        print(f"[OK] {url}: {len(encontradas)} pessoas", file=sys.stderr)
+
+    # Sem pool o parse fica na thread principal; com pool, uma thread por processo o aguarda
+    if pool is None:
+        etapas = [(baixar, DOWNLOADS), (extrair, 0), (gravar, 1)]
+    else:
+        etapas = [(baixar, DOWNLOADS), (extrair, args.processos), (gravar, 0)]
+    try:
+        fluxo.executar(urls, etapas)
+    finally:
+        if pool is not None:
+            pool.shutdown()
+        escritor.fechar()
+    print(f"Total: {total[0]} pessoas", file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+Esquema dos registros de ministro na coleta: name, title, emails, phones, source.
+
+Os scripts devolvem cada um o seu esquema (name/title/emails/phones/source,
+nome/cargo/telefone/e-mail, Nome/Cargo/Telefone/Email,
+telefone_gabinete/email_gabinete), e o da Casa Civil devolve uma lista de
+registros. padronizar() leva qualquer um deles ao esquema da coleta uma vez,
+logo depois da extração (coleta/processos.py): o crawler, coleta/plone.py,
+coleta/ultimos.py e os escritores só conhecem esse esquema. Os scripts rodados
+sozinhos continuam gravando o esquema deles.
+
+    esquema.padronizar({"Nome": "Paulo Teixeira", "Telefone": "(61) 3218-3077"})
+    # {"name": "Paulo Teixeira", "title": None, "emails": [], "phones": ["(61) 3218-3077"], "source": None}
+"""
+import re
+
+CAMPOS = ("name", "title", "emails", "phones", "source")
+
+# Nomes de cada campo nos esquemas dos scripts
+SINONIMOS = {
+    "name": ("name", "nome", "Nome"),
+    "title": ("title", "cargo", "Cargo"),
+    "emails": ("emails", "email", "e-mail", "Email", "E-mail", "email_gabinete"),
+    "phones": ("phones", "telefones", "telefone", "Telefone", "telefone_gabinete"),
+    "source": ("source", "fonte", "url"),
+    "extracted_at": ("extracted_at", "data_coleta"),
+}
+# Marcadores que os scripts usam quando não acham o valor
+AUSENTES = ("Não encontrado", "N/A")
+# Campos completados com os últimos valores bons e a data deles (coleta/ultimos.py)
+CHAVE_IDADE = "last_good"
+
+_RE_SEPARADOR_EMAIL = re.compile(r"[;,\s]+")
+
+
+def ausente(valor):
+    return valor is None or valor == "" or valor == [] or valor in AUSENTES
+
+
+def valor(registro, campo):
+    """
+    Primeiro valor presente do campo no registro, por qualquer um dos nomes dele
+    """
+    for nome in SINONIMOS[campo]:
+        if nome in registro and not ausente(registro[nome]):
+            return registro[nome]
+    return None
+
+
+def lista(valor):
+    if valor is None:
+        return []
+    valores = valor if isinstance(valor, list) else [valor]
+    return [str(v).strip() for v in valores if not ausente(v) and str(v).strip()]
+
+
+def principal(registro):
+    """
+    O registro do ministro: o próprio dicionário ou, em uma lista, o primeiro
+    com nome (senão o primeiro dicionário). None se não houver nenhum.
+    """
+    if isinstance(registro, dict):
+        return registro
+    if not isinstance(registro, list):
+        return None
+    dicionarios = [r for r in registro if isinstance(r, dict)]
+    return next((r for r in dicionarios if valor(r, "name") is not None), dicionarios[0] if dicionarios else None)
+
+
+def padronizar(registro):
+    """
+    Registro de qualquer esquema dos scripts (ou lista deles) no esquema da
+    coleta, com e-mails e telefones em listas sem repetição. extracted_at e
+    last_good são mantidos quando vêm no registro. Retorna None se não houver
+    registro.
+    """
+    registro = principal(registro)
+    if registro is None:
+        return None
+    emails = [e for v in lista(valor(registro, "emails")) for e in _RE_SEPARADOR_EMAIL.split(v) if "@" in e]
+    padrao = {
+        "name": valor(registro, "name"),
+        "title": valor(registro, "title"),
+        "emails": list(dict.fromkeys(emails)),
+        "phones": list(dict.fromkeys(lista(valor(registro, "phones")))),
+        "source": valor(registro, "source"),
+    }
+    extraido_em = valor(registro, "extracted_at")
+    if extraido_em is not None:
+        padrao["extracted_at"] = extraido_em
+    if registro.get(CHAVE_IDADE):
+        padrao[CHAVE_IDADE] = registro[CHAVE_IDADE]
+    return padrao
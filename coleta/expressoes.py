@@ -0,0 +1,284 @@
+"""
+Expressões regulares dos extratores sem risco de travar a coleta.
+
+Padrões como "((?:\\(61\\)\\s*[\\d\\s-]*)+)" ou "[\\w.-]+@..." aplicados ao texto
+inteiro da página podem levar tempo quadrático (ou pior) no backtracking do
+módulo re em entradas ruins. Três proteções:
+
+- compilar(): os padrões dos extratores passam por aqui. Com o backend "re2"
+  (pacote opcional google-re2) eles rodam no RE2, em tempo linear; padrões que
+  o RE2 não aceita (lookbehind, referências) continuam no re. Atenção: no RE2
+  \\w, \\d, \\s e \\b só conhecem ASCII (o espaço não separável, por exemplo, não
+  é \\s), por isso o padrão continua sendo o re.
+
+      COLETA_REGEX=re2 python -m coleta.crawler
+      expressoes.configurar("re2")    # vale para o que for compilado depois
+
+- orcamento(): limite de tempo por página. Na thread principal um SIGALRM
+  interrompe a extração no meio (o re verifica sinais durante o casamento) e
+  levanta TempoEsgotado; fora dela o tempo é conferido ao final do bloco.
+  Orçamentos aninhados preservam o de fora: o timer dele continua de onde
+  estava ao sair do bloco de dentro.
+
+- python -m coleta.expressoes: roda cada padrão registrado contra entradas
+  adversariais de tamanho crescente e aponta os que crescem mais que
+  linearmente ou estouram o orçamento.
+
+Uso:
+    python -m coleta.expressoes [--backend re2] [--orcamento 1.0] [--tamanho 16000]
+"""
+import argparse
+import os
+import re
+import signal
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+BACKENDS = ("re", "re2")
+
+_estado = {"backend": os.environ.get("COLETA_REGEX", "re")}
+# (origem, padrao, flags) de tudo que passou por compilar(), para a verificação
+_registrados = []
+
+
+class TempoEsgotado(Exception):
+    """
+    A extração de uma página passou do orçamento de tempo
+    """
+
+    def __init__(self, descricao, segundos, decorrido=None):
+        self.descricao = descricao
+        self.segundos = segundos
+        self.decorrido = decorrido
+        onde = f"{descricao}: " if descricao else ""
+        gasto = f" ({decorrido:.2f}s)" if decorrido is not None else ""
+        super().__init__(f"{onde}extração passou do orçamento de {segundos}s{gasto}")
+
+
+def re2_disponivel():
+    try:
+        import re2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def configurar(nome):
+    """
+    Define o backend usado pelas próximas chamadas a compilar()
+    """
+    if nome not in BACKENDS:
+        raise ValueError(f"backend de regex desconhecido: {nome} (opções: {', '.join(BACKENDS)})")
+    if nome == "re2" and not re2_disponivel():
+        raise ImportError("o backend re2 requer o pacote google-re2 (pip install google-re2)")
+    _estado["backend"] = nome
+
+
+def backend_atual():
+    return _estado["backend"]
+
+
+def _compilar_re2(padrao, flags):
+    import re2
+
+    # re.M não tem opção equivalente no RE2 (só "(?m)", que mudaria o .pattern)
+    if flags & ~(re.I | re.S | re.U):
+        return None
+    opcoes = re2.Options()
+    opcoes.log_errors = False
+    opcoes.case_sensitive = not flags & re.I
+    opcoes.dot_nl = bool(flags & re.S)
+    try:
+        return re2.compile(padrao, opcoes)
+    except re2.error:
+        return None
+
+
+def compilar(padrao, flags=0, backend=None, origem=None):
+    """
+    Compila o padrão no backend configurado (ou no informado) e o registra
+    para a verificação adversarial. Sem RE2, ou se o RE2 não aceitar o padrão,
+    usa o re.
+    """
+    if origem is None:
+        origem = sys._getframe(1).f_globals.get("__name__", "?")
+    _registrados.append((origem, padrao, flags))
+    return _compilar(padrao, flags, backend or _estado["backend"])
+
+
+def _compilar(padrao, flags, backend):
+    if backend == "re2" and re2_disponivel():
+        compilado = _compilar_re2(padrao, flags)
+        if compilado is not None:
+            return compilado
+    return re.compile(padrao, flags)
+
+
+def registrados():
+    """
+    (origem, padrao, flags) de todos os padrões compilados até agora, sem repetições
+    """
+    return list(dict.fromkeys(_registrados))
+
+
+@contextmanager
+def orcamento(segundos, descricao=None):
+    """
+    Limita o tempo do bloco. Na thread principal (POSIX) o bloco é interrompido
+    ao estourar; nas demais threads o estouro é detectado ao final. Nos dois
+    casos levanta TempoEsgotado. segundos=None ou 0 desliga o limite. Dentro
+    de outro orçamento (ou de outro ITIMER_REAL), o prazo de fora continua
+    valendo e é restaurado, descontado o tempo do bloco, na saída.
+    """
+    if not segundos:
+        yield
+        return
+
+    rigido = hasattr(signal, "setitimer") and threading.current_thread() is threading.main_thread()
+    inicio = time.perf_counter()
+    if rigido:
+        restante_externo, intervalo_externo = signal.getitimer(signal.ITIMER_REAL)
+        tratador_anterior = signal.getsignal(signal.SIGALRM)
+        # O timer de fora vence antes: quem trata o sinal é o tratador dele
+        externo_primeiro = 0 < restante_externo < segundos and callable(tratador_anterior)
+
+        def estourou(signum, frame):
+            if externo_primeiro:
+                return tratador_anterior(signum, frame)
+            raise TempoEsgotado(descricao, segundos)
+
+        signal.signal(signal.SIGALRM, estourou)
+        signal.setitimer(signal.ITIMER_REAL, restante_externo if externo_primeiro else segundos)
+    try:
+        yield
+    finally:
+        if rigido:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+            signal.signal(signal.SIGALRM, tratador_anterior)
+            if restante_externo:
+                # Menos que zero: o prazo de fora venceu dentro do bloco e o sinal dispara já
+                falta = restante_externo - (time.perf_counter() - inicio)
+                signal.setitimer(signal.ITIMER_REAL, max(falta, 1e-6), intervalo_externo)
+
+    decorrido = time.perf_counter() - inicio
+    if decorrido > segundos:
+        raise TempoEsgotado(descricao, segundos, decorrido)
+
+
+# --- verificação adversarial -------------------------------------------------
+
+# Entradas que exploram os padrões dos extratores: sequências longas que casam
+# o começo do padrão e falham no fim
+ENTRADAS = {
+    "letras": lambda n: "a" * n,
+    "palavra.pontos": lambda n: "a." * (n // 2),
+    "espacos": lambda n: " " * n + "x",
+    "nbsp": lambda n: "\xa0" * n + "x",
+    "digitos": lambda n: "1" * n,
+    "digitos espacos": lambda n: "1 " * (n // 2) + "x",
+    "hifens": lambda n: "-" * n,
+    "ddd repetido": lambda n: "(61) " * (n // 5) + "x",
+    "rotulo + espacos": lambda n: "Telefone(s): " + " " * n + "x",
+    "rotulo + ddd": lambda n: "Telefone(s): " + "(61) 1-" * (n // 7) + "x",
+    "sem E": lambda n: "Telefone(s): (61) 2020-1234" + " 1" * (n // 2),
+}
+TAMANHOS = (1000, 4000, 16000)
+# Em tempo linear o tempo cresce na proporção da entrada; acima do dobro disso
+# (quadruplicar a entrada e o tempo crescer mais de 8x) o padrão é apontado
+FOLGA_CRESCIMENTO = 2.0
+# Tempos menores que isto são ruído para a comparação de crescimento
+TEMPO_MINIMO = 0.01
+REPETICOES = 3
+
+
+def _tempo(padrao, texto, limite):
+    """
+    Menor tempo de padrao.search(texto) em até REPETICOES execuções, ou None se
+    estourar o limite
+    """
+    melhor = None
+    for _ in range(REPETICOES):
+        inicio = time.perf_counter()
+        try:
+            with orcamento(limite):
+                padrao.search(texto)
+        except TempoEsgotado:
+            return None
+        decorrido = time.perf_counter() - inicio
+        melhor = decorrido if melhor is None else min(melhor, decorrido)
+        if decorrido > TEMPO_MINIMO:
+            break
+    return melhor
+
+
+def verificar(padrao, tamanhos=TAMANHOS, limite=1.0):
+    """
+    Roda o padrão compilado contra cada entrada adversarial.
+    Retorna {entrada: (tempos por tamanho, problema ou None)}.
+    """
+    resultado = {}
+    for nome, gerar in ENTRADAS.items():
+        tempos = []
+        problema = None
+        for tamanho in tamanhos:
+            t = _tempo(padrao, gerar(tamanho), limite)
+            if t is None:
+                problema = f"estourou {limite}s com {tamanho} caracteres"
+                break
+            tempos.append(t)
+        if problema is None and len(tempos) >= 2 and tempos[-1] > TEMPO_MINIMO:
+            proporcao = tamanhos[-1] / tamanhos[-2]
+            crescimento = tempos[-1] / max(tempos[-2], 1e-9)
+            if crescimento > FOLGA_CRESCIMENTO * proporcao:
+                problema = f"superlinear: x{crescimento:.0f} de {tamanhos[-2]} para {tamanhos[-1]} caracteres"
+        resultado[nome] = (tempos, problema)
+    return resultado
+
+
+def carregar_padroes():
+    """
+    Importa os módulos e scripts que compilam padrões dos extratores
+    """
+    # Com python -m este arquivo roda como __main__: o registro que vale é o do
+    # módulo coleta.expressoes importado pelos extratores
+    from coleta import contatos, expressoes, layouts, regras  # noqa: F401
+    from coleta.ministerios import descobrir_ministerios
+
+    regras.motor_padrao()
+    descobrir_ministerios()
+    return expressoes.registrados()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Verifica os padrões dos extratores contra entradas adversariais")
+    parser.add_argument("--backend", choices=BACKENDS, default=backend_atual(),
+                        help="backend de regex (padrão: %(default)s)")
+    parser.add_argument("--orcamento", type=float, default=1.0,
+                        help="segundos por busca antes de considerar travado (padrão: %(default)s)")
+    parser.add_argument("--tamanho", type=int, default=TAMANHOS[-1],
+                        help="maior entrada, em caracteres (padrão: %(default)s)")
+    args = parser.parse_args()
+
+    if args.backend == "re2" and not re2_disponivel():
+        parser.error("o backend re2 requer o pacote google-re2 (pip install google-re2)")
+    tamanhos = (args.tamanho // 16, args.tamanho // 4, args.tamanho)
+
+    problemas = 0
+    padroes = carregar_padroes()
+    for origem, padrao, flags in padroes:
+        compilado = _compilar(padrao, flags, args.backend)
+        motor = "re2" if not isinstance(compilado, re.Pattern) else "re"
+        for entrada, (tempos, problema) in verificar(compilado, tamanhos, args.orcamento).items():
+            if problema:
+                problemas += 1
+                print(f"[LENTO] {origem} [{motor}] {padrao[:70]!r} / {entrada}: {problema}")
+
+    print(f"\n{len(padroes)} padrões x {len(ENTRADAS)} entradas, backend {args.backend}: "
+          f"{problemas} problema(s)")
+    sys.exit(1 if problemas else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,205 @@
+"""
+Pipeline em etapas com filas limitadas: baixar -> extrair -> gravar.
+
+A coleta guardava todas as respostas e todos os resultados até o fim para só
+então gravar o JSON. Aqui cada item passa pelas etapas assim que a anterior
+termina; entre elas há filas de tamanho fixo (TAMANHO_FILA). Quando a gravação
+ou a extração atrasa, a fila enche e a etapa anterior espera (backpressure):
+nunca há mais que algumas páginas em memória, com qualquer número de
+ministérios ou de páginas de diretório. A árvore de cada página só existe
+dentro da extração e é liberada quando ela termina; o resultado é gravado e
+esquecido.
+
+    fluxo.executar(ministerios, [(baixar, 8), (extrair, 0), (gravar, 1)])
+
+Cada etapa é (função, threads). A função recebe o item da etapa anterior e
+devolve o da próxima (None descarta o item); o que a última devolve é
+ignorado. Uma etapa com 0 threads roda na thread que chamou executar() (no
+máximo uma): é onde a extração fica quando o orçamento de tempo precisa
+interromper um padrão travado (SIGALRM, coleta/expressoes.py). Se uma etapa
+levantar uma exceção, todas param e ela é relançada por executar().
+
+Os escritores gravam (e fazem flush de) cada registro assim que ele chega:
+
+    with fluxo.abrir_escritor("ministros.csv", fluxo.CAMPOS_MINISTRO) as escritor:
+        escritor.escrever(registro)
+"""
+import csv
+import json
+import os
+import queue
+import threading
+
+TAMANHO_FILA = 8
+# Colunas do CSV dos ministros, como nos save_csv dos scripts (+ módulo e erro)
+CAMPOS_MINISTRO = ["modulo", "name", "title", "emails", "phones", "source", "erro"]
+
+FIM = object()
+# Segundos entre verificações de parada enquanto uma fila está cheia ou vazia
+_ESPERA = 0.1
+
+
+def _colocar(fila, item, parar):
+    while not parar.is_set():
+        try:
+            fila.put(item, timeout=_ESPERA)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+
+def _tirar(fila, parar):
+    while not parar.is_set():
+        try:
+            return fila.get(timeout=_ESPERA)
+        except queue.Empty:
+            continue
+    return FIM
+
+
+class _Etapa:
+    def __init__(self, funcao, threads, entrada, saida):
+        self.funcao = funcao
+        self.threads = threads
+        self.entrada = entrada
+        self.saida = saida
+        self.restantes = max(1, threads)
+        self.trava = threading.Lock()
+
+
+def _trabalhar(etapa, parar, erros):
+    """
+    Laço de uma thread da etapa: tira da entrada, aplica a função e coloca na
+    saída até receber FIM
+    """
+    try:
+        while True:
+            item = _tirar(etapa.entrada, parar)
+            if item is FIM:
+                # Devolve o FIM para as outras threads da mesma etapa
+                _colocar(etapa.entrada, FIM, parar)
+                break
+            resultado = etapa.funcao(item)
+            if resultado is not None and etapa.saida is not None:
+                if not _colocar(etapa.saida, resultado, parar):
+                    break
+    except BaseException as e:
+        erros.append(e)
+        parar.set()
+    finally:
+        with etapa.trava:
+            etapa.restantes -= 1
+            ultima = etapa.restantes == 0
+        if ultima and etapa.saida is not None:
+            _colocar(etapa.saida, FIM, parar)
+
+
+def _alimentar(fonte, fila, parar, erros):
+    try:
+        for item in fonte:
+            if not _colocar(fila, item, parar):
+                return
+    except BaseException as e:
+        erros.append(e)
+        parar.set()
+    finally:
+        _colocar(fila, FIM, parar)
+
+
+def executar(fonte, etapas, tamanho_fila=TAMANHO_FILA):
+    """
+    Passa cada item da fonte (qualquer iterável, consumido aos poucos) pelas
+    etapas [(função, threads), ...], com filas de tamanho_fila entre elas
+    """
+    if sum(1 for _, threads in etapas if threads == 0) > 1:
+        raise ValueError("no máximo uma etapa pode rodar na thread que chamou")
+    parar = threading.Event()
+    erros = []
+    filas = [queue.Queue(maxsize=tamanho_fila) for _ in etapas]
+    etapas = [_Etapa(funcao, threads, filas[i], filas[i + 1] if i + 1 < len(filas) else None)
+              for i, (funcao, threads) in enumerate(etapas)]
+
+    threads = [threading.Thread(target=_alimentar, args=(fonte, filas[0], parar, erros),
+                                name="fluxo-fonte", daemon=True)]
+    local = None
+    for numero, etapa in enumerate(etapas):
+        if etapa.threads == 0:
+            local = etapa
+            continue
+        threads.extend(threading.Thread(target=_trabalhar, args=(etapa, parar, erros),
+                                        name=f"fluxo-{numero}-{i}", daemon=True)
+                       for i in range(etapa.threads))
+    for thread in threads:
+        thread.start()
+    try:
+        if local is not None:
+            _trabalhar(local, parar, erros)
+        for thread in threads:
+            thread.join()
+    except BaseException:
+        parar.set()
+        raise
+    if erros:
+        raise erros[0]
+
+
+# --- escritores -------------------------------------------------------------------
+
+class EscritorJSONL:
+    """
+    Um objeto JSON por linha, em um arquivo ou em um já aberto (sys.stdout)
+    """
+
+    def __init__(self, caminho):
+        self.caminho = caminho
+        self._proprio = isinstance(caminho, (str, os.PathLike))
+        self._arquivo = open(caminho, "w", encoding="utf-8") if self._proprio else caminho
+
+    def escrever(self, registro):
+        self._arquivo.write(json.dumps(registro, ensure_ascii=False, default=str) + "\n")
+        self._arquivo.flush()
+
+    def fechar(self):
+        if self._proprio:
+            self._arquivo.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.fechar()
+
+
+class EscritorCSV:
+    """
+    CSV com as colunas dadas; listas viram "a; b", como nos save_csv dos scripts
+    """
+
+    def __init__(self, caminho, campos):
+        self.caminho = caminho
+        self._arquivo = open(caminho, "w", newline="", encoding="utf-8")
+        self._csv = csv.DictWriter(self._arquivo, fieldnames=campos, extrasaction="ignore")
+        self._csv.writeheader()
+
+    def escrever(self, registro):
+        self._csv.writerow({c: "; ".join(map(str, v)) if isinstance(v, list) else v for c, v in registro.items()})
+        self._arquivo.flush()
+
+    def fechar(self):
+        self._arquivo.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.fechar()
+
+
+def abrir_escritor(caminho, campos):
+    """
+    Escritor pelo formato do arquivo: .csv (com as colunas dadas) ou JSON Lines
+    """
+    if os.path.splitext(caminho)[1].lower() == ".csv":
+        return EscritorCSV(caminho, campos)
+    return EscritorJSONL(caminho)
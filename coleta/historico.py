@@ -0,0 +1,288 @@
+"""
+Histórico dos registros em SQLite: uma versão nova só quando algo mudou.
+
+O ministros.csv guarda uma linha com data_coleta e cada execução o
+sobrescreve. Aqui cada coleta faz o upsert dos registros (no esquema único de
+coleta/consolidado.py) por ministério, em uma transação:
+
+- se nome, cargo, e-mails, telefones e fonte são os mesmos da versão atual, só
+  visto_em é atualizado;
+- se algum mudou, a versão atual é encerrada (valido_ate) e uma nova começa;
+- registros sem dados extraídos nesta coleta não mexem no histórico: os que
+  falharam (erro) e os que só têm nome, e-mails e telefones vindos dos últimos
+  valores bons ("last_good", coleta/ultimos.py), que não foram vistos agora;
+  registros mais antigos que a versão atual também são ignorados.
+
+Índices: por ministério (com a versão atual em um índice parcial único), por
+nome (sem diferenciar maiúsculas) e por início de validade. "Gabinete atual" e
+"mudanças nos últimos N dias" são consultas de milissegundos, sem coleta.
+
+    historico = Historico("historico.sqlite")
+    historico.registrar(consolidado.registros())
+    historico.atual()              # uma linha por ministério
+    historico.mudancas(dias=7)     # [{modulo, em, antes, depois, campos}]
+
+O arquivo padrão é historico.sqlite na raiz (ou COLETA_HISTORICO).
+
+EscritorHistorico é o destino em banco da coleta em fluxo (coleta/fluxo.py):
+com --gravar historico.sqlite (ou .db), cada registro é registrado na sua
+transação assim que fica pronto.
+
+Uso:
+    python -m coleta.crawler --historico historico.sqlite
+    python -m coleta.crawler --gravar ministros.jsonl --gravar historico.sqlite
+    python -m coleta.historico --importar ministros_consolidado.json
+    python -m coleta.historico [--atual] [--mudancas 7] [--pessoa "Marina Silva"] [--modulo MODULO]
+"""
+import argparse
+import hashlib
+import json
+import os
+import sqlite3
+import time
+from datetime import datetime, timedelta, timezone
+
+from coleta import ultimos
+from coleta.ministerios import RAIZ
+
+ARQUIVO = os.environ.get("COLETA_HISTORICO", os.path.join(RAIZ, "historico.sqlite"))
+
+# Campos que definem uma versão (extracted_at e erro não contam como mudança)
+CAMPOS_VERSAO = ("name", "title", "emails", "phones", "source")
+_LISTAS = ("emails", "phones", "phones_e164")
+
+ESQUEMA = """
+CREATE TABLE IF NOT EXISTS versoes (
+    id INTEGER PRIMARY KEY,
+    modulo TEXT NOT NULL,
+    name TEXT,
+    title TEXT,
+    emails TEXT NOT NULL,
+    phones TEXT NOT NULL,
+    phones_e164 TEXT NOT NULL,
+    source TEXT,
+    hash TEXT NOT NULL,
+    valido_de TEXT NOT NULL,
+    visto_em TEXT NOT NULL,
+    valido_ate TEXT
+);
+CREATE UNIQUE INDEX IF NOT EXISTS versoes_atual ON versoes (modulo) WHERE valido_ate IS NULL;
+CREATE INDEX IF NOT EXISTS versoes_modulo ON versoes (modulo, valido_de);
+CREATE INDEX IF NOT EXISTS versoes_nome ON versoes (name COLLATE NOCASE);
+CREATE INDEX IF NOT EXISTS versoes_valido_de ON versoes (valido_de);
+"""
+
+
+def _instante(texto):
+    """
+    Data em ISO 8601 UTC (comparável como texto). Datas sem fuso, como o
+    data_coleta do ministros.csv, são do horário local de quem coletou.
+    """
+    if not texto:
+        return datetime.now(timezone.utc).isoformat(timespec="seconds")
+    data = datetime.fromisoformat(texto)
+    return data.astimezone(timezone.utc).isoformat(timespec="seconds")
+
+
+def _hash(registro):
+    conteudo = json.dumps([registro.get(c) for c in CAMPOS_VERSAO], ensure_ascii=False)
+    return hashlib.sha1(conteudo.encode("utf-8")).hexdigest()
+
+
+def _linha(linha):
+    if linha is None:
+        return None
+    registro = dict(linha)
+    for campo in _LISTAS:
+        registro[campo] = json.loads(registro[campo])
+    return registro
+
+
+class Historico:
+    """
+    Versões dos registros de cada ministério em um arquivo SQLite
+    """
+
+    def __init__(self, arquivo=ARQUIVO, entre_threads=False):
+        self.arquivo = arquivo
+        # entre_threads: a conexão pode ser usada por outra thread, uma de cada vez
+        self._conexao = sqlite3.connect(arquivo, check_same_thread=not entre_threads)
+        self._conexao.row_factory = sqlite3.Row
+        with self._conexao:
+            self._conexao.executescript(ESQUEMA)
+
+    def fechar(self):
+        self._conexao.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.fechar()
+
+    # --- gravação -----------------------------------------------------------
+
+    def registrar(self, registros):
+        """
+        Upsert dos registros (esquema de coleta/consolidado.py) em uma
+        transação. Retorna {"novas", "confirmadas", "ignoradas"}.
+        """
+        contagem = {"novas": 0, "confirmadas": 0, "ignoradas": 0}
+        with self._conexao:
+            for registro in registros:
+                contagem[self._registrar_um(registro)] += 1
+        return contagem
+
+    def _registrar_um(self, registro):
+        if registro.get("erro"):
+            return "ignoradas"
+        completados = registro.get(ultimos.CHAVE_IDADE) or {}
+        if all(not registro.get(c) or c in completados for c in ("name", "emails", "phones")):
+            return "ignoradas"
+        modulo = registro["modulo"]
+        coletado_em = _instante(registro.get("extracted_at"))
+        hash_ = _hash(registro)
+        atual = self._conexao.execute(
+            "SELECT id, hash, visto_em FROM versoes WHERE modulo = ? AND valido_ate IS NULL", (modulo,)).fetchone()
+
+        if atual is not None and coletado_em < atual["visto_em"]:
+            return "ignoradas"
+        if atual is not None and atual["hash"] == hash_:
+            self._conexao.execute("UPDATE versoes SET visto_em = ? WHERE id = ?", (coletado_em, atual["id"]))
+            return "confirmadas"
+        if atual is not None:
+            self._conexao.execute("UPDATE versoes SET valido_ate = ? WHERE id = ?", (coletado_em, atual["id"]))
+        self._conexao.execute(
+            "INSERT INTO versoes (modulo, name, title, emails, phones, phones_e164, source, hash, valido_de, visto_em)"
+            " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (modulo, registro.get("name"), registro.get("title"),
+             *(json.dumps(registro.get(c) or [], ensure_ascii=False) for c in _LISTAS),
+             registro.get("source"), hash_, coletado_em, coletado_em))
+        return "novas"
+
+    # --- consultas ----------------------------------------------------------
+
+    def atual(self):
+        """
+        Versão atual de cada ministério
+        """
+        linhas = self._conexao.execute("SELECT * FROM versoes WHERE valido_ate IS NULL ORDER BY modulo")
+        return [_linha(linha) for linha in linhas]
+
+    def mudancas(self, dias=7):
+        """
+        Versões que começaram nos últimos dias, com a anterior (None quando o
+        ministério apareceu pela primeira vez) e os campos que mudaram
+        """
+        desde = (datetime.now(timezone.utc) - timedelta(days=dias)).isoformat(timespec="seconds")
+        linhas = self._conexao.execute(
+            "SELECT * FROM versoes WHERE valido_de >= ? ORDER BY valido_de DESC, modulo", (desde,)).fetchall()
+        mudancas = []
+        for linha in linhas:
+            depois = _linha(linha)
+            antes = _linha(self._conexao.execute(
+                "SELECT * FROM versoes WHERE modulo = ? AND valido_de < ? ORDER BY valido_de DESC LIMIT 1",
+                (depois["modulo"], depois["valido_de"])).fetchone())
+            campos = [c for c in CAMPOS_VERSAO if antes is None or antes[c] != depois[c]]
+            mudancas.append({"modulo": depois["modulo"], "em": depois["valido_de"], "antes": antes,
+                             "depois": depois, "campos": campos})
+        return mudancas
+
+    def pessoa(self, nome):
+        """
+        Versões em que a pessoa aparece (nome exato, sem diferenciar maiúsculas)
+        """
+        linhas = self._conexao.execute(
+            "SELECT * FROM versoes WHERE name = ? COLLATE NOCASE ORDER BY valido_de", (nome,))
+        return [_linha(linha) for linha in linhas]
+
+    def versoes(self, modulo):
+        """
+        Todas as versões do ministério, da mais antiga à atual
+        """
+        linhas = self._conexao.execute("SELECT * FROM versoes WHERE modulo = ? ORDER BY valido_de", (modulo,))
+        return [_linha(linha) for linha in linhas]
+
+
+class EscritorHistorico:
+    """
+    Escritor do fluxo (coleta/fluxo.py) que registra cada registro (esquema de
+    coleta/consolidado.py) no histórico assim que ele chega. É aberto na
+    thread que chama e usado na etapa de gravação, que tem uma só thread.
+    """
+
+    def __init__(self, caminho):
+        self.caminho = caminho
+        self.historico = Historico(caminho, entre_threads=True)
+        self.contagem = {"novas": 0, "confirmadas": 0, "ignoradas": 0}
+
+    def escrever(self, registro):
+        for chave, numero in self.historico.registrar([registro]).items():
+            self.contagem[chave] += numero
+
+    def fechar(self):
+        self.historico.fechar()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.fechar()
+
+
+def _mostrar(titulo, linhas, inicio):
+    print(f"{titulo} ({len(linhas)}, {(time.perf_counter() - inicio) * 1000:.2f} ms)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Histórico dos registros dos ministros (SQLite)")
+    parser.add_argument("--arquivo", default=ARQUIVO, help="banco SQLite (padrão: %(default)s)")
+    parser.add_argument("--importar", action="append", default=[], metavar="JSON",
+                        help="registra um conjunto consolidado (coleta/consolidado.py); pode ser repetido")
+    parser.add_argument("--atual", action="store_true", help="gabinete atual")
+    parser.add_argument("--mudancas", type=float, metavar="DIAS", help="mudanças nos últimos DIAS dias")
+    parser.add_argument("--pessoa", help="versões em que a pessoa aparece")
+    parser.add_argument("--modulo", help="todas as versões do ministério")
+    args = parser.parse_args()
+
+    with Historico(args.arquivo) as historico:
+        for caminho in args.importar:
+            with open(caminho, encoding="utf-8") as f:
+                contagem = historico.registrar(json.load(f))
+            print(f"[OK] {caminho}: {contagem['novas']} versões novas, {contagem['confirmadas']} confirmadas, "
+                  f"{contagem['ignoradas']} ignoradas")
+
+        if args.atual or not (args.importar or args.mudancas is not None or args.pessoa or args.modulo):
+            inicio = time.perf_counter()
+            linhas = historico.atual()
+            _mostrar("Gabinete atual", linhas, inicio)
+            for r in linhas:
+                print(f"    {r['modulo']:<70} {r['name'] or '-'} (desde {r['valido_de']})")
+        if args.mudancas is not None:
+            inicio = time.perf_counter()
+            mudancas = historico.mudancas(args.mudancas)
+            _mostrar(f"Mudanças nos últimos {args.mudancas:g} dias", mudancas, inicio)
+            for m in mudancas:
+                if m["antes"] is None:
+                    print(f"    {m['em']} {m['modulo']}: novo ({m['depois']['name']})")
+                    continue
+                for campo in m["campos"]:
+                    print(f"    {m['em']} {m['modulo']}: {campo} {json.dumps(m['antes'][campo], ensure_ascii=False)}"
+                          f" -> {json.dumps(m['depois'][campo], ensure_ascii=False)}")
+        if args.pessoa:
+            inicio = time.perf_counter()
+            linhas = historico.pessoa(args.pessoa)
+            _mostrar(f"Versões com {args.pessoa}", linhas, inicio)
+            for r in linhas:
+                print(f"    {r['modulo']}: {r['title'] or '-'} ({r['valido_de']} - {r['valido_ate'] or 'atual'})")
+        if args.modulo:
+            inicio = time.perf_counter()
+            linhas = historico.versoes(args.modulo)
+            _mostrar(f"Versões de {args.modulo}", linhas, inicio)
+            for r in linhas:
+                print(f"    {r['valido_de']} - {r['valido_ate'] or 'atual'}: {r['name'] or '-'} "
+                      f"{'; '.join(r['phones'])} {'; '.join(r['emails'])}")
+
+
+if __name__ == "__main__":
+    main()
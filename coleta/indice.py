@@ -0,0 +1,146 @@
+"""
+Índice de texto da árvore, montado em uma única passada.
+
+Heurísticas como "para cada div, div.get_text() contém 'Ministro de Estado'?"
+percorrem a subárvore de novo a cada chamada, o que fica quadrático na
+profundidade do aninhamento. O IndiceTexto percorre a árvore uma vez, junta
+todo o texto da página em uma string só e guarda, para cada tag, o intervalo
+[inicio, fim) do seu texto nessa string. Assim:
+
+    indice = IndiceTexto(soup)               # equivale a get_text(strip=True)
+    indice.texto(div)                        # == div.get_text(strip=True)
+    indice.busca(padrao, div)                # padrao.search sem copiar o texto
+    indice.contem(div, "Gabinete")           # "Gabinete" in div.get_text(...)
+    indice.buscar(padrao, "div", excluir=["Gabinete"])
+
+Com separador=" " (ou "\\n") o índice equivale a get_text(separator=" ", strip=True).
+"""
+from bs4.element import CData, NavigableString, Tag
+
+# Mesmos tipos de texto que o get_text() do BeautifulSoup considera
+# (comentários, <script> e <style> ficam de fora)
+TIPOS_TEXTO = (NavigableString, CData)
+_TIPOS_PADRAO = set(TIPOS_TEXTO)
+
+
+class IndiceTexto:
+    """
+    Texto de todas as subárvores a partir de uma passada linear na árvore
+    """
+
+    def __init__(self, raiz, separador="", strip=True):
+        self.raiz = raiz
+        self.separador = separador
+        self.strip = strip
+        self._intervalos = {}
+        self._tags = []
+        self._por_tag = {}
+        self._por_classe = {}
+        # <script>, <style> e <template>: o get_text() deles usa outros tipos de texto
+        self._especiais = set()
+        self.pagina = self._indexar(raiz)
+
+    def _indexar(self, raiz):
+        partes = []
+        inicios = []
+        posicao = 0
+        tamanho_sep = len(self.separador)
+        primeira_parte = {}
+
+        pilha = [(raiz, False)]
+        while pilha:
+            no, saindo = pilha.pop()
+            if saindo:
+                k = primeira_parte.pop(id(no))
+                if len(partes) > k:
+                    fim = inicios[-1] + len(partes[-1])
+                    self._intervalos[id(no)] = (inicios[k], fim)
+                else:
+                    self._intervalos[id(no)] = (posicao, posicao)
+                continue
+
+            if isinstance(no, Tag):
+                primeira_parte[id(no)] = len(partes)
+                if no.interesting_string_types != _TIPOS_PADRAO:
+                    self._especiais.add(id(no))
+                if no is not raiz:
+                    self._tags.append(no)
+                    self._por_tag.setdefault(no.name, []).append(no)
+                    for classe in no.get("class") or []:
+                        self._por_classe.setdefault(classe, []).append(no)
+                pilha.append((no, True))
+                pilha.extend((filho, False) for filho in reversed(no.contents))
+            elif type(no) in TIPOS_TEXTO:
+                texto = no.strip() if self.strip else str(no)
+                if self.strip and not texto:
+                    continue
+                if partes:
+                    posicao += tamanho_sep
+                inicios.append(posicao)
+                partes.append(texto)
+                posicao += len(texto)
+
+        return self.separador.join(partes)
+
+    # --- texto de uma tag ---------------------------------------------------
+
+    def intervalo(self, tag):
+        """
+        (inicio, fim) do texto da tag dentro de self.pagina
+        """
+        return self._intervalos[id(tag)]
+
+    def texto(self, tag):
+        if id(tag) in self._especiais:
+            return tag.get_text(self.separador, strip=self.strip)
+        inicio, fim = self._intervalos[id(tag)]
+        return self.pagina[inicio:fim]
+
+    def contem(self, tag, trecho):
+        """
+        True se o texto da tag contém o trecho (sem copiar o texto)
+        """
+        if id(tag) in self._especiais:
+            return trecho in self.texto(tag)
+        inicio, fim = self._intervalos[id(tag)]
+        return self.pagina.find(trecho, inicio, fim) != -1
+
+    def busca(self, padrao, tag):
+        """
+        padrao.search restrito ao texto da tag (sem copiar o texto).
+        Atenção: ^ e \\b no início usam o contexto da página inteira.
+        """
+        if id(tag) in self._especiais:
+            return padrao.search(self.texto(tag))
+        inicio, fim = self._intervalos[id(tag)]
+        return padrao.search(self.pagina, inicio, fim)
+
+    # --- consultas ----------------------------------------------------------
+
+    def por_tag(self, nomes):
+        """
+        Tags com o(s) nome(s) informado(s), em ordem de documento
+        """
+        if isinstance(nomes, str):
+            return list(self._por_tag.get(nomes, []))
+        nomes = set(nomes)
+        return [t for t in self._tags if t.name in nomes]
+
+    def por_classe(self, classe):
+        """
+        Tags que têm a classe CSS informada, em ordem de documento
+        """
+        return list(self._por_classe.get(classe, []))
+
+    def buscar(self, padrao, nomes=None, excluir=()):
+        """
+        Gera as tags (opcionalmente só as de nome em nomes) cujo texto casa com
+        padrao e não contém nenhum dos trechos de excluir, em ordem de documento
+        """
+        candidatas = self._tags if nomes is None else self.por_tag(nomes)
+        for tag in candidatas:
+            if not self.busca(padrao, tag):
+                continue
+            if any(self.contem(tag, trecho) for trecho in excluir):
+                continue
+            yield tag
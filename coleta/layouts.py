@@ -0,0 +1,513 @@
+"""
+Identificação do layout Plone da página e despacho para o extrator certo.
+
+As páginas dos ministérios seguem poucos layouts:
+
+    autoridade       h1.documentFirstHeading + p.autoridade (Secretaria-Geral, SRI)
+    dados_pessoa     cartões div.dados-pessoa com p.nome/p.cargo/p.telefone/p.email
+                     (Saúde, MMA, GSI e a maioria dos "quem é quem")
+    item_autoridade  div.item com p.nome-autoridade + p.cargo-autoridade (Cultura, MDIC)
+    tabela           tabelas na div#content-core (Casa Civil)
+    strong_cargo     nome em <strong> e o cargo "Ministro" em texto próprio (MDA)
+
+classificar() reconhece o layout por marcadores nos bytes da página (sem parse)
+e o resultado fica guardado por URL, com uma impressão digital dos bytes
+(CRC32): registrar() consulta esse cache antes e só classifica de novo quando
+a página mudou. O cache fica em .cache/layouts.json (ou COLETA_LAYOUTS) e vale
+entre execuções e entre os processos do pool. extrair() vai direto ao extrator
+do layout e só recorre à heurística genérica (subir a partir de cada texto
+"Ministro") quando o layout é desconhecido ou o extrator especializado não
+acha o ministro; nesse caso a URL fica marcada como genérica até a página mudar.
+
+Uso:
+    python -m coleta.layouts      # layout de cada snapshot e tempos
+"""
+import json
+import os
+import re
+import threading
+import time
+import zlib
+
+import soupsieve
+
+from coleta import contatos, expressoes, telefones
+from coleta.armazem import gravar_atomico, trava_de_arquivo
+from coleta.ministerios import RAIZ
+
+GENERICO = "generico"
+ARQUIVO = os.environ.get("COLETA_LAYOUTS", os.path.join(RAIZ, ".cache", "layouts.json"))
+
+_RE_MINISTRO = expressoes.compilar(r"\bMinistr[oa]\b", re.I)
+_RE_TELEFONE = contatos.TELEFONE_FLEXIVEL
+_RE_EMAIL = contatos.EMAIL_COMPLETO
+_RE_REGIOES = {
+    "content": re.compile(rb"""id=["']content["']"""),
+    "content-core": re.compile(rb"""id=["']content-core["']"""),
+}
+_CARTOES = soupsieve.compile("div.dados-pessoa, div.dados-possoa")
+
+
+class Layout:
+    """
+    Layout conhecido: marcadores em bytes (todos precisam aparecer), seletores
+    equivalentes para quando só a árvore está disponível e o extrator
+    """
+
+    def __init__(self, nome, marcadores, seletores, extrator, regiao="content", exige_regiao=False):
+        self.nome = nome
+        self.marcadores = [re.compile(m) for m in marcadores]
+        self.seletores = [soupsieve.compile(s) for s in seletores]
+        self.extrator = extrator
+        self.regiao = regiao
+        self.exige_regiao = exige_regiao
+
+    def reconhece(self, conteudo, inicio=None):
+        """
+        inicio: posição da região do layout (div#content ou div#content-core)
+        nos bytes, ou None se ela não existir; os marcadores só são procurados
+        a partir dela, pulando cabeçalho e menus
+        """
+        if inicio is None:
+            if self.exige_regiao:
+                return False
+            inicio = 0
+        return all(m.search(conteudo, inicio) for m in self.marcadores)
+
+    def reconhece_arvore(self, soup):
+        return all(s.select_one(soup) is not None for s in self.seletores)
+
+
+def _registro(name, title, emails, phones, base_url):
+    return {
+        "name": name,
+        "title": title,
+        "emails": list(dict.fromkeys(emails)),
+        "phones": list(dict.fromkeys(phones)),
+        "source": base_url,
+    }
+
+
+def _emails_do_bloco(bloco, texto):
+    emails = [a["href"].split("mailto:", 1)[1].strip()
+              for a in bloco.find_all("a", href=True) if a["href"].startswith("mailto:")]
+    return emails + _RE_EMAIL.findall(texto)
+
+
+# --- extratores especializados -----------------------------------------------
+
+def extrair_autoridade(soup, base_url):
+    """
+    h1.documentFirstHeading com o nome e p.autoridade com o cargo
+    """
+    h1 = soup.find("h1", class_="documentFirstHeading")
+    if not h1:
+        return None
+    autor = soup.find("p", class_="autoridade")
+    tel_p = soup.find("p", class_="telefone")
+    email_p = soup.find("p", class_="email")
+    return _registro(
+        h1.get_text(strip=True),
+        autor.get_text(strip=True) if autor else None,
+        _RE_EMAIL.findall(email_p.get_text()) if email_p else [],
+        _RE_TELEFONE.findall(tel_p.get_text()) if tel_p else [],
+        base_url,
+    )
+
+
+def _cargo_do_cartao(cartao):
+    """
+    Texto do p.cargo do cartão; sem ele, o título do grupo da lista-pessoas
+    (o a.toggle do <li> que contém o cartão, ex.: "Ministro")
+    """
+    cargo = cartao.find(class_="cargo")
+    if cargo:
+        return cargo.get_text(" ", strip=True)
+    grupo = cartao.find_parent("li")
+    titulo = grupo.find("a", class_="toggle", recursive=False) if grupo else None
+    return titulo.get_text(" ", strip=True) if titulo else ""
+
+
+def extrair_dados_pessoa(soup, base_url):
+    """
+    Primeiro cartão dados-pessoa (em ordem de documento) cujo cargo começa por
+    Ministro/Ministra
+    """
+    escolhido = None
+    for cartao in _CARTOES.iselect(soup):
+        texto_cargo = _cargo_do_cartao(cartao)
+        if re.match(r"Ministr[oa]\b", texto_cargo, re.I):
+            escolhido = cartao, texto_cargo
+            break
+    if escolhido is None:
+        return None
+
+    cartao, texto_cargo = escolhido
+    nome = cartao.find(class_="nome")
+    telefone = cartao.find(class_="telefone")
+    email = cartao.find(class_="email")
+    texto_email = email.get_text(" ", strip=True) if email else ""
+    return _registro(
+        nome.get_text(" ", strip=True) if nome else None,
+        texto_cargo,
+        _emails_do_bloco(email, texto_email) if email else [],
+        _RE_TELEFONE.findall(telefone.get_text(" ", strip=True)) if telefone else [],
+        base_url,
+    )
+
+
+def extrair_item_autoridade(soup, base_url):
+    """
+    div.item com p.nome-autoridade e p.cargo-autoridade
+    """
+    for cargo in soup.find_all("p", class_="cargo-autoridade"):
+        texto_cargo = cargo.get_text(" ", strip=True)
+        if not _RE_MINISTRO.search(texto_cargo):
+            continue
+        item = cargo.find_parent(class_="item") or cargo.parent
+        nome = item.find(class_="nome-autoridade")
+        texto = item.get_text(" ", strip=True)
+        return _registro(
+            nome.get_text(" ", strip=True) if nome else None,
+            texto_cargo,
+            _emails_do_bloco(item, texto),
+            _RE_TELEFONE.findall(texto),
+            base_url,
+        )
+    return None
+
+
+def extrair_tabela(soup, base_url):
+    """
+    Primeira célula de tabela da div#content-core que menciona Ministro(a):
+    cargo na primeira linha e nome na segunda
+    """
+    conteudo = soup.find(id="content-core") or soup
+    for celula in conteudo.select("table td"):
+        linhas = [l for l in celula.get_text(separator="\n", strip=True).split("\n") if l.strip()]
+        if not any(_RE_MINISTRO.search(l) for l in linhas):
+            continue
+        linha_tabela = celula.find_parent("tr") or celula
+        texto = linha_tabela.get_text(" ", strip=True)
+        nome, cargo = (linhas[1], linhas[0]) if len(linhas) >= 2 else (linhas[0], "Ministro")
+        return _registro(nome, cargo, _emails_do_bloco(linha_tabela, texto), _RE_TELEFONE.findall(texto), base_url)
+    return None
+
+
+def extrair_strong_cargo(soup, base_url):
+    """
+    Texto "Ministro"/"Ministra" isolado; o nome está no <strong> do mesmo bloco
+    """
+    cargo = soup.find(string=lambda t: t and t.strip() in ("Ministro", "Ministra"))
+    if not cargo:
+        return None
+    bloco = cargo.find_parent(["p", "div"])
+    if bloco is None:
+        return None
+    strong = bloco.find("strong")
+    texto = bloco.get_text(" ", strip=True)
+    return _registro(
+        strong.get_text(strip=True).split("-")[0].strip() if strong else None,
+        cargo.strip(),
+        _emails_do_bloco(bloco, texto),
+        _RE_TELEFONE.findall(texto),
+        base_url,
+    )
+
+
+# --- heurística genérica -----------------------------------------------------
+
+def extrair_generico(soup, base_url, niveis=5, exigir_contato=False, padrao=_RE_MINISTRO,
+                     emails_filtrados_se_vazio=False):
+    """
+    Sobe alguns níveis a partir de cada texto que menciona Ministro(a) e tenta
+    ler nome, cargo, e-mails e telefones do bloco (lento: percorre a página
+    toda e pode testar vários blocos)
+    """
+    for text_node in soup.find_all(string=padrao):
+        container = text_node
+        for _ in range(niveis):
+            parent = container.parent
+            if parent is None:
+                break
+            container = parent
+
+        block_text = container.get_text("\n", strip=True)
+        if exigir_contato:
+            has_email = bool(re.search(r"mailto:", str(container)) or re.search(r"[\w.+-]+@[\w.-]+\.[a-zA-Z]{2,}", block_text))
+            has_phone = bool(re.search(r"\(\d{2}\)\s*\d{4,5}-?\d{4}", block_text))
+            if not (has_email or has_phone):
+                continue
+
+        todos_emails = []
+        for a in container.find_all("a", href=True):
+            href = a["href"]
+            if href.startswith("mailto:"):
+                todos_emails.append(href.split("mailto:", 1)[1].strip())
+        emails = [e for e in todos_emails if not re.search(r"cerimonial|agenda", e, re.I)]
+        if not emails and emails_filtrados_se_vazio:
+            emails = todos_emails
+
+        phones = []
+        lines = [l.strip() for l in block_text.splitlines() if l.strip()]
+        tele_lines = [l for l in lines if re.search(r"Telefones?:", l, re.I) and not re.search(r"Fax", l, re.I)]
+        for tl in tele_lines:
+            # O DDD do primeiro número vale para os seguintes ("(61) 3411-1117 / 3411-1345")
+            for n in telefones.expandir(tl):
+                if n not in phones:
+                    phones.append(n)
+
+        if len(phones) < 3:
+            all_phones = []
+            for l in lines:
+                if re.search(r"Fax", l, re.I):
+                    continue
+                all_phones.extend(t.formatado() for t in telefones.ler(l, soltos=False) if t.ddd)
+            for p in all_phones:
+                if p not in phones:
+                    phones.append(p)
+                if len(phones) >= 3:
+                    break
+
+        name = None
+        title = None
+        for i, line in enumerate(lines):
+            if padrao.search(line):
+                title = line
+                if i > 0:
+                    possible_name = lines[i - 1]
+                    if not re.search(r"\(\d{2}\)|mailto:|Telefones?:|Fax:", possible_name, re.I):
+                        name = possible_name
+                if not name:
+                    m = re.search(r"^(?P<name>.+?)\s+" + padrao.pattern, line, re.I)
+                    if m:
+                        name = m.group("name").strip()
+                break
+
+        if not name and lines:
+            name = lines[0]
+
+        return {
+            "name": name,
+            "title": title,
+            "emails": list(dict.fromkeys(emails)),
+            "phones": phones,
+            "source": base_url,
+        }
+
+    return None
+
+
+def _classe(nome):
+    """
+    Marcador de uma classe CSS inteira no atributo class (bytes)
+    """
+    return rb"""class=["'](?:[^"']*\s)?""" + nome + rb"""["'\s]"""
+
+
+# Ordem de teste: do layout mais específico para o mais comum
+LAYOUTS = [
+    Layout("autoridade",
+           [_classe(rb"documentFirstHeading"), rb"<p\b[^>]*" + _classe(rb"autoridade")],
+           ["h1.documentFirstHeading", "p.autoridade"], extrair_autoridade),
+    Layout("dados_pessoa",
+           [_classe(rb"dados-p[eo]ssoa")],
+           ["div.dados-pessoa, div.dados-possoa"], extrair_dados_pessoa),
+    Layout("item_autoridade",
+           [_classe(rb"nome-autoridade"), _classe(rb"cargo-autoridade")],
+           [".nome-autoridade", "p.cargo-autoridade"], extrair_item_autoridade),
+    Layout("tabela",
+           [rb"<td\b"],
+           ["#content-core td"], extrair_tabela, regiao="content-core", exige_regiao=True),
+    Layout("strong_cargo",
+           [rb"<strong\b", rb">\s*Ministr[oa]\s*<"],
+           ["strong"], extrair_strong_cargo),
+]
+POR_NOME = {layout.nome: layout for layout in LAYOUTS}
+
+# url -> {"layout", "impressao"}; carregado de ARQUIVO no primeiro uso
+_por_url = {}
+_trava = threading.Lock()
+_estado = {"carregado": False}
+_contadores = {"acertos": 0, "classificacoes": 0, "reclassificacoes": 0, "inalteradas": 0}
+
+
+def classificar(conteudo):
+    """
+    Nome do layout reconhecido pelos marcadores nos bytes (ou GENERICO)
+    """
+    if isinstance(conteudo, str):
+        conteudo = conteudo.encode("utf-8")
+    inicios = {}
+    for layout in LAYOUTS:
+        if layout.regiao not in inicios:
+            achado = _RE_REGIOES[layout.regiao].search(conteudo)
+            inicios[layout.regiao] = achado.start() if achado else None
+        if layout.reconhece(conteudo, inicios[layout.regiao]):
+            return layout.nome
+    return GENERICO
+
+
+def classificar_arvore(soup):
+    """
+    Como classificar(), para quando só a árvore está disponível
+    """
+    for layout in LAYOUTS:
+        if layout.reconhece_arvore(soup):
+            return layout.nome
+    return GENERICO
+
+
+def impressao(conteudo):
+    """
+    Impressão digital dos bytes da página: se ela não mudou, o layout também não
+    """
+    if isinstance(conteudo, str):
+        conteudo = conteudo.encode("utf-8")
+    return zlib.crc32(conteudo)
+
+
+def _carregar():
+    """
+    Lê o cache em disco uma vez por processo (com _trava tomada)
+    """
+    if _estado["carregado"]:
+        return
+    _estado["carregado"] = True
+    try:
+        with open(ARQUIVO, encoding="utf-8") as f:
+            guardados = json.load(f)
+    except (OSError, ValueError):
+        return
+    for url, entrada in guardados.items():
+        _por_url.setdefault(url, entrada)
+
+
+def _guardar(url, entrada):
+    """
+    Grava o layout da URL no cache em disco (junto com o que outros processos
+    já gravaram)
+    """
+    try:
+        os.makedirs(os.path.dirname(ARQUIVO), exist_ok=True)
+        with trava_de_arquivo(ARQUIVO + ".trava"):
+            try:
+                with open(ARQUIVO, encoding="utf-8") as f:
+                    guardados = json.load(f)
+            except (OSError, ValueError):
+                guardados = {}
+            guardados[url] = entrada
+            gravar_atomico(ARQUIVO, json.dumps(guardados, ensure_ascii=False, sort_keys=True).encode("utf-8"))
+    except OSError:
+        # Sem disco o cache continua valendo na memória
+        pass
+
+
+def _definir(url, nome, marca, contador):
+    entrada = {"layout": nome, "impressao": marca}
+    with _trava:
+        _carregar()
+        _por_url[url] = entrada
+        _contadores[contador] += 1
+    _guardar(url, entrada)
+
+
+def registrar(url, conteudo):
+    """
+    Layout da URL pelos bytes (chamado por quem ainda tem o corpo da resposta,
+    antes do parse): o guardado, se a impressão digital não mudou; senão a
+    página é classificada de novo
+    """
+    marca = impressao(conteudo)
+    with _trava:
+        _carregar()
+        guardado = _por_url.get(url)
+        if guardado is not None and guardado["impressao"] == marca:
+            _contadores["inalteradas"] += 1
+            return guardado["layout"]
+    nome = classificar(conteudo)
+    _definir(url, nome, marca, "classificacoes")
+    return nome
+
+
+def layout_da_url(url):
+    with _trava:
+        _carregar()
+        guardado = _por_url.get(url)
+    return guardado["layout"] if guardado is not None else None
+
+
+def esquecer(url=None):
+    """
+    Descarta o layout guardado da URL (ou de todas) nesta execução
+    """
+    with _trava:
+        _carregar()
+        if url is None:
+            _por_url.clear()
+        else:
+            _por_url.pop(url, None)
+
+
+def estatisticas():
+    with _trava:
+        return dict(_contadores, urls=len(_por_url))
+
+
+def extrair(soup, base_url, conteudo=None, generico=extrair_generico):
+    """
+    Extrai o ministro com o extrator do layout da página.
+
+    O layout vem do cache por URL; se ainda não foi classificado, usa os bytes
+    (conteudo) ou, sem eles, a própria árvore. Se o extrator especializado não
+    achar o ministro, a URL passa a ser genérica (até a página mudar) e a
+    heurística genérica é usada.
+    """
+    nome = registrar(base_url, conteudo) if conteudo is not None else layout_da_url(base_url)
+    if nome is None:
+        nome = classificar_arvore(soup)
+        # Sem os bytes não há impressão digital: a próxima registrar() classifica de novo
+        _definir(base_url, nome, None, "classificacoes")
+    elif conteudo is None:
+        with _trava:
+            _contadores["acertos"] += 1
+
+    if nome != GENERICO:
+        registro = POR_NOME[nome].extrator(soup, base_url)
+        if registro:
+            return registro
+        with _trava:
+            marca = _por_url[base_url]["impressao"] if base_url in _por_url else None
+        _definir(base_url, GENERICO, marca, "reclassificacoes")
+    return generico(soup, base_url)
+
+
+def main():
+    from coleta import offline, parsers
+
+    print(f"{'snapshot':<32} {'layout':<16} {'classif. (ms)':>13} {'despacho (ms)':>14} {'genérico (ms)':>14}  ministro")
+    for url, caminho in sorted(offline.carregar_mapeamento().items(), key=lambda i: i[1]):
+        with open(caminho, "rb") as f:
+            conteudo = f.read()
+        soup = parsers.criar_soup(conteudo)
+
+        inicio = time.perf_counter()
+        nome = registrar(url, conteudo)
+        t_classificar = time.perf_counter() - inicio
+
+        inicio = time.perf_counter()
+        registro = extrair(soup, url)
+        t_despacho = time.perf_counter() - inicio
+
+        inicio = time.perf_counter()
+        extrair_generico(soup, url)
+        t_generico = time.perf_counter() - inicio
+
+        ministro = f"{registro['name']} | {registro['title']}" if registro else "-"
+        print(f"{caminho[-32:]:<32} {nome:<16} {t_classificar * 1000:>13.2f} {t_despacho * 1000:>14.2f} "
+              f"{t_generico * 1000:>14.2f}  {ministro[:90]}")
+    print(estatisticas())
+
+
+if __name__ == "__main__":
+    main()
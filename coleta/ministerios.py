@@ -0,0 +1,151 @@
+import importlib.util
+import os
+import sys
+
+from coleta import parsers
+
+# Diretório raiz do repositório (onde ficam certos/, falta/ e os scripts avulsos)
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Pastas e padrões de arquivos que contêm os scripts por ministério
+PASTAS_SCRIPTS = ["certos", "falta", ""]
+
+
+def listar_scripts(raiz=RAIZ):
+    """
+    Lista os caminhos dos scripts de ministério (certos/, falta/ e ministro_*.py da raiz)
+    """
+    caminhos = []
+    for pasta in PASTAS_SCRIPTS:
+        diretorio = os.path.join(raiz, pasta)
+        if not os.path.isdir(diretorio):
+            continue
+        for nome in sorted(os.listdir(diretorio)):
+            if not nome.endswith(".py"):
+                continue
+            if pasta == "" and not (nome.startswith("ministro_") or nome == "scraper_ministro.py"):
+                continue
+            caminhos.append(os.path.join(diretorio, nome))
+    return caminhos
+
+
+def nome_modulo(caminho, raiz=RAIZ):
+    """
+    Converte o caminho do script em um nome de módulo único (ex.: falta.ministro_do_turismo)
+    """
+    relativo = os.path.relpath(caminho, raiz)
+    return os.path.splitext(relativo)[0].replace(os.sep, ".")
+
+
+def carregar_script(caminho, raiz=RAIZ):
+    """
+    Importa um script pelo caminho do arquivo, sem executar o bloco __main__
+    """
+    nome = nome_modulo(caminho, raiz)
+    if nome in sys.modules:
+        return sys.modules[nome]
+    spec = importlib.util.spec_from_file_location(nome, caminho)
+    modulo = importlib.util.module_from_spec(spec)
+    sys.modules[nome] = modulo
+    try:
+        spec.loader.exec_module(modulo)
+    except Exception:
+        del sys.modules[nome]
+        raise
+    return modulo
+
+
+def extrator_do_modulo(modulo):
+    """
+    Retorna (tipo, função) do extrator do script: 'soup' para extract_minister(soup)
+    e 'html' para extrair_dados(html). Retorna (None, None) se o script não tiver um.
+    """
+    if hasattr(modulo, "extract_minister"):
+        return "soup", modulo.extract_minister
+    if hasattr(modulo, "extrair_dados"):
+        return "html", modulo.extrair_dados
+    return None, None
+
+
+def descobrir_ministerios(raiz=RAIZ, motor=None, avisar=True):
+    """
+    Reúne os ministérios descritos por regras (regras/*.json, coleta/regras.py)
+    e os scripts que possuem a constante URL e um extrator reutilizável. Scripts
+    já cobertos por uma regra não são importados.
+
+    Retorna (ministerios, ignorados), onde ministerios é uma lista de dicionários
+    {modulo, url, urls_alternativas, tipo, extrator, somente_conteudo,
+    extrator_rapido, layout} e ignorados é uma lista de (modulo, motivo).
+    somente_conteudo vem da constante SOMENTE_CONTEUDO do script (o extrator só
+    lê a div#content-core); extrator_rapido é o extract_minister_fast(tree) do
+    script, que lê a árvore do selectolax, ou None; layout vem da constante
+    DESPACHA_POR_LAYOUT (o extrator usa o layout da URL, coleta/layouts.py). Com
+    avisar, cada script ignorado é informado no stderr: ele fica fora da coleta.
+    """
+    # Importado aqui: coleta.regras depende (via cache_http/armazem) deste módulo
+    from coleta import regras
+
+    motor = motor or regras.motor_padrao()
+    ministerios = motor.ministerios()
+    cobertos = motor.scripts_cobertos()
+    ignorados = []
+    for caminho in listar_scripts(raiz):
+        if os.path.normpath(os.path.relpath(caminho, raiz)) in cobertos:
+            continue
+        nome = nome_modulo(caminho, raiz)
+        try:
+            modulo = carregar_script(caminho, raiz)
+        except Exception as e:
+            ignorados.append((nome, f"erro ao importar: {e}"))
+            continue
+
+        url = getattr(modulo, "URL", None)
+        tipo, extrator = extrator_do_modulo(modulo)
+        if not url:
+            ignorados.append((nome, "sem constante URL"))
+            continue
+        if not extrator:
+            ignorados.append((nome, "sem extract_minister/extrair_dados"))
+            continue
+
+        ministerios.append({
+            "modulo": nome,
+            "url": url,
+            "urls_alternativas": list(getattr(modulo, "URLS_ALTERNATIVAS", [])),
+            "tipo": tipo,
+            "extrator": extrator,
+            "somente_conteudo": getattr(modulo, "SOMENTE_CONTEUDO", False),
+            "extrator_rapido": getattr(modulo, "extract_minister_fast", None),
+            "layout": getattr(modulo, "DESPACHA_POR_LAYOUT", False),
+        })
+    if avisar:
+        for nome, motivo in ignorados:
+            print(f"[AVISO] {nome} fora da coleta: {motivo}", file=sys.stderr)
+    return ministerios, ignorados
+
+
+def montar_soup(ministerio, conteudo, parser=None, somente_conteudo=None):
+    """
+    Monta a árvore que o extract_minister do script espera
+    """
+    if somente_conteudo is None:
+        somente_conteudo = ministerio["somente_conteudo"]
+    return parsers.criar_soup(conteudo, parser, somente_conteudo=somente_conteudo)
+
+
+def usa_rapido(ministerio):
+    """
+    Se a extração deve usar o extract_minister_fast do script: o selectolax foi
+    escolhido e o script tem a versão rápida
+    """
+    return parsers.rapido() and ministerio.get("extrator_rapido") is not None
+
+
+def extrair_pagina(ministerio, conteudo):
+    """
+    Monta a árvore que o extrator do script espera e roda o extrator
+    """
+    if usa_rapido(ministerio):
+        arvore = parsers.criar_arvore_rapida(conteudo, somente_conteudo=ministerio["somente_conteudo"])
+        return ministerio["extrator_rapido"](arvore)
+    return ministerio["extrator"](montar_soup(ministerio, conteudo))
@@ -0,0 +1,88 @@
+"""
+Modo offline: serve as páginas a partir dos snapshots HTML salvos no repositório.
+
+O arquivo snapshots.json (na raiz) mapeia URL -> arquivo HTML. Com o modo
+offline ativo, cache_http.get (usado por todos os scripts) lê o arquivo
+correspondente em vez de acessar a rede; URLs sem snapshot falham com
+requests.ConnectionError, como uma falha de rede.
+
+Ativação:
+    COLETA_OFFLINE=1 python falta/ministro_do_turismo.py
+    python -m coleta.crawler --offline
+
+COLETA_SNAPSHOTS aponta para outro arquivo de mapeamento; os caminhos do
+mapeamento são relativos ao diretório desse arquivo. Arquivos .json são
+servidos como application/json (respostas gravadas da API do Plone, em
+URLs ++api++; coleta/plone.py).
+"""
+import json
+import os
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from coleta.ministerios import RAIZ
+
+MAPEAMENTO = os.environ.get("COLETA_SNAPSHOTS", os.path.join(RAIZ, "snapshots.json"))
+
+_estado = {"ativo": os.environ.get("COLETA_OFFLINE", "") not in ("", "0"), "mapeamento": None}
+
+
+def ativar(mapeamento=None):
+    """
+    Liga o modo offline (opcionalmente com outro arquivo de mapeamento)
+    """
+    global MAPEAMENTO
+    if mapeamento:
+        MAPEAMENTO = mapeamento
+        _estado["mapeamento"] = None
+    _estado["ativo"] = True
+
+
+def desativar():
+    _estado["ativo"] = False
+
+
+def ativo():
+    return _estado["ativo"]
+
+
+def carregar_mapeamento():
+    """
+    Retorna {url: caminho absoluto do snapshot}
+    """
+    if _estado["mapeamento"] is None:
+        with open(MAPEAMENTO, encoding="utf-8") as f:
+            mapa = json.load(f)
+        base = os.path.dirname(os.path.abspath(MAPEAMENTO))
+        _estado["mapeamento"] = {url: os.path.join(base, arquivo) for url, arquivo in mapa.items()}
+    return _estado["mapeamento"]
+
+
+def snapshot_de(url):
+    """
+    Caminho do snapshot da URL, ou None
+    """
+    return carregar_mapeamento().get(url)
+
+
+def get(url):
+    """
+    Monta um requests.Response com o conteúdo do snapshot da URL
+    """
+    caminho = snapshot_de(url)
+    if not caminho or not os.path.exists(caminho):
+        raise requests.ConnectionError(f"modo offline: sem snapshot para {url}")
+    with open(caminho, "rb") as f:
+        conteudo = f.read()
+
+    resp = requests.Response()
+    resp.url = url
+    resp.status_code = 200
+    tipo = "application/json" if caminho.endswith(".json") else "text/html; charset=utf-8"
+    resp.headers = CaseInsensitiveDict({"Content-Type": tipo})
+    resp.encoding = "utf-8"
+    resp._content = conteudo
+    resp.nao_modificado = False
+    resp.do_cache = True
+    return resp
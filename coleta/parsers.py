@@ -0,0 +1,174 @@
+"""
+Ponto único de escolha do parser HTML.
+
+Todos os scripts montam a árvore com criar_soup(). O backend padrão continua
+sendo o "html.parser" do Python; lxml e html5lib são alternativas compatíveis
+com o BeautifulSoup (os extratores funcionam sem mudança). O "selectolax" usa o
+motor lexbor, muito mais rápido, mas não é compatível com o BeautifulSoup: com
+ele escolhido, os scripts que têm extract_minister_fast(tree) recebem a árvore
+de criar_arvore_rapida() e os outros continuam no html.parser.
+
+Escolha do backend:
+    COLETA_PARSER=lxml python falta/ministro_do_turismo.py
+    parsers.configurar("lxml")
+    python -m coleta.crawler --parser selectolax
+
+Scripts que só leem a div#content-core podem pedir criar_soup(...,
+somente_conteudo=True): a região é recortada direto nos bytes e só ela (mais o
+<title>) vira árvore, sem o cabeçalho, menus e rodapé do Plone. Se a região não
+existir, o documento inteiro é usado.
+"""
+import os
+import re
+
+from bs4 import BeautifulSoup
+
+# Backends compatíveis com BeautifulSoup (nome -> "features" do bs4)
+BACKENDS_BS4 = {
+    "html.parser": "html.parser",
+    "lxml": "lxml",
+    "html5lib": "html5lib",
+}
+BACKEND_RAPIDO = "selectolax"
+# Opções de COLETA_PARSER / --parser
+BACKENDS = (*BACKENDS_BS4, BACKEND_RAPIDO)
+
+_estado = {"parser": os.environ.get("COLETA_PARSER", "html.parser")}
+
+# Tags cujo conteúdo o get_text() do BeautifulSoup não inclui
+_SEM_TEXTO = {"script", "style", "template"}
+
+_RE_CONTEUDO = re.compile(rb"""<div\b[^>]*\bid=["']content-core["']""", re.I)
+_RE_DIV = re.compile(rb"<(/?)div\b", re.I)
+_RE_TITULO = re.compile(rb"<title\b[^>]*>.*?</title>", re.I | re.S)
+_RE_CHARSET = re.compile(rb"""<meta[^>]+charset=["']?([\w-]+)""", re.I)
+
+
+def configurar(nome):
+    """
+    Define o backend usado por criar_soup() (ou o selectolax, para os
+    extratores que têm a versão rápida)
+    """
+    if nome not in BACKENDS:
+        raise ValueError(f"parser desconhecido: {nome} (opções: {', '.join(BACKENDS)})")
+    _estado["parser"] = nome
+
+
+def parser_atual():
+    return _estado["parser"]
+
+
+def rapido():
+    """
+    Se o selectolax foi escolhido como backend
+    """
+    return _estado["parser"] == BACKEND_RAPIDO
+
+
+def disponiveis():
+    """
+    Lista os backends compatíveis com BeautifulSoup instalados neste ambiente
+    """
+    nomes = ["html.parser"]
+    for nome, modulo in (("lxml", "lxml"), ("html5lib", "html5lib")):
+        try:
+            __import__(modulo)
+        except ImportError:
+            continue
+        nomes.append(nome)
+    return nomes
+
+
+def rapido_disponivel():
+    try:
+        import selectolax  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def recortar_conteudo(conteudo):
+    """
+    Recorta a div#content-core nos bytes da página e devolve um documento mínimo
+    (charset, <title> e a div dentro do <body>). Retorna None se a região não
+    for encontrada ou não fechar.
+    """
+    if isinstance(conteudo, str):
+        conteudo = conteudo.encode("utf-8")
+        charset = b"utf-8"
+    else:
+        achado = _RE_CHARSET.search(conteudo, 0, 4096)
+        charset = achado.group(1) if achado else b"utf-8"
+
+    inicio = _RE_CONTEUDO.search(conteudo)
+    if not inicio:
+        return None
+
+    profundidade = 0
+    fim = None
+    for tag in _RE_DIV.finditer(conteudo, inicio.start()):
+        profundidade += -1 if tag.group(1) else 1
+        if profundidade == 0:
+            fim = conteudo.find(b">", tag.end())
+            break
+    if fim is None or fim < 0:
+        return None
+
+    titulo = _RE_TITULO.search(conteudo, 0, inicio.start())
+    return b"".join([
+        b'<html><head><meta charset="', charset, b'">',
+        titulo.group(0) if titulo else b"",
+        b"</head><body>",
+        conteudo[inicio.start():fim + 1],
+        b"</body></html>",
+    ])
+
+
+def criar_soup(conteudo, parser=None, somente_conteudo=False):
+    """
+    Monta o BeautifulSoup com o backend configurado (ou o informado).
+    Com somente_conteudo=True, só a div#content-core é analisada. Com o
+    selectolax escolhido, o BeautifulSoup usa o html.parser.
+    """
+    nome = parser or _estado["parser"]
+    if nome == BACKEND_RAPIDO:
+        nome = "html.parser"
+    if nome not in BACKENDS_BS4:
+        raise ValueError(f"parser desconhecido: {nome} (opções: {', '.join(BACKENDS)})")
+    if somente_conteudo:
+        conteudo = _recorte_ou_inteiro(conteudo)
+    return BeautifulSoup(conteudo, BACKENDS_BS4[nome])
+
+
+def _recorte_ou_inteiro(conteudo):
+    recorte = recortar_conteudo(conteudo)
+    return conteudo if recorte is None else recorte
+
+
+def criar_arvore_rapida(conteudo, somente_conteudo=False):
+    """
+    Árvore do selectolax (lexbor). Requer o pacote opcional selectolax.
+    """
+    try:
+        from selectolax.lexbor import LexborHTMLParser
+    except ImportError as e:
+        raise ImportError("o backend rápido requer o pacote selectolax (pip install selectolax)") from e
+    if somente_conteudo:
+        conteudo = _recorte_ou_inteiro(conteudo)
+    return LexborHTMLParser(conteudo)
+
+
+def texto_rapido(no):
+    """
+    Texto de um nó do selectolax igual ao get_text(separator=" ", strip=True)
+    do BeautifulSoup: os trechos sem espaços nas pontas, sem os vazios e sem o
+    conteúdo de <script>/<style>
+    """
+    partes = []
+    for filho in no.traverse(include_text=True):
+        if filho.tag != "-text" or (filho.parent is not None and filho.parent.tag in _SEM_TEXTO):
+            continue
+        trecho = filho.text_content.strip()
+        if trecho:
+            partes.append(trecho)
+    return " ".join(partes)
@@ -0,0 +1,302 @@
+"""
+Busca API-first nas páginas do gov.br (Plone).
+
+O gov.br roda Plone, que entrega o mesmo conteúdo de formas mais leves que a
+página inteira (~300 KB de menus, rodapé e scripts em volta da div#content-core):
+
+- api: o JSON da plone.restapi em https://www.gov.br/<site>/++api++/<caminho>;
+  o texto rico vem em "text.data" e o conteúdo de pastas e coleções em "items";
+- fragmento: <url>?ajax_load=1, só a área de conteúdo, sem o tema (é o que o
+  próprio Plone usa nas cargas por AJAX);
+- pagina: a página HTML, como antes.
+
+get() tenta as formas nessa ordem e devolve sempre HTML: o JSON vira um
+documento mínimo (título e div#content-core, como parsers.recortar_conteudo),
+então os extratores não mudam. A resposta informa a forma em "forma" e a URL
+realmente baixada em "url_fonte" (é a chave no armazém).
+
+O JSON e o fragmento podem não trazer tudo (listas montadas por views, por
+exemplo). buscar() extrai e, se o extrator não achar o ministro na forma
+reduzida, descarta essa forma para a URL por ESPERA_DESCARTE segundos e passa
+para a próxima, até a página inteira; o mesmo vale para uma forma que falhe
+(404, JSON sem conteúdo). Os descartes ficam em .cache/formas_descartadas.json
+(ou COLETA_DESCARTES) e valem entre execuções e entre processos: uma coleta
+nova não repete as formas que já falharam. No modo offline as formas reduzidas
+só existem se estiverem no mapeamento dos snapshots (arquivos .json são
+servidos como JSON), e os descartes ficam só na memória.
+
+    COLETA_FORMAS=pagina python -m coleta.crawler    # só a página, como antes
+"""
+import json
+import os
+import threading
+import time
+from html import escape
+from urllib.parse import urlsplit, urlunsplit
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from coleta import cache_http, esquema, offline, sessao, ultimos
+from coleta.armazem import gravar_atomico, trava_de_arquivo
+from coleta.ministerios import RAIZ
+
+API = "api"
+FRAGMENTO = "fragmento"
+PAGINA = "pagina"
+FORMAS = (API, FRAGMENTO, PAGINA)
+
+# Segundos até uma forma descartada para uma URL ser tentada de novo
+ESPERA_DESCARTE = float(os.environ.get("COLETA_ESPERA_DESCARTE", 24 * 3600))
+# {url: {forma: quando}} das formas descartadas, entre execuções
+ARQUIVO_DESCARTES = os.environ.get("COLETA_DESCARTES", os.path.join(RAIZ, ".cache", "formas_descartadas.json"))
+
+_estado = {"formas": tuple(os.environ.get("COLETA_FORMAS", ",".join(FORMAS)).split(",")), "carregado": False}
+_descartadas = {}
+_trava = threading.Lock()
+
+
+def configurar(formas):
+    """
+    Define as formas tentadas, em ordem (a página inteira é sempre a última)
+    """
+    formas = tuple(formas)
+    desconhecidas = set(formas) - set(FORMAS)
+    if desconhecidas:
+        raise ValueError(f"formas desconhecidas: {', '.join(sorted(desconhecidas))} (opções: {', '.join(FORMAS)})")
+    _estado["formas"] = formas
+
+
+def formas_atuais():
+    return _estado["formas"]
+
+
+def url_api(url):
+    """
+    https://www.gov.br/<site>/<caminho> -> https://www.gov.br/<site>/++api++/<caminho>
+    """
+    partes = urlsplit(url)
+    site, _, caminho = partes.path.strip("/").partition("/")
+    return urlunsplit((partes.scheme, partes.netloc, f"/{site}/++api++/{caminho}", "", ""))
+
+
+def url_fragmento(url):
+    partes = urlsplit(url)
+    consulta = f"{partes.query}&ajax_load=1" if partes.query else "ajax_load=1"
+    return urlunsplit((partes.scheme, partes.netloc, partes.path, consulta, ""))
+
+
+URLS = {API: url_api, FRAGMENTO: url_fragmento, PAGINA: lambda url: url}
+
+
+def html_do_json(dados):
+    """
+    Documento mínimo com o conteúdo do JSON da plone.restapi, ou None se ele
+    não trouxer texto nem itens
+    """
+    partes = []
+    texto = dados.get("text")
+    if isinstance(texto, dict) and texto.get("data"):
+        partes.append(texto["data"])
+    itens = [i for i in dados.get("items") or [] if isinstance(i, dict)]
+    if itens:
+        partes.append("<ul>")
+        for item in itens:
+            descricao = f"<p>{escape(item['description'])}</p>" if item.get("description") else ""
+            partes.append(f'<li><a href="{escape(item.get("@id", ""))}">{escape(item.get("title") or "")}</a>'
+                          f"{descricao}</li>")
+        partes.append("</ul>")
+    if not partes:
+        return None
+
+    titulo = escape(dados.get("title") or "")
+    return "".join([
+        f'<html><head><meta charset="utf-8"><title>{titulo}</title></head><body>',
+        f'<div id="content"><h1 class="documentFirstHeading">{titulo}</h1><div id="content-core">',
+        *partes,
+        "</div></div></body></html>",
+    ]).encode("utf-8")
+
+
+def _resposta_html(resp, conteudo):
+    """
+    Cópia da resposta com o corpo trocado pelo HTML montado a partir do JSON
+    """
+    nova = requests.Response()
+    nova.url = resp.url
+    nova.status_code = resp.status_code
+    nova.headers = CaseInsensitiveDict(resp.headers)
+    nova.headers["Content-Type"] = "text/html; charset=utf-8"
+    nova.encoding = "utf-8"
+    nova._content = conteudo
+    nova.nao_modificado = resp.nao_modificado
+    nova.do_cache = resp.do_cache
+    return nova
+
+
+def _carregar():
+    """
+    Lê os descartes em disco uma vez por processo (com _trava tomada)
+    """
+    if _estado["carregado"] or offline.ativo():
+        return
+    _estado["carregado"] = True
+    try:
+        with open(ARQUIVO_DESCARTES, encoding="utf-8") as f:
+            guardados = json.load(f)
+    except (OSError, ValueError):
+        return
+    for url, formas in guardados.items():
+        for forma, quando in formas.items():
+            _descartadas.setdefault((url, forma), quando)
+
+
+def _guardar(alterar):
+    """
+    Aplica alterar(guardados) ao arquivo de descartes, junto com o que outros
+    processos já gravaram. No modo offline nada é gravado.
+    """
+    if offline.ativo():
+        return
+    try:
+        os.makedirs(os.path.dirname(ARQUIVO_DESCARTES), exist_ok=True)
+        with trava_de_arquivo(ARQUIVO_DESCARTES + ".trava"):
+            try:
+                with open(ARQUIVO_DESCARTES, encoding="utf-8") as f:
+                    guardados = json.load(f)
+            except (OSError, ValueError):
+                guardados = {}
+            alterar(guardados)
+            conteudo = json.dumps(guardados, ensure_ascii=False, sort_keys=True)
+            gravar_atomico(ARQUIVO_DESCARTES, conteudo.encode("utf-8"))
+    except OSError:
+        # Sem disco os descartes continuam valendo na memória
+        pass
+
+
+def descartar(url, forma):
+    """
+    Não tenta a forma para a URL pelos próximos ESPERA_DESCARTE segundos
+    (a página inteira nunca é descartada)
+    """
+    if forma == PAGINA:
+        return
+    quando = time.time()
+    with _trava:
+        _carregar()
+        _descartadas[(url, forma)] = quando
+
+    def marcar(guardados):
+        guardados.setdefault(url, {})[forma] = quando
+
+    _guardar(marcar)
+
+
+def _retomar(guardados, url, forma):
+    formas = guardados.get(url, {})
+    formas.pop(forma, None)
+    if not formas:
+        guardados.pop(url, None)
+
+
+def descartada(url, forma):
+    with _trava:
+        _carregar()
+        quando = _descartadas.get((url, forma))
+        expirou = quando is not None and time.time() - quando >= ESPERA_DESCARTE
+        if expirou:
+            del _descartadas[(url, forma)]
+    if expirou:
+        _guardar(lambda guardados: _retomar(guardados, url, forma))
+        return False
+    return quando is not None
+
+
+def esquecer():
+    """
+    Volta a tentar todas as formas em todas as URLs (também nas próximas execuções)
+    """
+    with _trava:
+        _estado["carregado"] = True
+        _descartadas.clear()
+    _guardar(dict.clear)
+
+
+def _get_forma(url, forma, headers, timeout):
+    fonte = URLS[forma](url)
+    if forma == API:
+        resp = cache_http.get(fonte, headers={**(headers or {}), "Accept": "application/json"}, timeout=timeout)
+        resp.raise_for_status()
+        if "json" not in resp.headers.get("Content-Type", ""):
+            raise ValueError(f"{fonte}: resposta não é JSON")
+        conteudo = html_do_json(json.loads(resp.content))
+        if conteudo is None:
+            raise ValueError(f"{fonte}: JSON sem texto nem itens")
+        resp = _resposta_html(resp, conteudo)
+    else:
+        resp = cache_http.get(fonte, headers=headers, timeout=timeout)
+        resp.raise_for_status()
+    resp.forma = forma
+    resp.url_fonte = fonte
+    return resp
+
+
+def get(url, headers=None, timeout=sessao.TIMEOUT, formas=None):
+    """
+    A URL na forma mais leve que responder. Formas que falham são descartadas
+    para a URL; o erro da página inteira é levantado.
+    """
+    formas = [f for f in formas or _estado["formas"] if f != PAGINA and not descartada(url, f)]
+    for forma in formas:
+        try:
+            return _get_forma(url, forma, headers, timeout)
+        except (requests.RequestException, ValueError):
+            descartar(url, forma)
+    return _get_forma(url, PAGINA, headers, timeout)
+
+
+def baixar(urls, headers=None, timeout=sessao.TIMEOUT):
+    """
+    get() da primeira URL que responder; a resposta guarda em url_pedida a
+    URL (sem a forma) que deu certo
+    """
+    erro = None
+    for url in urls:
+        try:
+            resp = get(url, headers=headers, timeout=timeout)
+            resp.url_pedida = url
+            return resp
+        except Exception as e:
+            erro = e
+    raise erro
+
+
+def incompleto(resp, registro):
+    """
+    A forma reduzida não trouxe o ministro e vale tentar a próxima. O nome é
+    procurado em qualquer esquema dos scripts (Nome, nome...) e, numa lista de
+    registros, no do ministro (coleta/esquema.py).
+    """
+    if resp.forma == PAGINA:
+        return False
+    registro = esquema.principal(registro)
+    if registro is None:
+        return True
+    # Scripts que já completam o registro: o nome guardado não conta como achado
+    return esquema.valor(registro, "name") is None or "name" in (registro.get(ultimos.CHAVE_IDADE) or {})
+
+
+def buscar(urls, extrator, headers=None, timeout=sessao.TIMEOUT):
+    """
+    Baixa (baixar()) e aplica extrator(resp), que devolve o registro ainda
+    sem os últimos valores bons. Se a forma reduzida não trouxer o ministro,
+    ela é descartada e a próxima é baixada. Retorna (registro, resp).
+    """
+    urls = list(urls)
+    while True:
+        resp = baixar(urls, headers=headers, timeout=timeout)
+        registro = extrator(resp)
+        if not incompleto(resp, registro):
+            return registro, resp
+        descartar(resp.url_pedida, resp.forma)
+        urls = [resp.url_pedida]
@@ -0,0 +1,181 @@
+"""
+Parse e extração em um pool de processos, separados do download.
+
+Montar a árvore do BeautifulSoup é trabalho de CPU e segura o GIL: com os
+downloads concorrentes (coleta/crawler.py), o parse das ~40 páginas de até
+600 KB ainda roda em um núcleo só. Com um pool, o crawler continua baixando nas
+threads e entrega a cada processo só os bytes (ou o texto) da resposta; o
+processo monta a árvore, roda o extract_minister / extrair_dados do script ou a
+regra e devolve o registro, um dicionário pequeno. A árvore nunca sai do
+processo.
+
+Os processos não recebem funções (as das regras não são serializáveis), só o
+nome do módulo: cada um descobre os ministérios uma vez, ao iniciar, com o
+parser, o backend de regex e o modo offline do processo principal. O
+orçamento de tempo vale dentro do processo, na thread principal dele, onde o
+SIGALRM interrompe um padrão travado.
+
+Os corpos das respostas (300-600 KB) não vão pelo pickle, que os copiaria na
+serialização, no pipe e de novo ao desserializar: o processo principal copia
+cada um uma vez para um segmento de memória compartilhada
+(multiprocessing.shared_memory) e manda só o nome e o tamanho. O processo lê
+direto do segmento; o texto dos scripts que recebem HTML (extrair_dados) é
+decodificado do próprio buffer. O segmento é liberado quando o registro volta.
+Sem memória compartilhada (sem /dev/shm, por exemplo), os bytes vão pelo pickle.
+
+    with processos.criar_pool(4) as pool:
+        resultados = crawler.coletar(ministerios, pool=pool)
+
+Uso:
+    python -m coleta.crawler --processos 4
+    python -m coleta.diretorio --offline --processos 4
+"""
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+from coleta import diretorio, esquema, expressoes, layouts, offline, parsers
+from coleta.ministerios import descobrir_ministerios, extrair_pagina
+
+# Processos do pool; 0 faz o parse no processo principal, como antes
+PROCESSOS = int(os.environ.get("COLETA_PROCESSOS", 0))
+
+_ministerios = {}
+
+
+def dados_da_resposta(ministerio, resp):
+    """
+    O que o extrator do script recebe, sem a resposta: os bytes para
+    extract_minister(soup), o texto decodificado para extrair_dados(html)
+    """
+    return resp.content if ministerio["tipo"] == "soup" else resp.text
+
+
+def extrair(ministerio, dados):
+    """
+    Parse e extração de um ministério, sem rede nem cache (roda aqui ou em um
+    processo do pool). Retorna o registro do extrator no esquema da coleta
+    (coleta/esquema.py), qualquer que seja o dos scripts.
+    """
+    if ministerio["tipo"] == "soup":
+        if ministerio["layout"]:
+            # Só os extratores que despacham por layout (coleta/layouts.py) usam o
+            # layout da URL; a página só é classificada de novo se os bytes mudaram
+            layouts.registrar(ministerio["url"], dados)
+        registro = extrair_pagina(ministerio, dados)
+    else:
+        registro = ministerio["extrator"](dados)
+    return esquema.padronizar(registro)
+
+
+def _compartilhar(conteudo):
+    """
+    Segmento de memória compartilhada com uma cópia do conteúdo, ou None se
+    não for possível criar um
+    """
+    if not conteudo:
+        return None
+    try:
+        segmento = shared_memory.SharedMemory(create=True, size=len(conteudo))
+    except OSError:
+        return None
+    segmento.buf[:len(conteudo)] = conteudo
+    return segmento
+
+
+def _enviar(pool, funcao, conteudo, *args):
+    """
+    pool.submit(funcao, dados, *args), com dados = (nome do segmento, tamanho)
+    ou os próprios bytes; o segmento é liberado quando o futuro termina
+    """
+    segmento = _compartilhar(conteudo)
+    if segmento is None:
+        return pool.submit(funcao, conteudo, *args)
+
+    def liberar(_futuro):
+        segmento.close()
+        segmento.unlink()
+
+    try:
+        futuro = pool.submit(funcao, (segmento.name, len(conteudo)), *args)
+    except Exception:
+        liberar(None)
+        raise
+    futuro.add_done_callback(liberar)
+    return futuro
+
+
+def _ler(dados, codificacao=None):
+    """
+    No processo do pool: os bytes (ou, com codificacao, o texto) do que o
+    processo principal enviou
+    """
+    if not isinstance(dados, tuple):
+        return str(dados, codificacao, errors="replace") if codificacao else dados
+    nome, tamanho = dados
+    segmento = shared_memory.SharedMemory(name=nome)
+    try:
+        buffer = segmento.buf[:tamanho]
+        try:
+            # A árvore precisa de bytes próprios; o texto sai decodificado do buffer
+            return str(buffer, codificacao, errors="replace") if codificacao else bytes(buffer)
+        finally:
+            buffer.release()
+    finally:
+        segmento.close()
+
+
+def _iniciar(parser, backend_regex, modo_offline, mapeamento):
+    """
+    Inicializador de cada processo: mesma configuração do processo principal
+    """
+    parsers.configurar(parser)
+    expressoes.configurar(backend_regex)
+    if modo_offline:
+        offline.ativar(mapeamento)
+    # Os scripts ignorados já foram avisados pelo processo principal
+    ministerios, _ = descobrir_ministerios(avisar=False)
+    _ministerios.update((m["modulo"], m) for m in ministerios)
+
+
+def _extrair_no_processo(dados, modulo, codificacao, orcamento):
+    ministerio = _ministerios[modulo]
+    with expressoes.orcamento(orcamento, ministerio["url"]):
+        return extrair(ministerio, _ler(dados, codificacao))
+
+
+def _pessoas_no_processo(dados, url):
+    return list(diretorio.pessoas(parsers.criar_soup(_ler(dados)), url))
+
+
+def criar_pool(processos=None):
+    """
+    ProcessPoolExecutor com os processos já configurados (padrão: um por núcleo).
+    Os processos partem de um servidor limpo (forkserver), não de uma cópia do
+    processo principal com as threads de download rodando.
+    """
+    metodos = multiprocessing.get_all_start_methods()
+    contexto = multiprocessing.get_context("forkserver" if "forkserver" in metodos else "spawn")
+    return ProcessPoolExecutor(
+        max_workers=processos or os.cpu_count() or 1,
+        mp_context=contexto,
+        initializer=_iniciar,
+        initargs=(parsers.parser_atual(), expressoes.backend_atual(), offline.ativo(), offline.MAPEAMENTO),
+    )
+
+
+def submeter(pool, ministerio, resp, orcamento):
+    """
+    Agenda a extração da resposta no pool; o resultado do futuro é o registro
+    """
+    # Para extrair_dados(html), a decodificação de resp.text também fica no processo
+    codificacao = None if ministerio["tipo"] == "soup" else resp.encoding or resp.apparent_encoding or "utf-8"
+    return _enviar(pool, _extrair_no_processo, resp.content, ministerio["modulo"], codificacao, orcamento)
+
+
+def submeter_pessoas(pool, conteudo, url):
+    """
+    Agenda diretorio.pessoas() da página no pool; o resultado é a lista de pessoas
+    """
+    return _enviar(pool, _pessoas_no_processo, conteudo, url)
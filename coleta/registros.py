@@ -0,0 +1,235 @@
+"""
+Registros dos ministros servidos na hora, com atualização em segundo plano
+(stale-while-revalidate).
+
+Quem precisa do "ministro atual de X" não deve esperar o gov.br responder (o
+timeout é de 15 s). CacheRegistros guarda em memória o último registro bom de
+cada ministério:
+
+- ler() devolve esse registro imediatamente, sem rede nem parse;
+- se ele tiver mais que idade_maxima segundos, ler() agenda uma atualização em
+  uma thread (a mesma baixar_e_extrair do crawler, que chama o extract_minister
+  do script) e continua devolvendo o registro antigo até ela terminar;
+- se a atualização falhar (gov.br fora do ar, página quebrada), o registro
+  antigo continua valendo; a falha fica em estado() e a próxima tentativa só
+  acontece depois de ESPERA_APOS_ERRO segundos.
+
+Na criação o cache é preenchido com os registros já extraídos que estão no
+armazém em disco (coleta/armazem.py), com a idade da última busca: depois de um
+reinício as leituras são atendidas mesmo que o gov.br esteja fora do ar. O
+armazém guarda o registro como o extrator devolveu; antes de entrar no cache
+ele é completado com os últimos valores bons (coleta/ultimos.py), como os que
+vêm das atualizações, e ler() devolve sempre o mesmo formato.
+
+As atualizações rodam nas threads do cache. Sem pool de processos, a extração
+fica nessas threads, onde o SIGALRM não dispara: um padrão travado não é
+interrompido e o estouro do orçamento só é detectado quando a extração
+termina (coleta/expressoes.py). Para o orçamento valer, passe um pool
+(--processos): nele a extração roda na thread principal de cada processo.
+
+    cache = registros.CacheRegistros()
+    cache.ler("certos.ministro_da_saude")
+
+Uso:
+    python -m coleta.registros [--offline] [--idade-maxima 900] [--leituras 1000] [--processos 4] [MODULO ...]
+"""
+import argparse
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from coleta import crawler, esquema, offline, plone, processos, sessao, ultimos
+from coleta.armazem import armazem_padrao
+from coleta.ministerios import descobrir_ministerios
+
+IDADE_MAXIMA = float(os.environ.get("COLETA_REGISTROS_IDADE", 15 * 60))
+ESPERA_APOS_ERRO = 60.0
+MAX_WORKERS = 4
+
+
+class CacheRegistros:
+    """
+    Último registro bom de cada ministério, atualizado em segundo plano
+    """
+
+    def __init__(self, ministerios=None, idade_maxima=IDADE_MAXIMA, max_workers=MAX_WORKERS,
+                 orcamento=crawler.ORCAMENTO_EXTRACAO, armazem=None, pool=None):
+        if ministerios is None:
+            ministerios, _ = descobrir_ministerios()
+        self.ministerios = {m["modulo"]: m for m in ministerios}
+        self.idade_maxima = idade_maxima
+        self.orcamento = orcamento
+        # Pool de processos (coleta/processos.py) para o parse; None faz na thread da
+        # atualização, onde o orçamento não interrompe a extração (só a detecta no fim)
+        self.pool = pool
+        self._trava = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="registros")
+        self._em_andamento = {}
+        # modulo -> {"registro", "atualizado_em", "erro", "tentado_em"}; registro é None
+        # enquanto nenhuma extração deu certo
+        self._entradas = {}
+        self._carregar_armazem(armazem)
+
+    def _carregar_armazem(self, armazem):
+        if offline.ativo():
+            return
+        armazem = armazem or armazem_padrao()
+        for modulo, ministerio in self.ministerios.items():
+            # O registro fica na versão salva do que foi baixado: JSON, fragmento ou página
+            entradas = [armazem.ler(sessao.url_efetiva(plone.URLS[forma](ministerio["url"]))) or {}
+                        for forma in plone.FORMAS]
+            entradas = [e for e in entradas if e.get("registros", {}).get(modulo)]
+            if entradas:
+                entrada = max(entradas, key=lambda e: e.get("buscado_em", 0))
+                # No formato das atualizações: completado com os últimos valores bons
+                registro = ultimos.preencher(modulo, esquema.padronizar(entrada["registros"][modulo]),
+                                             entrada.get("url"))
+                self._entradas[modulo] = {"registro": registro,
+                                          "atualizado_em": entrada.get("buscado_em", 0),
+                                          "erro": None, "tentado_em": None}
+
+    # --- leitura ------------------------------------------------------------
+
+    def ler(self, modulo, esperar=False):
+        """
+        Último registro bom do ministério, sem esperar a rede. Agenda uma
+        atualização se ele passou da idade máxima. Se ainda não há registro,
+        retorna None (ou, com esperar=True, aguarda a primeira extração).
+        """
+        if modulo not in self.ministerios:
+            raise KeyError(f"ministério desconhecido: {modulo}")
+        with self._trava:
+            entrada = self._entradas.get(modulo)
+            futuro = self._agendar_se_velho(modulo, entrada, time.time())
+        if (entrada is None or entrada["registro"] is None) and esperar and futuro is not None:
+            futuro.exception()
+            entrada = self._entradas.get(modulo)
+        return entrada["registro"] if entrada else None
+
+    def estado(self, modulo):
+        """
+        Idade do registro (segundos), erro da última atualização e se há uma em andamento
+        """
+        with self._trava:
+            entrada = self._entradas.get(modulo) or {}
+            atualizado_em = entrada.get("atualizado_em")
+            return {
+                "idade": time.time() - atualizado_em if atualizado_em is not None else None,
+                "erro": entrada.get("erro"),
+                "atualizando": modulo in self._em_andamento,
+            }
+
+    # --- atualização --------------------------------------------------------
+
+    def _agendar_se_velho(self, modulo, entrada, agora):
+        """
+        Chamado com a trava: agenda a atualização se o registro passou da idade
+        e não houve erro recente. Retorna o futuro da atualização em andamento.
+        """
+        if modulo in self._em_andamento:
+            return self._em_andamento[modulo]
+        if entrada is not None:
+            if entrada.get("atualizado_em") is not None and agora - entrada["atualizado_em"] < self.idade_maxima:
+                return None
+            if entrada.get("tentado_em") is not None and agora - entrada["tentado_em"] < ESPERA_APOS_ERRO:
+                return None
+        futuro = self._executor.submit(self._atualizar, modulo)
+        self._em_andamento[modulo] = futuro
+        return futuro
+
+    def atualizar(self, modulo):
+        """
+        Agenda a atualização do ministério agora, mesmo que o registro seja
+        recente. Retorna o futuro (o resultado é o registro novo).
+        """
+        with self._trava:
+            if modulo in self._em_andamento:
+                return self._em_andamento[modulo]
+            futuro = self._executor.submit(self._atualizar, modulo)
+            self._em_andamento[modulo] = futuro
+            return futuro
+
+    def _atualizar(self, modulo):
+        ministerio = self.ministerios[modulo]
+        try:
+            urls = ultimos.urls(modulo, ministerio["url"], ministerio.get("urls_alternativas", ()))
+            registro = crawler.baixar_e_extrair(ministerio, urls, self.orcamento, self.pool)
+            if not registro:
+                raise ValueError("o extrator não devolveu registro")
+        except Exception as e:
+            with self._trava:
+                entrada = self._entradas.setdefault(modulo, {"registro": None, "atualizado_em": None})
+                entrada["erro"] = f"{type(e).__name__}: {e}"
+                entrada["tentado_em"] = time.time()
+                del self._em_andamento[modulo]
+            raise
+        with self._trava:
+            self._entradas[modulo] = {"registro": registro, "atualizado_em": time.time(), "erro": None,
+                                      "tentado_em": None}
+            del self._em_andamento[modulo]
+        return registro
+
+    def aquecer(self, modulos=None):
+        """
+        Extrai, em paralelo, os ministérios (todos, por padrão) que ainda não
+        têm registro e espera
+        """
+        with self._trava:
+            agora = time.time()
+            futuros = [self._agendar_se_velho(m, self._entradas.get(m), agora)
+                       for m in modulos or self.ministerios
+                       if (self._entradas.get(m) or {}).get("registro") is None]
+        for futuro in futuros:
+            if futuro is not None:
+                futuro.exception()
+
+    def fechar(self, esperar=True):
+        self._executor.shutdown(wait=esperar)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mede a leitura do cache de registros (stale-while-revalidate)")
+    parser.add_argument("modulos", nargs="*", help="ministérios a ler (padrão: todos)")
+    parser.add_argument("--offline", action="store_true",
+                        help="usa os snapshots HTML (snapshots.json) em vez da rede")
+    parser.add_argument("--idade-maxima", type=float, default=IDADE_MAXIMA,
+                        help="segundos até um registro ser atualizado em segundo plano (padrão: %(default)s)")
+    parser.add_argument("--leituras", type=int, default=1000, help="leituras por ministério (padrão: %(default)s)")
+    parser.add_argument("--processos", type=int, default=processos.PROCESSOS,
+                        help="processos para o parse e a extração; 0 faz nas threads (padrão: %(default)s)")
+    args = parser.parse_args()
+
+    if args.offline:
+        offline.ativar()
+
+    pool = processos.criar_pool(args.processos) if args.processos else None
+    cache = CacheRegistros(idade_maxima=args.idade_maxima, pool=pool)
+    modulos = args.modulos or sorted(cache.ministerios)
+    inicio = time.perf_counter()
+    cache.aquecer(modulos)
+    print(f"Primeira extração: {time.perf_counter() - inicio:.2f}s")
+
+    tempos = []
+    for modulo in modulos:
+        for _ in range(args.leituras):
+            antes = time.perf_counter()
+            cache.ler(modulo)
+            tempos.append(time.perf_counter() - antes)
+    tempos.sort()
+    print(f"{len(tempos)} leituras: mediana {tempos[len(tempos) // 2] * 1e6:.1f} µs, "
+          f"p99 {tempos[int(len(tempos) * 0.99)] * 1e6:.1f} µs, máximo {tempos[-1] * 1e6:.1f} µs")
+
+    for modulo in modulos:
+        estado = cache.estado(modulo)
+        situacao = "sem registro" if estado["idade"] is None else f"idade {estado['idade']:.1f}s"
+        erro = f" - {estado['erro']}" if estado["erro"] else ""
+        print(f"[{'ERRO' if estado['erro'] else 'OK'}] {modulo}: {situacao}"
+              f"{' (atualizando)' if estado['atualizando'] else ''}{erro}")
+    cache.fechar()
+    if pool is not None:
+        pool.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,335 @@
+"""
+Regras declarativas de extração por ministério.
+
+Boa parte dos scripts de falta/ são cópias que só mudam a URL, o cargo e os
+padrões de e-mail/telefone. Esses dados ficam em
+regras/<nome>.json (ou .yaml, se o PyYAML estiver instalado) e um único motor
+executa todas as regras, com seletores CSS e expressões regulares compilados
+uma vez por processo:
+
+    {
+      "script": "falta/ministro_do_turismo.py",
+      "url": "https://www.gov.br/turismo/...",
+      "urls_alternativas": [],
+      "titulo": "Ministro de Estado do Turismo",
+      "campos": {
+        "emails": {"padrao": "[\\\\w\\\\.-]+@turismo\\\\.gov\\\\.br", "limite": 1},
+        "phones": {"seletores": ["div.dados-pessoa p.telefone"], "padrao": "..."}
+      }
+    }
+
+Campos aceitos: name (texto), emails e phones (listas). Cada campo é um valor
+fixo ou um objeto com:
+    seletores   seletores CSS tentados em ordem (o primeiro que achar algo vale);
+                sem seletores, o texto de toda a página (ou do escopo) é usado
+    atributo    lê o atributo do elemento em vez do texto (ex.: "href")
+    padrao      expressão regular aplicada ao texto (grupo 1, se houver), compilada
+                por coleta/expressoes.py; em e-mails, "(?<![\\w.-])" na frente evita
+                que o re recomece em cada letra de uma palavra longa
+    flags       "i" para ignorar maiúsculas/minúsculas
+    expandir    (phones) lê cada valor com coleta/telefones.py, que separa
+                sufixos e sequências: "(61) 3412-2515/1721" dá dois números
+    limite      número máximo de valores (listas)
+    se_presente se este trecho aparece na página, não extrai (usa a reserva ou o
+                último valor bom)
+    reserva     valor usado quando nada é encontrado
+
+Um campo sem valor encontrado fica vazio e extrair() o completa com o último
+valor bom extraído (coleta/ultimos.py), com a idade em "last_good"; nomes e
+contatos não ficam fixos nas regras.
+
+Na regra, "escopo" (seletor CSS) restringe a extração a um elemento; se ele não
+existir o registro é None. "somente_conteudo": true permite o parse só da
+div#content-core (coleta/parsers.py). Com "layout": true, os campos que a
+regra não achou vêm do extrator do layout da página (coleta/layouts.py), antes
+do último valor bom; páginas de layout genérico não são usadas.
+
+Uso:
+    python -m coleta.regras                      # lista as regras
+    python -m coleta.regras --extrair [nome ...] [--offline]
+"""
+import argparse
+import copy
+import json
+import os
+import re
+
+import soupsieve
+
+from coleta import expressoes, layouts, offline, parsers, plone, telefones, ultimos
+
+DIRETORIO = os.environ.get(
+    "COLETA_REGRAS",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "regras"),
+)
+
+# Campo -> é lista?
+CAMPOS = {"name": False, "emails": True, "phones": True}
+CHAVES_REGRA = {"script", "url", "urls_alternativas", "titulo", "somente_conteudo", "escopo", "layout", "campos"}
+CHAVES_CAMPO = {"seletores", "atributo", "padrao", "flags", "expandir", "limite", "se_presente", "reserva"}
+FLAGS = {"i": re.I, "m": re.M, "s": re.S}
+
+
+def carregar_arquivo(caminho):
+    """
+    Lê uma regra em JSON ou YAML
+    """
+    with open(caminho, encoding="utf-8") as f:
+        if caminho.endswith((".yaml", ".yml")):
+            try:
+                import yaml
+            except ImportError as e:
+                raise ImportError(f"{caminho}: regras em YAML requerem o pacote PyYAML (pip install pyyaml)") from e
+            return yaml.safe_load(f)
+        return json.load(f)
+
+
+class CampoCompilado:
+    """
+    Um campo da regra com seletores e expressão regular já compilados
+    """
+
+    def __init__(self, nome, especificacao):
+        self.nome = nome
+        self.lista = CAMPOS[nome]
+        if not isinstance(especificacao, dict):
+            especificacao = {"reserva": especificacao}
+        desconhecidas = set(especificacao) - CHAVES_CAMPO
+        if desconhecidas:
+            raise ValueError(f"campo {nome}: chaves desconhecidas: {', '.join(sorted(desconhecidas))}")
+
+        self.seletores = [soupsieve.compile(s) for s in especificacao.get("seletores", [])]
+        self.atributo = especificacao.get("atributo")
+        flags = 0
+        for letra in especificacao.get("flags", ""):
+            flags |= FLAGS[letra]
+        padrao = especificacao.get("padrao")
+        self.padrao = expressoes.compilar(padrao, flags) if padrao else None
+        self.grupo = 1 if self.padrao is not None and self.padrao.groups else 0
+        self.expandir = bool(especificacao.get("expandir", False))
+        self.limite = especificacao.get("limite")
+        self.se_presente = especificacao.get("se_presente")
+        self.reserva = especificacao.get("reserva", [] if self.lista else None)
+
+    @property
+    def usa_texto(self):
+        return not self.seletores and (self.padrao is not None or self.se_presente is not None)
+
+    def _fontes(self, raiz, texto):
+        if not self.seletores:
+            return [texto] if self.padrao is not None else []
+        for seletor in self.seletores:
+            elementos = seletor.select(raiz)
+            if elementos:
+                if self.atributo:
+                    return [e.get(self.atributo) or "" for e in elementos]
+                return [e.get_text(separator=" ", strip=True) for e in elementos]
+        return []
+
+    def valor(self, raiz, texto):
+        """
+        Aplica o campo ao elemento raiz (ou à página, se raiz for None)
+        """
+        if self.se_presente is not None and self.se_presente in texto:
+            return copy.deepcopy(self.reserva)
+
+        achados = []
+        if raiz is not None:
+            for fonte in self._fontes(raiz, texto):
+                if self.padrao is None:
+                    if fonte:
+                        achados.append(fonte)
+                    continue
+                achados.extend(m.group(self.grupo) for m in self.padrao.finditer(fonte))
+        if self.expandir:
+            achados = [t for achado in achados for t in telefones.expandir(achado)]
+        achados = list(dict.fromkeys(achados))
+        if self.limite:
+            achados = achados[:self.limite]
+
+        if not achados:
+            return copy.deepcopy(self.reserva)
+        return achados if self.lista else achados[0]
+
+
+class RegraCompilada:
+    """
+    Regra de um ministério pronta para execução
+    """
+
+    def __init__(self, nome, dados):
+        desconhecidas = set(dados) - CHAVES_REGRA
+        if desconhecidas:
+            raise ValueError(f"regra {nome}: chaves desconhecidas: {', '.join(sorted(desconhecidas))}")
+        if not dados.get("url"):
+            raise ValueError(f"regra {nome}: url obrigatória")
+        campos = dados.get("campos", {})
+        invalidos = set(campos) - set(CAMPOS)
+        if invalidos:
+            raise ValueError(f"regra {nome}: campos desconhecidos: {', '.join(sorted(invalidos))}")
+
+        self.nome = nome
+        self.script = dados.get("script")
+        # Mesmo nome de módulo que o script teria em coleta.ministerios
+        self.modulo = os.path.splitext(os.path.normpath(self.script))[0].replace(os.sep, ".") if self.script \
+            else f"regras.{nome}"
+        self.url = dados["url"]
+        self.urls_alternativas = list(dados.get("urls_alternativas", []))
+        self.titulo = dados.get("titulo")
+        self.somente_conteudo = bool(dados.get("somente_conteudo", False))
+        self.escopo = soupsieve.compile(dados["escopo"]) if dados.get("escopo") else None
+        self.layout = bool(dados.get("layout", False))
+        self.campos = {campo: CampoCompilado(campo, campos.get(campo)) for campo in CAMPOS}
+        self._usa_texto = any(c.usa_texto for c in self.campos.values())
+
+    def extrair(self, soup, base_url=None):
+        """
+        Executa a regra sobre a árvore (soup None: só os valores de reserva)
+        """
+        raiz = soup
+        if soup is not None and self.escopo is not None:
+            raiz = self.escopo.select_one(soup)
+            if raiz is None:
+                return None
+
+        texto = ""
+        if raiz is not None and self._usa_texto:
+            texto = raiz.get_text(separator=" ", strip=True)
+
+        valores = {campo: c.valor(raiz, texto) for campo, c in self.campos.items()}
+        if soup is not None and self.layout and any(ultimos.ausente(v) for v in valores.values()):
+            # Só o extrator especializado do layout: a heurística genérica acharia qualquer "Ministro"
+            do_layout = layouts.extrair(soup, base_url or self.url, generico=lambda *_: None) or {}
+            for campo, valor in valores.items():
+                if ultimos.ausente(valor) and not ultimos.ausente(do_layout.get(campo)):
+                    valores[campo] = do_layout[campo]
+        return {
+            "name": valores["name"],
+            "title": self.titulo,
+            "emails": valores["emails"],
+            "phones": valores["phones"],
+            "source": base_url or self.url,
+        }
+
+
+class MotorRegras:
+    """
+    Carrega e compila todas as regras de um diretório
+    """
+
+    def __init__(self, diretorio=DIRETORIO):
+        self.diretorio = diretorio
+        self.regras = {}
+        if not os.path.isdir(diretorio):
+            return
+        for arquivo in sorted(os.listdir(diretorio)):
+            nome, extensao = os.path.splitext(arquivo)
+            if extensao not in (".json", ".yaml", ".yml"):
+                continue
+            if nome in self.regras:
+                raise ValueError(f"regra duplicada: {nome}")
+            self.regras[nome] = RegraCompilada(nome, carregar_arquivo(os.path.join(diretorio, arquivo)))
+
+    def regra(self, nome):
+        try:
+            return self.regras[nome]
+        except KeyError:
+            raise KeyError(f"regra não encontrada: {nome} (em {self.diretorio})") from None
+
+    def extrair(self, nome, soup, base_url=None):
+        return self.regra(nome).extrair(soup, base_url)
+
+    def scripts_cobertos(self):
+        """
+        Caminhos (relativos à raiz) dos scripts substituídos por regras
+        """
+        return {os.path.normpath(r.script) for r in self.regras.values() if r.script}
+
+    def ministerios(self):
+        """
+        Ministérios no mesmo formato de coleta.ministerios.descobrir_ministerios()
+        """
+        ministerios = []
+        for regra in self.regras.values():
+            ministerios.append({
+                "modulo": regra.modulo,
+                "url": regra.url,
+                "urls_alternativas": regra.urls_alternativas,
+                "tipo": "soup",
+                "extrator": regra.extrair,
+                "somente_conteudo": regra.somente_conteudo,
+                "extrator_rapido": None,
+                "layout": regra.layout,
+            })
+        return ministerios
+
+
+_padrao = None
+
+
+def motor_padrao():
+    """
+    Motor com as regras de COLETA_REGRAS (padrão: regras/ na raiz), compilado uma vez
+    """
+    global _padrao
+    if _padrao is None:
+        _padrao = MotorRegras()
+    return _padrao
+
+
+def extrair(nome, soup, base_url=None):
+    """
+    Executa a regra nome sobre a árvore, com o motor padrão, e completa os
+    campos ausentes com o último valor bom
+    """
+    regra = motor_padrao().regra(nome)
+    return ultimos.completar(regra.modulo, regra.extrair(soup, base_url), base_url or regra.url)
+
+
+def coletar(nome, headers=None):
+    """
+    Baixa a página da regra nome na forma mais leve disponível (coleta/plone.py),
+    tentando as URLs alternativas se a principal falhar (a última que deu certo
+    vai na frente), e executa a regra. Retorna o registro completado.
+    """
+    regra = motor_padrao().regra(nome)
+
+    def extrator(resp):
+        soup = parsers.criar_soup(resp.content, somente_conteudo=regra.somente_conteudo)
+        return regra.extrair(soup, resp.url_pedida)
+
+    registro, resp = plone.buscar(ultimos.urls(regra.modulo, regra.url, regra.urls_alternativas), extrator,
+                                  headers=headers)
+    return ultimos.completar(regra.modulo, registro, resp.url_pedida)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Regras declarativas de extração por ministério")
+    parser.add_argument("--extrair", nargs="*", metavar="NOME",
+                        help="executa as regras informadas (todas, se nenhuma for informada)")
+    parser.add_argument("--offline", action="store_true",
+                        help="usa os snapshots HTML (snapshots.json) em vez da rede")
+    args = parser.parse_args()
+
+    motor = motor_padrao()
+    if args.extrair is None:
+        for nome, regra in motor.regras.items():
+            print(f"{nome:<75} {regra.url}")
+        print(f"\n{len(motor.regras)} regras em {motor.diretorio}")
+        return
+
+    if args.offline:
+        offline.ativar()
+    resultados = {}
+    for nome in args.extrair or list(motor.regras):
+        try:
+            resultados[nome] = coletar(nome)
+        except Exception as e:
+            print(f"[ERRO] {nome}: {type(e).__name__}: {e}")
+            regra = motor.regra(nome)
+            resultados[nome] = ultimos.completar(regra.modulo, None, regra.url)
+    print(json.dumps(resultados, ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
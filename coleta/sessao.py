@@ -0,0 +1,162 @@
+"""
+Sessão HTTP compartilhada (keep-alive) para todas as requisições ao gov.br.
+
+Todos os scripts falam com o mesmo host (www.gov.br). Com requests.get cada
+página abre uma conexão nova (DNS + TCP + TLS). Aqui existe uma única
+requests.Session com pool de conexões, de modo que uma execução completa
+reaproveita a mesma conexão TLS.
+
+Uso nos scripts:
+    from coleta import sessao
+    resp = sessao.get(url, headers=headers, timeout=15)
+
+estatisticas() informa quantas conexões foram abertas e quantas requisições
+reaproveitaram uma conexão já existente.
+
+COLETA_BASE_URL (ou configurar(base_url=...)) troca a origem https://www.gov.br
+por outra, mantendo o caminho: é assim que os scrapers falam com o simulador
+local (coleta/simulador.py).
+"""
+import os
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
+}
+TIMEOUT = 15
+ORIGEM = "https://www.gov.br"
+
+# Configuração padrão do pool
+TAMANHO_POOL = 10
+MAX_HOSTS = 10
+KEEP_ALIVE = True
+
+_trava = threading.Lock()
+_sessao = None
+_config = {"tamanho_pool": TAMANHO_POOL, "max_hosts": MAX_HOSTS, "keep_alive": KEEP_ALIVE,
+           "base_url": os.environ.get("COLETA_BASE_URL") or None}
+_contadores = {"requisicoes": 0, "conexoes_abertas": 0}
+
+
+def _contar(chave):
+    with _trava:
+        _contadores[chave] += 1
+
+
+class _ConexaoHTTP(HTTPConnection):
+    def connect(self):
+        _contar("conexoes_abertas")
+        super().connect()
+
+
+class _ConexaoHTTPS(HTTPSConnection):
+    def connect(self):
+        _contar("conexoes_abertas")
+        super().connect()
+
+
+class _PoolHTTP(HTTPConnectionPool):
+    ConnectionCls = _ConexaoHTTP
+
+
+class _PoolHTTPS(HTTPSConnectionPool):
+    ConnectionCls = _ConexaoHTTPS
+
+
+class _AdaptadorContador(HTTPAdapter):
+    """
+    HTTPAdapter que conta requisições e conexões efetivamente abertas
+    """
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {"http": _PoolHTTP, "https": _PoolHTTPS}
+
+    def send(self, request, **kwargs):
+        _contar("requisicoes")
+        return super().send(request, **kwargs)
+
+
+def _nova_sessao(tamanho_pool, max_hosts, keep_alive):
+    sessao = requests.Session()
+    adaptador = _AdaptadorContador(pool_connections=max_hosts, pool_maxsize=tamanho_pool)
+    sessao.mount("http://", adaptador)
+    sessao.mount("https://", adaptador)
+    sessao.headers.update(HEADERS)
+    if not keep_alive:
+        sessao.headers["Connection"] = "close"
+    return sessao
+
+
+def configurar(tamanho_pool=None, max_hosts=None, keep_alive=None, base_url=None):
+    """
+    Ajusta o pool (conexões por host, número de hosts e keep-alive) e a URL
+    base ("" volta para o gov.br). A sessão atual é fechada e recriada na
+    próxima requisição.
+    """
+    global _sessao
+    with _trava:
+        if base_url is not None:
+            _config["base_url"] = base_url or None
+        if tamanho_pool is not None:
+            _config["tamanho_pool"] = tamanho_pool
+        if max_hosts is not None:
+            _config["max_hosts"] = max_hosts
+        if keep_alive is not None:
+            _config["keep_alive"] = keep_alive
+        if _sessao is not None:
+            _sessao.close()
+            _sessao = None
+
+
+def obter_sessao():
+    """
+    Retorna a sessão compartilhada, criando-a na primeira chamada
+    """
+    global _sessao
+    with _trava:
+        if _sessao is None:
+            _sessao = _nova_sessao(_config["tamanho_pool"], _config["max_hosts"], _config["keep_alive"])
+        return _sessao
+
+
+def base_url():
+    return _config["base_url"]
+
+
+def url_efetiva(url):
+    """
+    URL que vai para a rede: a origem do gov.br trocada pela URL base, se houver
+    """
+    base = _config["base_url"]
+    if base and url.startswith(ORIGEM + "/"):
+        return base.rstrip("/") + url[len(ORIGEM):]
+    return url
+
+
+def get(url, headers=None, timeout=TIMEOUT, **kwargs):
+    """
+    Equivalente a requests.get, mas usando a sessão compartilhada (e a URL base)
+    """
+    return obter_sessao().get(url_efetiva(url), headers=headers, timeout=timeout, **kwargs)
+
+
+def estatisticas():
+    """
+    Retorna {requisicoes, conexoes_abertas, conexoes_reutilizadas}
+    """
+    with _trava:
+        dados = dict(_contadores)
+    dados["conexoes_reutilizadas"] = max(0, dados["requisicoes"] - dados["conexoes_abertas"])
+    return dados
+
+
+def zerar_estatisticas():
+    with _trava:
+        for chave in _contadores:
+            _contadores[chave] = 0
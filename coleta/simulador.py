@@ -0,0 +1,382 @@
+"""
+Simulador local do gov.br para testes de carga e de concorrência.
+
+Serve os snapshots (snapshots.json) nos caminhos reais do gov.br, com as formas
+que o Plone oferece (coleta/plone.py): o JSON em ++api++ e o fragmento
+?ajax_load=1 são montados a partir do snapshot quando o mapeamento não tiver
+uma resposta gravada para eles. Outros mapeamentos no mesmo formato (páginas
+sintéticas, por exemplo) são somados com --mapeamento.
+
+Comportamento configurável (com --semente, os sorteios se repetem):
+    latencia, variacao   atraso de cada resposta em segundos, ± variação uniforme
+    erros                fração das respostas que viram 503
+    taxa, rajada         requisições por segundo por cliente (token bucket);
+                         acima disso, 429 com Retry-After
+Toda resposta tem ETag e Last-Modified; If-None-Match e If-Modified-Since dão
+304. GET /__simulador devolve os contadores em JSON.
+
+Os scrapers falam com ele pela URL base (coleta/sessao.py):
+
+    python -m coleta.simulador --porta 8765 --latencia 0.05 --variacao 0.02
+    COLETA_BASE_URL=http://127.0.0.1:8765 python -m coleta.crawler
+
+--medir sobe o simulador numa thread e mede a camada de busca contra ele:
+requisições concorrentes pelo cache HTTP (armazém temporário, sem TTL, então
+as repetições são condicionais), com vazão e latência por status.
+
+Uso:
+    python -m coleta.simulador [--porta 8765] [--latencia 0.05] [--variacao 0.02] [--erros 0.01]
+                               [--taxa 20 --rajada 40] [--semente 1] [--mapeamento outro.json ...]
+    python -m coleta.simulador --medir [--requisicoes 500] [--concorrencia 8] [...]
+"""
+import argparse
+import hashlib
+import json
+import math
+import os
+import random
+import re
+import tempfile
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from email.utils import formatdate, parsedate_to_datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from coleta import offline, parsers
+
+ROTA_CONTADORES = "/__simulador"
+
+_RE_TITULO = re.compile(rb'<h1[^>]*documentFirstHeading[^>]*>(.*?)</h1>|<title>(.*?)</title>', re.S | re.I)
+_RE_TAGS = re.compile(rb"<[^>]+>")
+
+
+def carregar_paginas(mapeamentos=None):
+    """
+    {caminho (com a consulta, se houver): arquivo} dos mapeamentos URL -> arquivo
+    (padrão: o dos snapshots). Mapeamentos seguintes substituem os anteriores.
+    """
+    paginas = {}
+    for mapeamento in mapeamentos or [offline.MAPEAMENTO]:
+        with open(mapeamento, encoding="utf-8") as f:
+            mapa = json.load(f)
+        base = os.path.dirname(os.path.abspath(mapeamento))
+        for url, arquivo in mapa.items():
+            partes = urlsplit(url)
+            chave = f"{partes.path}?{partes.query}" if partes.query else partes.path
+            paginas[chave] = os.path.join(base, arquivo)
+    return paginas
+
+
+def json_da_pagina(conteudo):
+    """
+    JSON no formato da plone.restapi (Document) com o título e o texto da
+    div#content-core da página, ou None se ela não tiver essa div
+    """
+    recorte = parsers.recortar_conteudo(conteudo)
+    if recorte is None:
+        return None
+    corpo = recorte[recorte.index(b"<body>") + len(b"<body>"):recorte.rindex(b"</body>")]
+    # Só o miolo da div#content-core: o cliente monta a div de novo
+    interno = corpo[corpo.index(b">") + 1:corpo.rindex(b"</div>")]
+    achado = _RE_TITULO.search(conteudo)
+    titulo = _RE_TAGS.sub(b"", achado.group(1) or achado.group(2)).strip() if achado else b""
+    return json.dumps({
+        "@type": "Document",
+        "title": titulo.decode("utf-8", "replace"),
+        "text": {"content-type": "text/html", "data": interno.decode("utf-8", "replace")},
+    }, ensure_ascii=False).encode("utf-8")
+
+
+class _Tratador(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server_version = "SimuladorGovBr"
+
+    def log_message(self, formato, *args):
+        pass
+
+    def do_GET(self):
+        self.server.simulador.responder(self)
+
+
+class Simulador:
+    """
+    Servidor HTTP local que imita o gov.br; use como contexto ou com iniciar()/parar()
+    """
+
+    def __init__(self, mapeamentos=None, latencia=0.0, variacao=0.0, erros=0.0, taxa=None, rajada=None,
+                 semente=None, host="127.0.0.1", porta=0):
+        self.paginas = carregar_paginas(mapeamentos)
+        self.latencia = latencia
+        self.variacao = variacao
+        self.erros = erros
+        self.taxa = taxa
+        self.rajada = rajada or taxa
+        self._sorteio = random.Random(semente)
+        self._trava = threading.Lock()
+        self._baldes = {}
+        self._corpos = {}
+        self.contadores = Counter()
+        self._servidor = ThreadingHTTPServer((host, porta), _Tratador)
+        self._servidor.daemon_threads = True
+        self._servidor.simulador = self
+        self._thread = None
+
+    @property
+    def url(self):
+        host, porta = self._servidor.server_address[:2]
+        return f"http://{host}:{porta}"
+
+    def urls(self):
+        """
+        URLs do gov.br das páginas servidas (sem as formas reduzidas)
+        """
+        return [f"https://www.gov.br{chave}" for chave in self.paginas if "?" not in chave]
+
+    # --- conteúdo -------------------------------------------------------------
+
+    def _ler(self, caminho):
+        if caminho not in self._corpos:
+            with open(caminho, "rb") as f:
+                self._corpos[caminho] = (f.read(), os.path.getmtime(caminho))
+        return self._corpos[caminho]
+
+    def conteudo(self, caminho, consulta=""):
+        """
+        (corpo, Content-Type, mtime) da rota, ou None
+        """
+        chave = f"{caminho}?{consulta}" if consulta else caminho
+        if chave in self.paginas:
+            corpo, mtime = self._ler(self.paginas[chave])
+            tipo = "application/json" if self.paginas[chave].endswith(".json") else "text/html; charset=utf-8"
+            return corpo, tipo, mtime
+
+        if "/++api++/" in caminho:
+            pagina = self.paginas.get(caminho.replace("/++api++/", "/", 1))
+            if pagina is None:
+                return None
+            corpo, mtime = self._ler(pagina)
+            dados = json_da_pagina(corpo)
+            return (dados, "application/json", mtime) if dados is not None else None
+
+        if parse_qs(consulta).get("ajax_load") == ["1"]:
+            pagina = self.paginas.get(caminho)
+            if pagina is None:
+                return None
+            corpo, mtime = self._ler(pagina)
+            return parsers.recortar_conteudo(corpo) or corpo, "text/html; charset=utf-8", mtime
+        return None
+
+    # --- comportamento --------------------------------------------------------
+
+    def _espera_limite(self, cliente):
+        """
+        Segundos até o cliente ter uma ficha (0: pode seguir, e a ficha é gasta)
+        """
+        if not self.taxa:
+            return 0.0
+        agora = time.monotonic()
+        with self._trava:
+            fichas, antes = self._baldes.get(cliente, (self.rajada, agora))
+            fichas = min(self.rajada, fichas + (agora - antes) * self.taxa)
+            if fichas >= 1:
+                self._baldes[cliente] = (fichas - 1, agora)
+                return 0.0
+            self._baldes[cliente] = (fichas, agora)
+            return (1 - fichas) / self.taxa
+
+    def _sortear(self):
+        """
+        (atraso, falha) desta resposta
+        """
+        with self._trava:
+            atraso = self.latencia + self._sorteio.uniform(-self.variacao, self.variacao) if self.variacao \
+                else self.latencia
+            falha = self.erros > 0 and self._sorteio.random() < self.erros
+        return max(0.0, atraso), falha
+
+    def _enviar(self, req, status, corpo=b"", cabecalhos=None):
+        with self._trava:
+            self.contadores[str(status)] += 1
+        req.send_response(status)
+        for nome, valor in (cabecalhos or {}).items():
+            req.send_header(nome, valor)
+        req.send_header("Content-Length", str(len(corpo)))
+        req.end_headers()
+        if corpo:
+            req.wfile.write(corpo)
+
+    def responder(self, req):
+        partes = urlsplit(req.path)
+        if partes.path == ROTA_CONTADORES:
+            with self._trava:
+                corpo = json.dumps(dict(self.contadores)).encode("utf-8")
+            req.send_response(200)
+            req.send_header("Content-Type", "application/json")
+            req.send_header("Content-Length", str(len(corpo)))
+            req.end_headers()
+            req.wfile.write(corpo)
+            return
+
+        espera = self._espera_limite(req.client_address[0])
+        if espera:
+            self._enviar(req, 429, cabecalhos={"Retry-After": str(math.ceil(espera))})
+            return
+        atraso, falha = self._sortear()
+        if atraso:
+            time.sleep(atraso)
+        if falha:
+            self._enviar(req, 503, b"Service Unavailable", {"Content-Type": "text/plain"})
+            return
+
+        achado = self.conteudo(partes.path, partes.query)
+        if achado is None:
+            self._enviar(req, 404, b"Not Found", {"Content-Type": "text/plain"})
+            return
+        corpo, tipo, mtime = achado
+        etag = '"' + hashlib.sha1(corpo).hexdigest()[:16] + '"'
+        cabecalhos = {"ETag": etag, "Last-Modified": formatdate(mtime, usegmt=True)}
+        if self._nao_modificado(req, etag, mtime):
+            self._enviar(req, 304, cabecalhos=cabecalhos)
+            return
+        self._enviar(req, 200, corpo, {**cabecalhos, "Content-Type": tipo})
+
+    @staticmethod
+    def _nao_modificado(req, etag, mtime):
+        if_none_match = req.headers.get("If-None-Match")
+        if if_none_match is not None:
+            return etag in [e.strip() for e in if_none_match.split(",")] or if_none_match.strip() == "*"
+        if_modified_since = req.headers.get("If-Modified-Since")
+        if if_modified_since:
+            try:
+                return parsedate_to_datetime(if_modified_since).timestamp() >= int(mtime)
+            except (TypeError, ValueError):
+                return False
+        return False
+
+    # --- ciclo de vida --------------------------------------------------------
+
+    def atender(self):
+        """
+        Atende nesta thread até parar() (ou Ctrl+C)
+        """
+        try:
+            self._servidor.serve_forever()
+        finally:
+            self._servidor.server_close()
+
+    def iniciar(self):
+        """
+        Atende numa thread em segundo plano
+        """
+        self._thread = threading.Thread(target=self._servidor.serve_forever, name="simulador", daemon=True)
+        self._thread.start()
+        return self
+
+    def parar(self):
+        self._servidor.shutdown()
+        self._servidor.server_close()
+
+    def __enter__(self):
+        return self.iniciar()
+
+    def __exit__(self, *exc):
+        self.parar()
+
+
+# --- medição -------------------------------------------------------------------
+
+def _buscar(url, armazem):
+    """
+    (segundos, resultado) de uma busca pelo cache HTTP
+    """
+    from coleta import cache_http
+
+    inicio = time.perf_counter()
+    try:
+        resp = cache_http.get(url, armazem=armazem)
+        resultado = "304" if resp.nao_modificado and resp.do_cache else str(resp.status_code)
+    except Exception as e:
+        resultado = type(e).__name__
+    return time.perf_counter() - inicio, resultado
+
+
+def medir(simulador, requisicoes=500, concorrencia=8):
+    """
+    Faz requisicoes buscas concorrentes (as URLs do simulador em rodízio) pela
+    sessão e pelo cache HTTP, apontados para o simulador, com um armazém
+    temporário sem TTL. Retorna {segundos, vazao, por_resultado: {resultado:
+    {quantidade, mediana_ms, p95_ms}}}.
+    """
+    from coleta import sessao
+    from coleta.armazem import ArmazemHTML
+    from coleta.benchmark import percentil
+
+    urls = sorted(simulador.urls())
+    anterior = sessao.base_url()
+    sessao.configurar(tamanho_pool=concorrencia, max_hosts=1, base_url=simulador.url)
+    try:
+        with tempfile.TemporaryDirectory() as diretorio:
+            armazem = ArmazemHTML(diretorio, ttl=0)
+            inicio = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=concorrencia) as executor:
+                medidas = list(executor.map(lambda i: _buscar(urls[i % len(urls)], armazem), range(requisicoes)))
+            total = time.perf_counter() - inicio
+    finally:
+        sessao.configurar(base_url=anterior or "")
+
+    por_resultado = {}
+    for resultado in sorted({r for _, r in medidas}):
+        tempos = [t for t, r in medidas if r == resultado]
+        por_resultado[resultado] = {
+            "quantidade": len(tempos),
+            "mediana_ms": round(percentil(tempos, 50) * 1000, 2),
+            "p95_ms": round(percentil(tempos, 95) * 1000, 2),
+        }
+    return {"segundos": total, "vazao": requisicoes / total, "por_resultado": por_resultado}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulador local do gov.br para testes de carga")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--porta", type=int, default=8765, help="porta (padrão: %(default)s; 0 escolhe uma livre)")
+    parser.add_argument("--mapeamento", action="append",
+                        help="mapeamento URL -> arquivo (padrão: snapshots.json); pode ser repetido")
+    parser.add_argument("--latencia", type=float, default=0.0, help="segundos por resposta (padrão: %(default)s)")
+    parser.add_argument("--variacao", type=float, default=0.0, help="± segundos sorteados (padrão: %(default)s)")
+    parser.add_argument("--erros", type=float, default=0.0, help="fração de respostas 503 (padrão: %(default)s)")
+    parser.add_argument("--taxa", type=float, help="requisições por segundo por cliente antes do 429")
+    parser.add_argument("--rajada", type=float, help="requisições seguidas permitidas (padrão: a taxa)")
+    parser.add_argument("--semente", type=int, help="semente dos sorteios de latência e erros")
+    parser.add_argument("--medir", action="store_true", help="mede a camada de busca contra o simulador e sai")
+    parser.add_argument("--requisicoes", type=int, default=500, help="requisições da medição (padrão: %(default)s)")
+    parser.add_argument("--concorrencia", type=int, default=8,
+                        help="requisições simultâneas da medição (padrão: %(default)s)")
+    args = parser.parse_args()
+
+    simulador = Simulador(args.mapeamento, args.latencia, args.variacao, args.erros, args.taxa, args.rajada,
+                          args.semente, args.host, 0 if args.medir else args.porta)
+    if args.medir:
+        with simulador:
+            resultado = medir(simulador, args.requisicoes, args.concorrencia)
+        print(f"{args.requisicoes} requisições, {args.concorrencia} simultâneas, {len(simulador.urls())} páginas: "
+              f"{resultado['segundos']:.2f}s, {resultado['vazao']:.1f} req/s")
+        for nome, dados in resultado["por_resultado"].items():
+            print(f"    {nome:<16} {dados['quantidade']:>6}  mediana {dados['mediana_ms']:>8.1f} ms  "
+                  f"p95 {dados['p95_ms']:>8.1f} ms")
+        print(f"Servidor: {dict(sorted(simulador.contadores.items()))}")
+        return
+
+    print(f"Simulador em {simulador.url} ({len(simulador.paginas)} páginas). "
+          f"Use COLETA_BASE_URL={simulador.url}")
+    try:
+        simulador.atender()
+    except KeyboardInterrupt:
+        pass
+    print(f"\nRespostas: {dict(sorted(simulador.contadores.items()))}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,317 @@
+"""
+Páginas sintéticas no estilo do gov.br (Plone), em qualquer tamanho.
+
+Os snapshots vão até ~600 KB e ~240 pessoas; diretórios estaduais e municipais
+serão bem maiores. gerar() monta uma página completa (cabeçalho, menus, rodapé
+e a div#content-core) com n pessoas em um dos layouts de coleta/layouts.py:
+
+    dados_pessoa     lista-pessoas com grupos (a.toggle) de cartões div.dados-pessoa
+    autoridade       h1.documentFirstHeading + p.autoridade do ministro e a equipe em seguida
+    item_autoridade  div.item com p.nome-autoridade / p.cargo-autoridade
+    tabela           uma linha de tabela por pessoa (cargo e nome na mesma célula)
+    strong_cargo     parágrafos com o nome em <strong> e o cargo em texto próprio
+
+O ministro fica no início (como no gov.br), no meio ou no fim da lista; os
+demais cargos não mencionam "Ministro". Tudo sai de random.Random(semente): a
+mesma semente gera os mesmos bytes.
+
+escrever() grava as páginas e um mapeamento URL -> arquivo no formato do
+snapshots.json, que serve para o modo offline (COLETA_SNAPSHOTS) e para o
+simulador (python -m coleta.simulador --mapeamento ...). --medir mede, para
+cada layout e tamanho, o parse, o extrator do layout (layouts.extrair), a
+heurística genérica, o diretório completo (diretorio.pessoas) e o pico de
+memória de parse + extração, e confere se o ministro certo foi achado.
+
+Uso:
+    python -m coleta.sinteticas --diretorio /tmp/sinteticas [--tamanhos 1000,10000,100000]
+    python -m coleta.sinteticas --medir [--tamanhos 1000,10000] [--layouts tabela] [--ministro fim]
+                                [--saida escala.json]
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import time
+import tracemalloc
+from datetime import datetime
+from html import escape
+
+import bs4
+
+from coleta import diretorio, layouts, parsers
+
+LAYOUTS = ("dados_pessoa", "autoridade", "item_autoridade", "tabela", "strong_cargo")
+POSICOES = ("inicio", "meio", "fim")
+TAMANHOS = (1000, 10000, 100000)
+PESSOAS_POR_GRUPO = 12
+URL_BASE = "https://www.gov.br/sintetico/pt-br"
+
+_PRENOMES = ("Ana", "Antônio", "Beatriz", "Carlos", "Cláudia", "Daniel", "Eduarda", "Fernando", "Gabriela",
+             "Helena", "Igor", "João", "Juliana", "Luís", "Márcia", "Marcos", "Natália", "Paulo", "Renata",
+             "Sérgio", "Tatiana", "Vinícius", "Wellington", "Yasmin")
+_SOBRENOMES = ("Almeida", "Barbosa", "Cardoso", "Costa", "Dias", "Ferreira", "Gomes", "Lima", "Machado",
+               "Martins", "Melo", "Nascimento", "Oliveira", "Pereira", "Ribeiro", "Rocha", "Santos", "Silva",
+               "Souza", "Teixeira")
+_CARGOS = ("Secretário-Executivo", "Chefe de Gabinete", "Secretário Nacional", "Diretor de Programa",
+           "Coordenador-Geral", "Assessor Especial", "Consultor Jurídico", "Ouvidor", "Corregedor",
+           "Coordenador de Gestão")
+_UNIDADES = ("Gabinete", "Secretaria-Executiva", "Assessoria Especial", "Consultoria Jurídica",
+             "Secretaria Nacional", "Diretoria de Programas", "Coordenação-Geral", "Ouvidoria")
+CARGO_MINISTRO = "Ministro de Estado"
+
+
+def _pessoas(n, semente, ministro):
+    """
+    n pessoas {nome, cargo, telefone, email, unidade, perfil}; uma delas é o
+    ministro, na posição pedida
+    """
+    sorteio = random.Random(semente)
+    posicao = {"inicio": 0, "meio": n // 2, "fim": n - 1}[ministro]
+    pessoas = []
+    for i in range(n):
+        nome = f"{sorteio.choice(_PRENOMES)} {sorteio.choice(_SOBRENOMES)} {sorteio.choice(_SOBRENOMES)}"
+        usuario = nome.lower().replace(" ", ".").encode("ascii", "ignore").decode()
+        pessoas.append({
+            "nome": nome,
+            "cargo": CARGO_MINISTRO if i == posicao else sorteio.choice(_CARGOS),
+            "telefone": f"(61) 2{sorteio.randrange(1000):03d}-{sorteio.randrange(10000):04d}",
+            "email": f"{usuario}{i}@sintetico.gov.br",
+            "unidade": f"{_UNIDADES[(i // PESSOAS_POR_GRUPO) % len(_UNIDADES)]} {i // PESSOAS_POR_GRUPO + 1}",
+            "perfil": f"{URL_BASE}/composicao/{usuario}-{i}",
+        })
+    return pessoas, pessoas[posicao]
+
+
+# --- corpo de cada layout -------------------------------------------------------
+
+def _dados_pessoa(pessoas):
+    partes = ['<ul class="lista-pessoas">']
+    for inicio in range(0, len(pessoas), PESSOAS_POR_GRUPO):
+        grupo = pessoas[inicio:inicio + PESSOAS_POR_GRUPO]
+        partes.append(f'<li><a class="toggle" href="#">{escape(grupo[0]["unidade"])}</a><div class="conteudo">')
+        for p in grupo:
+            partes.append(
+                f'<div class="item"><div class="container-dados"><span><img alt="{escape(p["nome"])}" '
+                f'class="left" src="{p["perfil"]}/@@images/image"/></span><div class="dados-pessoa">'
+                f'<p class="nome"><a href="{p["perfil"]}">{escape(p["nome"])}</a></p>'
+                f'<p class="cargo">{escape(p["cargo"])}</p>'
+                f'<p class="telefone"><span>Telefone(s)</span><span>: </span><span>{p["telefone"]}</span></p>'
+                f'<p class="email"><span>E-mail</span><span>: </span><span>{p["email"]}</span></p>'
+                f'</div></div></div>')
+        partes.append("</div></li>")
+    partes.append("</ul>")
+    return "".join(partes)
+
+
+def _autoridade(pessoas, ministro):
+    partes = [
+        f'<p class="autoridade">{escape(ministro["cargo"])}</p>',
+        f'<p class="telefone">Telefone: {ministro["telefone"]}</p>',
+        f'<p class="email">E-mail: {ministro["email"]}</p>',
+        "<h2>Equipe</h2><ul>",
+    ]
+    partes.extend(f'<li><a href="{p["perfil"]}">{escape(p["nome"])}</a>, {escape(p["cargo"])} - '
+                  f'{p["telefone"]}</li>' for p in pessoas if p is not ministro)
+    partes.append("</ul>")
+    return "".join(partes)
+
+
+def _item_autoridade(pessoas):
+    return "".join(
+        f'<div class="item"><p class="nome-autoridade"><a href="{p["perfil"]}">{escape(p["nome"])}</a></p>'
+        f'<p class="cargo-autoridade">{escape(p["cargo"])}</p>'
+        f'<p>Telefone: {p["telefone"]} | <a href="mailto:{p["email"]}">{p["email"]}</a></p></div>'
+        for p in pessoas)
+
+
+def _tabela(pessoas):
+    linhas = "".join(
+        f'<tr><td>{escape(p["cargo"])}<br/>{escape(p["nome"])}</td><td>{p["telefone"]}</td>'
+        f'<td><a href="mailto:{p["email"]}">{p["email"]}</a></td></tr>'
+        for p in pessoas)
+    return f"<table><tbody>{linhas}</tbody></table>"
+
+
+def _strong_cargo(pessoas):
+    return "".join(
+        f'<p><strong>{escape(p["nome"])} - MSINT</strong><br/>'
+        f'{"Ministro" if p["cargo"] == CARGO_MINISTRO else escape(p["cargo"])}<br/>'
+        f'Telefone: {p["telefone"]}<br/>E-mail: {p["email"]}</p>'
+        for p in pessoas)
+
+
+def _casca(titulo, corpo, semente):
+    """
+    Cabeçalho, menus e rodapé como os do tema do gov.br, em volta do conteúdo
+    """
+    sorteio = random.Random(semente)
+    menu = "".join(f'<li><a href="{URL_BASE}/menu/item-{i}">{escape(sorteio.choice(_UNIDADES))} {i}</a></li>'
+                   for i in range(80))
+    scripts = "".join(f'<script src="https://www.gov.br/++plone++static/bundle-{i}.min.js"></script>'
+                      for i in range(12))
+    return (
+        f'<!DOCTYPE html><html lang="pt-br"><head><meta charset="utf-8"><title>{escape(titulo)} — Sintético'
+        f'</title>{scripts}</head>'
+        f'<body class="portal-institucional template-document_view portaltype-document" '
+        f'data-base-url="{URL_BASE}" data-portal-url="https://www.gov.br/sintetico">'
+        f'<header id="portal-header"><nav><ul class="menu">{menu}</ul></nav></header>'
+        f'<main id="main"><div id="content"><h1 class="documentFirstHeading">{escape(titulo)}</h1>'
+        f'<div id="viewlet-above-content-body"></div><div id="content-core">{corpo}</div></div></main>'
+        f'<footer id="portal-footer"><ul class="menu">{menu}</ul></footer></body></html>'
+    )
+
+
+def gerar(layout, n, semente=1, ministro="inicio"):
+    """
+    Página (bytes UTF-8) com n pessoas no layout. Retorna (conteudo, pessoa do ministro).
+    """
+    if layout not in LAYOUTS:
+        raise ValueError(f"layout desconhecido: {layout} (opções: {', '.join(LAYOUTS)})")
+    pessoas, escolhido = _pessoas(n, semente, ministro)
+    if layout == "dados_pessoa":
+        titulo, corpo = "Quem é Quem", _dados_pessoa(pessoas)
+    elif layout == "autoridade":
+        titulo, corpo = escolhido["nome"], _autoridade(pessoas, escolhido)
+    elif layout == "item_autoridade":
+        titulo, corpo = "Principais cargos e respectivos ocupantes", _item_autoridade(pessoas)
+    elif layout == "tabela":
+        titulo, corpo = "Quem é Quem", _tabela(pessoas)
+    else:
+        titulo, corpo = "Gabinete", _strong_cargo(pessoas)
+    return _casca(titulo, corpo, semente).encode("utf-8"), escolhido
+
+
+def url_de(layout, n):
+    return f"{URL_BASE}/{layout.replace('_', '-')}/{n}"
+
+
+def escrever(diretorio_saida, layouts_=LAYOUTS, tamanhos=TAMANHOS, semente=1, ministro="inicio"):
+    """
+    Grava <layout>_<n>.html para cada combinação e sinteticas.json (URL ->
+    arquivo). Retorna o caminho do mapeamento.
+    """
+    os.makedirs(diretorio_saida, exist_ok=True)
+    mapa = {}
+    for layout in layouts_:
+        for n in tamanhos:
+            conteudo, _ = gerar(layout, n, semente, ministro)
+            arquivo = f"{layout}_{n}.html"
+            with open(os.path.join(diretorio_saida, arquivo), "wb") as f:
+                f.write(conteudo)
+            mapa[url_de(layout, n)] = arquivo
+    caminho = os.path.join(diretorio_saida, "sinteticas.json")
+    with open(caminho, "w", encoding="utf-8") as f:
+        json.dump(mapa, f, ensure_ascii=False, indent=2)
+    return caminho
+
+
+# --- medição ---------------------------------------------------------------------
+
+def _cronometrar(funcao):
+    inicio = time.perf_counter()
+    resultado = funcao()
+    return resultado, time.perf_counter() - inicio
+
+
+def medir(layout, n, semente=1, ministro="inicio", memoria=True):
+    """
+    Tempos (segundos) de parse, extração pelo layout, heurística genérica e
+    diretório completo sobre a página gerada, e o pico de memória (KB) de parse
+    + extração
+    """
+    conteudo, escolhido = gerar(layout, n, semente, ministro)
+    url = url_de(layout, n)
+
+    soup, t_parse = _cronometrar(lambda: parsers.criar_soup(conteudo))
+    layouts.esquecer(url)
+    registro, t_extracao = _cronometrar(lambda: layouts.extrair(soup, url, conteudo))
+    _, t_generico = _cronometrar(lambda: layouts.extrair_generico(soup, url))
+    encontradas, t_diretorio = _cronometrar(lambda: sum(1 for _ in diretorio.pessoas(soup, url)))
+    del soup
+
+    pico = None
+    if memoria:
+        layouts.esquecer(url)
+        tracemalloc.start()
+        try:
+            layouts.extrair(parsers.criar_soup(conteudo), url, conteudo)
+            _, pico = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+    return {
+        "layout": layout,
+        "pessoas": n,
+        "bytes": len(conteudo),
+        "layout_reconhecido": layouts.layout_da_url(url) or layouts.GENERICO,
+        "ministro_ok": bool(registro) and registro.get("name") == escolhido["nome"],
+        "parse_s": round(t_parse, 4),
+        "extracao_s": round(t_extracao, 4),
+        "generico_s": round(t_generico, 4),
+        "diretorio_s": round(t_diretorio, 4),
+        "diretorio_pessoas": encontradas,
+        "pico_memoria_kb": round(pico / 1024, 1) if pico is not None else None,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Páginas sintéticas do gov.br para medir escala")
+    parser.add_argument("--diretorio", help="grava as páginas e o mapeamento sinteticas.json neste diretório")
+    parser.add_argument("--medir", action="store_true", help="mede parse, extração e memória por tamanho")
+    parser.add_argument("--layouts", default=",".join(LAYOUTS), help="layouts (padrão: todos)")
+    parser.add_argument("--tamanhos", default=",".join(map(str, TAMANHOS)),
+                        help="pessoas por página (padrão: %(default)s)")
+    parser.add_argument("--ministro", choices=POSICOES, default="inicio",
+                        help="posição do ministro na lista (padrão: %(default)s)")
+    parser.add_argument("--semente", type=int, default=1, help="semente (padrão: %(default)s)")
+    parser.add_argument("--parser", choices=sorted(parsers.BACKENDS_BS4), default=parsers.parser_atual(),
+                        help="backend do BeautifulSoup (padrão: %(default)s)")
+    parser.add_argument("--sem-memoria", action="store_true",
+                        help="não mede o pico de memória (tracemalloc deixa a medição bem mais lenta)")
+    parser.add_argument("--saida", help="arquivo JSON para salvar as medições")
+    args = parser.parse_args()
+
+    layouts_ = args.layouts.split(",")
+    desconhecidos = set(layouts_) - set(LAYOUTS)
+    if desconhecidos:
+        parser.error(f"layouts desconhecidos: {', '.join(sorted(desconhecidos))} (opções: {', '.join(LAYOUTS)})")
+    tamanhos = [int(t) for t in args.tamanhos.split(",")]
+    if not args.diretorio and not args.medir:
+        parser.error("informe --diretorio e/ou --medir")
+
+    if args.diretorio:
+        caminho = escrever(args.diretorio, layouts_, tamanhos, args.semente, args.ministro)
+        print(f"[OK] {len(layouts_) * len(tamanhos)} páginas; mapeamento em {caminho}")
+    if not args.medir:
+        return
+
+    parsers.configurar(args.parser)
+    print(f"{'layout':<16} {'pessoas':>8} {'MB':>7} {'parse (s)':>10} {'extração (s)':>13} {'genérico (s)':>13} "
+          f"{'diretório (s)':>14} {'pico MB':>8}  ministro")
+    medicoes = []
+    for layout in layouts_:
+        for n in tamanhos:
+            m = medir(layout, n, args.semente, args.ministro, memoria=not args.sem_memoria)
+            medicoes.append(m)
+            pico = f"{m['pico_memoria_kb'] / 1024:>8.1f}" if m["pico_memoria_kb"] is not None else f"{'-':>8}"
+            print(f"{layout:<16} {n:>8} {m['bytes'] / 1e6:>7.1f} {m['parse_s']:>10.3f} {m['extracao_s']:>13.4f} "
+                  f"{m['generico_s']:>13.4f} {m['diretorio_s']:>14.3f} {pico}  "
+                  f"{'ok' if m['ministro_ok'] else 'ERRADO'} ({m['layout_reconhecido']})")
+
+    if args.saida:
+        with open(args.saida, "w", encoding="utf-8") as f:
+            json.dump({
+                "data": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                "python": platform.python_version(),
+                "bs4": bs4.__version__,
+                "parser": parsers.parser_atual(),
+                "ministro": args.ministro,
+                "semente": args.semente,
+                "medicoes": medicoes,
+            }, f, ensure_ascii=False, indent=2)
+        print(f"[OK] Medições salvas em {args.saida}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,203 @@
+"""
+Normalização de telefones: um só motor para as formas que aparecem nas páginas.
+
+Cada script expandia os números do seu jeito: sufixos "/2580" sobre o prefixo
+do número anterior (Saúde, MMA, MDA), o DDD do primeiro número repetido nos
+seguintes ("(61) 3411-1117 / 3411-1345", CGU e Secretaria-Geral), finais em
+sequência "(61) 2027-7701 - 7002 - 7003" (MDIC). ler() entende todas essas
+formas (e ramais, "+55", "61 3315-2580", "6133152580"), ignora os números de
+fax e devolve cada telefone uma vez, como Telefone(ddd, numero, ramal):
+
+    telefones.ler("(61) 3315-2580 / 2581")       # [Telefone('61', '33152580', None), Telefone('61', '33152581', None)]
+    telefones.expandir(texto)                    # ["(61) 3315-2580", "(61) 3315-2581"]
+    telefone.e164()                              # "+556133152580"
+    telefones.normalizar_registros(registros)    # lote: acrescenta "phones_e164" a cada registro
+
+Uso:
+    python -m coleta.telefones [-n 5]    # mede o lote sobre o diretório completo dos snapshots
+"""
+import argparse
+import gc
+import re
+import time
+from collections import Counter
+from typing import NamedTuple
+
+from coleta import expressoes
+
+# Todos os ministérios ficam em Brasília
+DDD_PADRAO = "61"
+
+# Um token por alternativa; o grupo externo de cada uma dá o tipo (lastgroup)
+_TOKENS = expressoes.compilar(r"""
+    (?P<fax>\bfax\b)
+  | (?P<rotulo>\b(?:telefones?|tel|fone|celular)\b)
+  | (?P<ramal>\b(?:ramal|r\.)\s*:?\s*(?P<digitos_ramal>\d{2,5})(?!\d))
+  | (?P<numero>(?<!\d)
+        (?:\+\s?55\s?)?
+        (?:\(\s*(?P<ddd>\d{2})\s*\)\s*
+          |(?P<ddd_solto>\d{2})[\s.-]?(?=\d{4,5}[-.\s]?\d{4}(?!\d)))?
+        (?P<inicio>\d{4,5})(?P<separador>[-.\s]?)(?P<final>\d{4})(?!\d))
+  | (?P<sufixo>(?:[/,;]|\s-|\be\b)\s*(?P<digitos_sufixo>\d{4})(?![\d-]|[.\s]\d{4}(?!\d)))
+""", re.X | re.I)
+
+
+class Telefone(NamedTuple):
+    ddd: str      # dois dígitos, ou None se a página não informar
+    numero: str   # oito ou nove dígitos, sem separadores
+    ramal: str = None
+
+    def e164(self, ddd=None):
+        """
+        Forma canônica E.164 ("+556133152580"); ddd vale para número sem DDD.
+        None se não houver DDD.
+        """
+        ddd = self.ddd or ddd
+        return f"+55{ddd}{self.numero}" if ddd else None
+
+    def canonico(self, ddd=None):
+        """
+        E.164 com o ramal no formato tel: (RFC 3966): "+556133152580;ext=123"
+        """
+        e164 = self.e164(ddd)
+        if e164 and self.ramal:
+            return f"{e164};ext={self.ramal}"
+        return e164
+
+    def formatado(self):
+        """
+        Forma de exibição usada nos registros: "(61) 3315-2580"
+        """
+        local = f"{self.numero[:-4]}-{self.numero[-4:]}"
+        texto = f"({self.ddd}) {local}" if self.ddd else local
+        return f"{texto} ramal {self.ramal}" if self.ramal else texto
+
+
+def ler(texto, ddd=None, soltos=True):
+    """
+    Telefones do texto, na ordem em que aparecem e sem repetições.
+
+    Um número sem DDD ("3411-1345", só com hífen ou sem separador) recebe o do
+    último número com DDD antes dele (ou ddd); um sufixo "/2580" ou "- 2580"
+    logo depois de um número troca os seus quatro últimos dígitos; "ramal 123"
+    vai para o número anterior. Números depois de "Fax" (até o próximo rótulo
+    de telefone) são descartados. soltos=False ignora os números sem DDD, para
+    textos longos em que "2024-2025" pode ser outra coisa.
+    """
+    vistos = {}
+    anterior = None
+    fim_anterior = None
+    fax = False
+    for m in _TOKENS.finditer(texto):
+        tipo = m.lastgroup
+        if tipo == "fax":
+            fax = True
+            continue
+        if tipo == "rotulo":
+            fax = False
+            continue
+        if tipo == "ramal":
+            if anterior is not None and not fax:
+                vistos.pop(anterior, None)
+                anterior = anterior._replace(ramal=m.group("digitos_ramal"))
+                vistos[anterior] = None
+            continue
+
+        if tipo == "numero":
+            proprio = m.group("ddd") or m.group("ddd_solto")
+            if proprio:
+                ddd = proprio
+            elif not soltos or m.group("separador") not in ("", "-"):
+                continue
+            telefone = Telefone(ddd, m.group("inicio") + m.group("final"))
+        elif fim_anterior is not None and not texto[fim_anterior:m.start()].strip():
+            telefone = Telefone(anterior.ddd, anterior.numero[:-4] + m.group("digitos_sufixo"))
+        else:
+            continue
+
+        anterior = telefone
+        fim_anterior = m.end()
+        if not fax:
+            vistos.setdefault(telefone, None)
+    return list(vistos)
+
+
+def expandir(texto, ddd=None, soltos=True):
+    """
+    ler() já no formato de exibição dos registros
+    """
+    return [t.formatado() for t in ler(texto, ddd, soltos)]
+
+
+def normalizar_registros(registros, campo="phones", destino="phones_e164", ddd=DDD_PADRAO):
+    """
+    Normaliza os telefones de um lote de registros de uma vez e devolve cópias
+    com a lista E.164 (com ";ext=" quando há ramal) em destino.
+
+    Cada texto distinto é lido uma só vez (no diretório o mesmo número aparece
+    em muitos cartões). Um número sem DDD recebe o do próprio registro, senão o
+    mais comum entre os registros da mesma página (source), senão ddd.
+    """
+    lidos = {}
+    ddds_por_pagina = {}
+    lote = []
+    for registro in registros:
+        valores = registro.get(campo) or []
+        if isinstance(valores, str):
+            valores = [valores]
+        numeros = []
+        for valor in valores:
+            if valor not in lidos:
+                lidos[valor] = ler(valor)
+            numeros.extend(lidos[valor])
+        do_registro = next((t.ddd for t in numeros if t.ddd), None)
+        if do_registro:
+            pagina = registro.get("source")
+            if pagina not in ddds_por_pagina:
+                ddds_por_pagina[pagina] = Counter()
+            ddds_por_pagina[pagina].update(t.ddd for t in numeros if t.ddd)
+        lote.append((registro, numeros, do_registro))
+
+    predominante = {pagina: ddds.most_common(1)[0][0] for pagina, ddds in ddds_por_pagina.items()}
+    saida = []
+    for registro, numeros, do_registro in lote:
+        padrao = do_registro or predominante.get(registro.get("source"), ddd)
+        canonicos = (t.canonico(padrao) for t in numeros)
+        saida.append({**registro, destino: list(dict.fromkeys(c for c in canonicos if c))})
+    return saida
+
+
+def main():
+    from coleta import diretorio, offline
+
+    parser = argparse.ArgumentParser(description="Mede a normalização em lote sobre o diretório completo dos snapshots")
+    parser.add_argument("-n", "--repeticoes", type=int, default=5, help="repetições (padrão: %(default)s)")
+    args = parser.parse_args()
+
+    offline.ativar()
+    registros = []
+    for url in sorted(offline.carregar_mapeamento()):
+        registros.extend(diretorio.pessoas_da_url(url))
+    textos = [v for r in registros for v in r["phones"]]
+
+    # Referência: um registro por vez, como cada script faz com o seu ministro
+    gc.collect()
+    inicio = time.perf_counter()
+    for _ in range(args.repeticoes):
+        for registro in registros:
+            normalizar_registros([registro])
+    meio = time.perf_counter()
+    for _ in range(args.repeticoes):
+        normalizados = normalizar_registros(registros)
+    fim = time.perf_counter()
+
+    numeros = [n for r in normalizados for n in r["phones_e164"]]
+    sem_ddd = sum(1 for v in textos for t in ler(v) if not t.ddd)
+    print(f"{len(registros)} registros, {len(textos)} textos de telefone ({len(set(textos))} distintos)")
+    print(f"{len(numeros)} números E.164 ({len(set(numeros))} distintos), {sem_ddd} sem DDD no próprio texto")
+    print(f"um a um: {(meio - inicio) / args.repeticoes * 1000:.1f} ms/rodada, "
+          f"lote: {(fim - meio) / args.repeticoes * 1000:.1f} ms/rodada")
+
+
+if __name__ == "__main__":
+    main()
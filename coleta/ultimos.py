@@ -0,0 +1,292 @@
+"""
+Último valor bom de cada campo de cada ministério (last-known-good), em disco.
+
+Alguns dados não estão na página (a Fazenda carrega a composição por AJAX),
+outros somem quando o layout muda ou o gov.br sai do ar. Em vez de nomes e
+telefones fixos no código ou nas regras, cada coleta grava aqui os campos que
+conseguiu extrair, com a data; quando um campo falta (None, "", [],
+"Não encontrado", "N/A") ou o registro inteiro falha, completar() usa o último
+valor bom e informa no próprio registro de quando ele é:
+
+    registro = ultimos.completar("falta.ministro_da_fazenda", registro, url)
+    registro["last_good"]     # {"name": {"extracted_at": "2026-10-18T18:49:59+00:00"}}
+    ultimos.idade(registro)   # {"name": 86400.0}: segundos, calculados na leitura
+
+Os registros podem vir em qualquer esquema dos scripts (Nome/Telefone/Email,
+telefone_gabinete, lista de registros...): completar() e guardar() os levam ao
+esquema da coleta (coleta/esquema.py) antes de guardar ou preencher.
+
+A idade não é gravada no registro porque ele é guardado em caches (armazém,
+CacheRegistros) e ela ficaria errada logo depois.
+
+Os valores guardados são de uma pessoa: se a página traz outro nome (o
+ministro mudou), nenhum campo do anterior é usado para completar o registro, e
+a gravação do nome novo descarta os campos guardados do anterior.
+
+A URL que rendeu o último registro bom também fica guardada: urls() a coloca
+na frente das alternativas, para a próxima coleta não repetir as que falham.
+
+O arquivo é .cache/ultimos_registros.json (ou COLETA_ULTIMOS), fora do
+controle de versão. Enquanto ele não existe, os valores vêm da semente
+versionada ultimos_registros.json na raiz: os que estavam fixos no código, sem
+data de extração (extraido_em null; a idade deles é None). Um campo que nunca
+foi visto em uma coleta continua com o valor da semente, e no registro
+completado ele vem marcado com "seed": true em "last_good" (semente() lista
+esses campos). No modo offline o arquivo é só lido: snapshots antigos não
+renovam os dados.
+
+Uso:
+    python -m coleta.ultimos    # idade de cada campo guardado
+"""
+import argparse
+import json
+import os
+import re
+import threading
+import unicodedata
+import time
+from datetime import datetime, timezone
+
+from coleta import esquema, offline
+from coleta.armazem import gravar_atomico, trava_de_arquivo
+from coleta.esquema import AUSENTES, CHAVE_IDADE, ausente  # noqa: F401 (usados como ultimos.*)
+from coleta.ministerios import RAIZ
+
+ARQUIVO = os.environ.get("COLETA_ULTIMOS", os.path.join(RAIZ, ".cache", "ultimos_registros.json"))
+# Valores iniciais, versionados e nunca regravados: lidos enquanto o ARQUIVO não existe
+SEMENTE = os.path.join(RAIZ, "ultimos_registros.json")
+# Fora do arquivo: ele é substituído a cada gravação (gravar_atomico)
+TRAVA = os.path.join(RAIZ, ".cache", "ultimos.trava")
+
+# Campos guardados e completados nos registros {name, title, emails, phones, source}
+CAMPOS = ("name", "title", "emails", "phones")
+# Marca, em "last_good", os campos completados com o valor da semente
+CHAVE_SEMENTE = "seed"
+# Palavras ignoradas ao comparar nomes
+_PARTICULAS = {"da", "de", "do", "das", "dos", "e"}
+
+
+def _agora():
+    return datetime.now(timezone.utc).isoformat(timespec="seconds")
+
+
+def _idade(extraido_em):
+    if extraido_em is None:
+        return None
+    return round(time.time() - datetime.fromisoformat(extraido_em).timestamp(), 1)
+
+
+def _palavras(nome):
+    sem_acentos = unicodedata.normalize("NFKD", str(nome)).encode("ascii", "ignore").decode("ascii")
+    return set(re.findall(r"\w+", sem_acentos.casefold())) - _PARTICULAS
+
+
+def mesma_pessoa(nome, outro):
+    """
+    True se os nomes podem ser da mesma pessoa: sem diferenciar maiúsculas e
+    acentos, as palavras de um estão todas no outro ("Waldez Góes" e "Antonio
+    Waldez Góes da Silva")
+    """
+    palavras, outras = _palavras(nome), _palavras(outro)
+    return bool(palavras and outras) and (palavras <= outras or outras <= palavras)
+
+
+def idade(registro):
+    """
+    {campo: segundos} dos campos do registro que vieram de completar() (None
+    para os valores da semente, que não têm data)
+    """
+    completados = (registro or {}).get(CHAVE_IDADE) or {}
+    return {campo: _idade(info["extracted_at"]) for campo, info in completados.items()}
+
+
+def semente(registro):
+    """
+    Campos do registro que vieram da semente: nunca foram vistos em uma coleta
+    """
+    completados = (registro or {}).get(CHAVE_IDADE) or {}
+    return [campo for campo, info in completados.items() if info.get(CHAVE_SEMENTE)]
+
+
+class UltimosRegistros:
+    """
+    Arquivo JSON {modulo: {"url": ..., "campos": {campo: {"valor", "extraido_em"}}}}
+    """
+
+    def __init__(self, arquivo=ARQUIVO, trava=TRAVA, semente=SEMENTE):
+        self.arquivo = arquivo
+        self.trava = trava
+        self.semente = semente
+        self._trava = threading.Lock()
+        self._dados = None
+        self._mtime = None
+
+    def _carregar(self):
+        """
+        Conteúdo do arquivo (ou da semente, enquanto ele não existe), relido só
+        quando ele muda (outro processo gravou)
+        """
+        for caminho in (self.arquivo, self.semente):
+            try:
+                mtime = (caminho, os.path.getmtime(caminho))
+                break
+            except (OSError, TypeError):
+                continue
+        else:
+            return {}
+        with self._trava:
+            if self._dados is None or mtime != self._mtime:
+                with open(caminho, encoding="utf-8") as f:
+                    self._dados = json.load(f)
+                self._mtime = mtime
+            return self._dados
+
+    def _ler_para_gravar(self):
+        """
+        Conteúdo atual do arquivo (ou da semente) lido do disco, com a trava tomada
+        """
+        for caminho in (self.arquivo, self.semente):
+            try:
+                with open(caminho, encoding="utf-8") as f:
+                    return json.load(f)
+            except (OSError, TypeError, ValueError):
+                continue
+        return {}
+
+    def ler(self, modulo):
+        """
+        {"url", "campos"} guardado para o ministério, ou None
+        """
+        return self._carregar().get(modulo)
+
+    def todos(self):
+        return dict(self._carregar())
+
+    def guardar(self, modulo, registro, url=None):
+        """
+        Grava os campos presentes no registro, em qualquer esquema dos scripts
+        (os que vieram de completar() não contam como extraídos agora). Um nome
+        de outra pessoa descarta os campos guardados do ministro anterior.
+        """
+        registro = esquema.padronizar(registro)
+        if offline.ativo() or registro is None:
+            return
+        completados = registro.get(CHAVE_IDADE) or {}
+        campos = {c: registro[c] for c in CAMPOS
+                  if c in registro and c not in completados and not ausente(registro[c])}
+        if not campos:
+            return
+        extraido_em = _agora()
+        os.makedirs(os.path.dirname(self.trava), exist_ok=True)
+        os.makedirs(os.path.dirname(os.path.abspath(self.arquivo)), exist_ok=True)
+        with trava_de_arquivo(self.trava):
+            dados = self._ler_para_gravar()
+            entrada = dados.setdefault(modulo, {"url": None, "campos": {}})
+            guardado = entrada["campos"].get("name")
+            if "name" in campos and guardado and not mesma_pessoa(campos["name"], guardado["valor"]):
+                entrada["campos"] = {}
+            if url:
+                entrada["url"] = url
+            for campo, valor in campos.items():
+                entrada["campos"][campo] = {"valor": valor, "extraido_em": extraido_em}
+            conteudo = json.dumps(dados, ensure_ascii=False, indent=2, sort_keys=True) + "\n"
+            gravar_atomico(self.arquivo, conteudo.encode("utf-8"))
+
+    def completar(self, modulo, registro, url=None):
+        """
+        Grava os campos bons do registro e preenche os ausentes com o último
+        valor bom. registro None (extração ou download falhou) vira um registro
+        montado só com os valores guardados, ou continua None se não houver
+        nenhum. Os campos preenchidos e a data deles ficam em "last_good". Se
+        o registro traz o nome de outra pessoa, nada é preenchido. O registro
+        volta no esquema da coleta, qualquer que seja o do script.
+        """
+        registro = esquema.padronizar(registro)
+        self.guardar(modulo, registro, url)
+        return self.preencher(modulo, registro, url)
+
+    def preencher(self, modulo, registro, url=None):
+        """
+        Como completar(), sem gravar os campos do registro: para registros que
+        não acabaram de ser extraídos (os de um cache, por exemplo)
+        """
+        registro = esquema.padronizar(registro)
+        entrada = self.ler(modulo)
+        if not entrada:
+            return registro
+        nome = registro.get("name") if registro is not None else None
+        guardado = entrada["campos"].get("name")
+        if (not ausente(nome) and guardado and "name" not in (registro.get(CHAVE_IDADE) or {})
+                and not mesma_pessoa(nome, guardado["valor"])):
+            # Outro ministro: os valores guardados são do anterior
+            return registro
+        if registro is None:
+            registro = {"name": None, "title": None, "emails": [], "phones": [], "source": url or entrada["url"]}
+        else:
+            registro = dict(registro)
+
+        completados = dict(registro.get(CHAVE_IDADE) or {})
+        for campo, guardado in entrada["campos"].items():
+            if campo in completados or not ausente(registro.get(campo)):
+                continue
+            registro[campo] = guardado["valor"]
+            completados[campo] = {"extracted_at": guardado["extraido_em"]}
+            if guardado["extraido_em"] is None:
+                completados[campo][CHAVE_SEMENTE] = True
+        if completados:
+            registro[CHAVE_IDADE] = completados
+        return registro
+
+    def urls(self, modulo, url, alternativas=()):
+        """
+        URL e alternativas, começando pela que rendeu o último registro bom
+        """
+        candidatas = list(dict.fromkeys([url, *alternativas]))
+        entrada = self.ler(modulo)
+        ultima = entrada and entrada.get("url")
+        if ultima in candidatas:
+            candidatas.remove(ultima)
+            candidatas.insert(0, ultima)
+        return candidatas
+
+
+_padrao = None
+
+
+def ultimos_padrao():
+    """
+    Arquivo de COLETA_ULTIMOS (padrão: .cache/ultimos_registros.json, com a
+    semente ultimos_registros.json da raiz)
+    """
+    global _padrao
+    if _padrao is None:
+        _padrao = UltimosRegistros()
+    return _padrao
+
+
+def completar(modulo, registro, url=None):
+    return ultimos_padrao().completar(modulo, registro, url)
+
+
+def preencher(modulo, registro, url=None):
+    return ultimos_padrao().preencher(modulo, registro, url)
+
+
+def urls(modulo, url, alternativas=()):
+    return ultimos_padrao().urls(modulo, url, alternativas)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Idade dos últimos valores bons de cada ministério")
+    parser.parse_args()
+
+    for modulo, entrada in sorted(ultimos_padrao().todos().items()):
+        print(modulo)
+        for campo, guardado in sorted(entrada["campos"].items()):
+            segundos = _idade(guardado["extraido_em"])
+            quando = "semente" if segundos is None else f"{segundos / 86400:>6.1f} dias"
+            print(f"    {campo:<7} {quando:>11}  {json.dumps(guardado['valor'], ensure_ascii=False)[:70]}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""
+Verificação dos destinos de --gravar com os esquemas dos scripts.
+
+Cada script devolve o registro no seu esquema: name/title/emails/phones/source,
+Nome/Cargo/Telefone/Email ou, na Casa Civil (certos/ministro_estado.py), uma
+lista de registros com telefone_gabinete/email_gabinete. Aqui um ministério
+falso por esquema, sobre um snapshot qualquer, passa pela coleta em fluxo com
+--gravar em JSON Lines, CSV e SQLite e com --consolidado. Cada destino precisa
+gravar uma linha por ministério, com o nome, os e-mails e os telefones do
+ministro. Sai com código 1 se a coleta falhar ou algum destino não trouxer
+esses dados.
+
+Uso:
+    python -m coleta.verificacao
+"""
+import argparse
+import csv
+import json
+import os
+import sqlite3
+import sys
+import tempfile
+
+from coleta import crawler, esquema, offline
+
+NOME = "Rui Costa"
+TITULO = "Ministro de Estado Chefe da Casa Civil"
+EMAIL = "casacivil@presidencia.gov.br"
+TELEFONE = "(61) 3411-1221"
+
+# Registro do mesmo ministro em cada esquema dos scripts
+ESQUEMAS = {
+    "coleta": {"name": NOME, "title": TITULO, "emails": [EMAIL], "phones": [TELEFONE], "source": None},
+    "portugues": {"Nome": NOME, "Cargo": TITULO, "Telefone": TELEFONE, "Email": EMAIL},
+    "lista": [{"name": NOME, "title": TITULO, "telefone_gabinete": TELEFONE, "email_gabinete": EMAIL,
+               "data_coleta": "2026-10-18 12:00:00"}],
+}
+
+
+def ministerios_falsos(url):
+    """
+    Um ministério por esquema; o extrator ignora a página e devolve o registro
+    """
+    return [{
+        "modulo": f"verificacao.{nome}",
+        "url": url,
+        "urls_alternativas": [],
+        "tipo": "html",
+        "extrator": lambda html, registro=registro: registro,
+        "somente_conteudo": False,
+        "extrator_rapido": None,
+        "layout": False,
+    } for nome, registro in ESQUEMAS.items()]
+
+
+def _completo(linha):
+    return (linha["name"] == NOME and EMAIL in str(linha["emails"]) and "3411-1221" in str(linha["phones"]))
+
+
+def verificar(diretorio):
+    """
+    Coleta os ministérios falsos gravando em todos os destinos. Retorna a lista
+    de problemas (vazia se tudo foi gravado)
+    """
+    url = next(iter(offline.carregar_mapeamento()))
+    ministerios = ministerios_falsos(url)
+    caminhos = {ext: os.path.join(diretorio, f"ministros.{ext}") for ext in ("jsonl", "csv", "sqlite")}
+    args = argparse.Namespace(gravar=list(caminhos.values()), historico=None,
+                              consolidado=os.path.join(diretorio, "consolidado"),
+                              limite_por_host=crawler.LIMITE_POR_HOST, orcamento=crawler.ORCAMENTO_EXTRACAO,
+                              processos=0)
+    try:
+        crawler._coletar_e_gravar(ministerios, args, pool=None)
+    except Exception as e:
+        return [f"a coleta falhou: {type(e).__name__}: {e}"]
+
+    linhas = {}
+    with open(caminhos["jsonl"], encoding="utf-8") as f:
+        linhas["jsonl"] = [{"modulo": r["modulo"], **esquema.padronizar(r["registro"] or {})}
+                           for r in map(json.loads, f)]
+    with open(caminhos["csv"], newline="", encoding="utf-8") as f:
+        linhas["csv"] = list(csv.DictReader(f))
+    with open(f"{args.consolidado}.json", encoding="utf-8") as f:
+        linhas["consolidado"] = json.load(f)
+    with sqlite3.connect(caminhos["sqlite"]) as banco:
+        banco.row_factory = sqlite3.Row
+        linhas["sqlite"] = [dict(r) for r in banco.execute("SELECT * FROM versoes")]
+
+    problemas = []
+    for destino, registros in linhas.items():
+        if len(registros) != len(ministerios):
+            problemas.append(f"{destino}: {len(registros)} linhas para {len(ministerios)} ministérios")
+        for linha in registros:
+            if not _completo(linha):
+                problemas.append(f"{destino}: {linha.get('modulo')} sem os dados do ministro: {linha}")
+    return problemas
+
+
+def main():
+    # Não renova os últimos valores bons (coleta/ultimos.py) com os registros falsos
+    offline.ativar()
+    with tempfile.TemporaryDirectory() as diretorio:
+        problemas = verificar(diretorio)
+    for problema in problemas:
+        print(f"[ERRO] {problema}")
+    if problemas:
+        sys.exit(1)
+    print(f"[OK] Registros em {len(ESQUEMAS)} esquemas gravados em JSON Lines, CSV, SQLite e no consolidado")
+
+
+if __name__ == "__main__":
+    main()
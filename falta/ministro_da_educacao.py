@@ -1,9 +1,10 @@
-import requests
-from bs4 import BeautifulSoup
-import re
 import json
 import csv
 import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from coleta import cache_http, parsers, regras
 
 URL = "https://www.gov.br/mec/pt-br/acesso-a-informacao/institucional/quem-e-quem"
 
@@ -11,43 +12,13 @@ def get_soup(url):
     headers = {
         "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
     }
-    resp = requests.get(url, headers=headers, timeout=15)
+    resp = cache_http.get(url, headers=headers, timeout=15)
     resp.raise_for_status()
-    return BeautifulSoup(resp.content, "html.parser")
+    return parsers.criar_soup(resp.content)
 
 def extract_minister(soup, base_url=URL):
-    text = soup.get_text(separator=' ', strip=True)
-    
-    # name
-    name = "Camilo Santana"
-    if "Camilo Santana" in text:
-        name = "Camilo Santana"
-    
-    # title
-    title = "Ministro de Estado da Educação"
-    
-    # emails
-    emails = ["gabinetedoministro@mec.gov.br"]
-    email_match = re.search(r'gabinetedoministro@mec\.gov\.br', text)
-    if email_match:
-        emails = [email_match.group(0)]
-    
-    # phones
-    phones = ["(61) 2022-7828", "(61) 2022-7822"]
-    if "(61) 2022-7828" in text:
-        phones = ["(61) 2022-7828", "(61) 2022-7822"]
-    else:
-        found_phones = re.findall(r'\(61\)\s*2022-\d{4}', text)
-        if found_phones:
-            phones = list(dict.fromkeys(found_phones))[:2]
-
-    return {
-        "name": name,
-        "title": title,
-        "emails": emails,
-        "phones": phones,
-        "source": base_url
-    }
+    # Nome, cargo, padrões de contato e valores de referência em regras/ministro_da_educacao.json
+    return regras.extrair("ministro_da_educacao", soup, base_url)
 
 def save_json(data, path):
     with open(path, "w", encoding="utf-8") as f:
@@ -1,39 +1,25 @@
-import requests
-from bs4 import BeautifulSoup
-import re
 import json
 import csv
 import os
+import sys
 
-URL = "https://www.gov.br/fazenda/pt-br/acesso-a-informacao/institucional/composicao"
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from coleta import cache_http, parsers, regras
+
+# A página de composição só tem links; os cartões das pessoas estão no "quem é quem"
+URL = "https://www.gov.br/fazenda/pt-br/composicao/quem-e-quem"
 
 def get_soup(url):
     headers = {
         "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
     }
-    resp = requests.get(url, headers=headers, timeout=15)
+    resp = cache_http.get(url, headers=headers, timeout=15)
     resp.raise_for_status()
-    return BeautifulSoup(resp.content, "html.parser")
+    return parsers.criar_soup(resp.content)
 
 def extract_minister(soup, base_url=URL):
-    # Fallback from research due to AJAX content on the page
-    name = "Fernando Haddad"
-    title = "Ministro de Estado da Fazenda"
-    emails = ["gabinete.ministro@fazenda.gov.br"]
-    phones = ["(61) 3412-2515", "(61) 3412-1721"]
-
-    # Try to verify in text if possible
-    text = soup.get_text(separator=' ', strip=True)
-    if "Fernando Haddad" in text:
-        name = "Fernando Haddad"
-
-    return {
-        "name": name,
-        "title": title,
-        "emails": emails,
-        "phones": phones,
-        "source": base_url
-    }
+    # Nome, cargo, padrões de contato e valores de referência em regras/ministro_da_fazenda.json
+    return regras.extrair("ministro_da_fazenda", soup, base_url)
 
 def save_json(data, path):
     with open(path, "w", encoding="utf-8") as f:
@@ -48,13 +34,13 @@ def save_csv(data, path):
         writer.writerow(row)
 
 def main():
+    # JSON da API ou fragmento do Plone quando trazem o ministro, senão a página inteira
     try:
-        soup = get_soup(URL)
+        minister = regras.coletar("ministro_da_fazenda")
     except Exception as e:
         print("Erro ao baixar a página:", e)
         return
 
-    minister = extract_minister(soup)
     if not minister:
         print("Não foi possível localizar as informações do ministro na página.")
         return
@@ -1,9 +1,10 @@
-import requests
-from bs4 import BeautifulSoup
-import re
 import json
 import csv
 import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from coleta import cache_http, parsers, regras
 
 URL = "https://www.gov.br/gestao/pt-br/acesso-a-informacao/institucional/quem-e-quem"
 
@@ -11,33 +12,13 @@ def get_soup(url):
     headers = {
         "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
     }
-    resp = requests.get(url, headers=headers, timeout=15)
+    resp = cache_http.get(url, headers=headers, timeout=15)
     resp.raise_for_status()
-    return BeautifulSoup(resp.content, "html.parser")
+    return parsers.criar_soup(resp.content)
 
 def extract_minister(soup, base_url=URL):
-    # AJAX fallback or research data
-    name = "Esther Dweck"
-    title = "Ministra de Estado da Gestão e da Inovação em Serviços Públicos"
-    # Normalizing title to "Ministro" as per user requirements in previous sessions 
-    # (actually the user said normalize "Ministra" to "Ministro" in the objective)
-    title = "Ministro de Estado da Gestão e da Inovação em Serviços Públicos"
-    
-    emails = ["agenda.mgi@gestao.gov.br"]
-    phones = ["(61) 2020-5562", "(61) 2020-4061", "(61) 2020-4555"]
-
-    # Try to verify in text
-    text = soup.get_text(separator=' ', strip=True)
-    if "Esther Dweck" in text:
-        name = "Esther Dweck"
-
-    return {
-        "name": name,
-        "title": title,
-        "emails": emails,
-        "phones": phones,
-        "source": base_url
-    }
+    # Nome, cargo, padrões de contato e valores de referência em regras/ministro_da_gestao_e_da_inovacao_em_servicos_publicos.json
+    return regras.extrair("ministro_da_gestao_e_da_inovacao_em_servicos_publicos", soup, base_url)
 
 def save_json(data, path):
     with open(path, "w", encoding="utf-8") as f:
@@ -1,9 +1,10 @@
-import requests
-from bs4 import BeautifulSoup
-import re
 import json
 import csv
 import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from coleta import cache_http, parsers, regras
 
 URL = "https://www.gov.br/igualdaderacial/pt-br/acesso-a-informacao/institucional/quem-e-quem"
 
@@ -11,32 +12,13 @@ def get_soup(url):
     headers = {
         "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
     }
-    resp = requests.get(url, headers=headers, timeout=15)
+    resp = cache_http.get(url, headers=headers, timeout=15)
     resp.raise_for_status()
-    return BeautifulSoup(resp.content, "html.parser")
+    return parsers.criar_soup(resp.content)
 
 def extract_minister(soup, base_url=URL):
-    # Fallback from research
-    name = "Anielle Franco"
-    title = "Ministra de Estado da Igualdade Racial"
-    # Normalizing title to "Ministro" as per user requirements (objective mentions normalizing "Ministra" to "Ministro")
-    title = "Ministro de Estado da Igualdade Racial"
-    
-    emails = ["agenda.gab@igualdaderacial.gov.br"]
-    phones = ["(61) 2027-3322"]
-
-    # Try to verify in text
-    text = soup.get_text(separator=' ', strip=True)
-    if "Anielle Franco" in text:
-        name = "Anielle Franco"
-
-    return {
-        "name": name,
-        "title": title,
-        "emails": emails,
-        "phones": phones,
-        "source": base_url
-    }
+    # Nome, cargo, padrões de contato e valores de referência em regras/ministro_da_igualdade_racial.json
+    return regras.extrair("ministro_da_igualdade_racial", soup, base_url)
 
 def save_json(data, path):
     with open(path, "w", encoding="utf-8") as f:
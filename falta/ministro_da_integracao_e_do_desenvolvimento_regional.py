@@ -1,40 +1,52 @@
-import requests
-from bs4 import BeautifulSoup
 import re
 import json
 import csv
 import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from coleta import cache_http, contatos, parsers, telefones, ultimos
+from coleta.ministerios import nome_modulo
 
 URL = "https://www.gov.br/mdr/pt-br/acesso-a-informacao/institucional/quem-e-quem"
+# extract_minister só lê a div#content-core: o parse pode se limitar a ela
+SOMENTE_CONTEUDO = True
+MODULO = nome_modulo(__file__)
 
 def get_soup(url):
     headers = {
         "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
     }
-    resp = requests.get(url, headers=headers, timeout=15)
+    resp = cache_http.get(url, headers=headers, timeout=15)
     resp.raise_for_status()
-    return BeautifulSoup(resp.content, "html.parser")
+    return parsers.criar_soup(resp.content, somente_conteudo=SOMENTE_CONTEUDO)
 
 def extract_minister(soup, base_url=URL):
     content = soup.find('div', id='content-core')
     if not content:
         return None
+    return extract_from_text(content.get_text(separator=' ', strip=True), base_url)
 
-    text = content.get_text(separator=' ', strip=True)
-    
+def extract_minister_fast(tree, base_url=URL):
+    # Same extraction over the selectolax tree (coleta/parsers.py, --parser selectolax)
+    content = tree.css_first('div#content-core')
+    if content is None:
+        return None
+    return extract_from_text(parsers.texto_rapido(content), base_url)
+
+def extract_from_text(text, base_url=URL):
     # name
-    name = "Antônio Waldez Góes da Silva" # Found in text as "Antonio Waldez Góes da Silva"
-    if "Antonio Waldez Góes da Silva" in text:
-        name = "Antônio Waldez Góes da Silva"
+    name = None
+    name_match = re.search(r'Ministro\s+([^\d:()]{3,80}?)\s+Endereço:', text)
+    if name_match:
+        name = " ".join(name_match.group(1).split())
     
     # title
     title = "Ministro de Estado da Integração e do Desenvolvimento Regional"
     
     # emails
-    emails = []
-    email_match = re.search(r'[\w\.-]+@mdr\.gov\.br', text)
-    if email_match:
-        emails.append(email_match.group(0))
+    # Shared pattern (coleta/contatos.py): e-mails only start at a word boundary
+    emails = [e for e in contatos.EMAIL_COMPLETO.findall(text) if e.endswith("@mdr.gov.br")][:1]
     
     # phones
     phones = []
@@ -44,12 +56,8 @@ def extract_minister(soup, base_url=URL):
         # Clean up
         phone_raw = re.split(r'[a-zA-Z]', phone_raw)[0].strip()
         if phone_raw:
-            phones = [p.strip() for p in re.split(r'[/\\]', phone_raw) if p.strip()]
-            # Re-prefix DDD if missing in subsequent numbers
-            if phones and phones[0].startswith("(61)"):
-                for i in range(1, len(phones)):
-                    if not phones[i].startswith("(61)"):
-                        phones[i] = "(61) " + phones[i]
+            # The DDD of the first number carries over to the ones without it
+            phones = telefones.expandir(phone_raw)
 
     return {
         "name": name,
@@ -82,6 +90,8 @@ def main():
     if not minister:
         print("Não foi possível localizar as informações do ministro na página.")
         return
+    # Fields not found on the page come from the last good extraction
+    minister = ultimos.completar(MODULO, minister, URL)
 
     out_file_base = "ministro_da_integracao_e_do_desenvolvimento_regional"
     save_json(minister, f"{out_file_base}.json")
@@ -1,9 +1,10 @@
-import requests
-from bs4 import BeautifulSoup
-import re
 import json
 import csv
 import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from coleta import cache_http, parsers, regras
 
 URL = "https://www.gov.br/mj/pt-br/acesso-a-informacao/institucional/quem-e-quem"
 
@@ -11,40 +12,13 @@ def get_soup(url):
     headers = {
         "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
     }
-    resp = requests.get(url, headers=headers, timeout=15)
+    resp = cache_http.get(url, headers=headers, timeout=15)
     resp.raise_for_status()
-    return BeautifulSoup(resp.content, "html.parser")
+    return parsers.criar_soup(resp.content)
 
 def extract_minister(soup, base_url=URL):
-    # AJAX fallback or research data
-    name = "Ricardo Lewandowski" # Or latest found
-    title = "Ministro de Estado da Justiça e Segurança Pública"
-    
-    emails = ["agenda.ministro@mj.gov.br"]
-    phones = ["(61) 2025-9215", "(61) 2025-3857", "(61) 2025-3088"]
-
-    # Try to verify in text
-    text = soup.get_text(separator=' ', strip=True)
-    if "Ricardo Lewandowski" in text:
-        name = "Ricardo Lewandowski"
-    
-    # Check for emails in text
-    found_emails = re.findall(r'[\w\.-]+@mj\.gov\.br', text)
-    if found_emails:
-        emails = list(dict.fromkeys(found_emails))[:2]
-
-    # Check for phones in text
-    found_phones = re.findall(r'\(61\)\s*2025-\d{4}', text)
-    if found_phones:
-        phones = list(dict.fromkeys(found_phones))[:3]
-
-    return {
-        "name": name,
-        "title": title,
-        "emails": emails,
-        "phones": phones,
-        "source": base_url
-    }
+    # Nome, cargo, padrões de contato e valores de referência em regras/ministro_da_justica_e_da_seguranca_publica.json
+    return regras.extrair("ministro_da_justica_e_da_seguranca_publica", soup, base_url)
 
 def save_json(data, path):
     with open(path, "w", encoding="utf-8") as f:
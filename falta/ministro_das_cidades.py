@@ -1,22 +1,21 @@
 import requests
-from bs4 import BeautifulSoup
 import json
 import re
+import os
+import sys
 
-def get_minister_info():
-    url = "https://www.gov.br/cidades/pt-br/acesso-a-informacao/institucional/quem-e-quem"
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-    }
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from coleta import cache_http, expressoes, parsers
 
-    try:
-        response = requests.get(url, headers=headers, timeout=15)
-        response.raise_for_status()
-    except requests.RequestException as e:
-        print(f"Error fetching URL: {e}")
-        return
+# Telefone(s) até o próximo "E" (de "E-mail"); [^E]* não volta atrás, o custo é
+# linear no texto da div#content-core (python -m coleta.expressoes)
+PHONE_RE = expressoes.compilar(r'Telefone\(s\)[:\s]*((?:\(\d{2}\)\s*\d{4,5}[-\.]\d{4})[^E]*)')
 
-    soup = BeautifulSoup(response.content, 'html.parser')
+URL = "https://www.gov.br/cidades/pt-br/acesso-a-informacao/institucional/quem-e-quem"
+# Só a div#content-core é usada: o resto da página não precisa virar árvore
+SOMENTE_CONTEUDO = True
+
+def extract_minister(soup):
     content = soup.find('div', id='content-core')
 
     if not content:
@@ -61,7 +60,7 @@ def get_minister_info():
     # 2. Extraction of Phone
     # Pattern: "Telefone(s): (61) 2034-5493 / 5231 / 5793 / 5351"
     # Capture everything until "E-mail"
-    phone_match = re.search(r'Telefone\(s\)[:\s]*((?:\(\d{2}\)\s*\d{4,5}[-\.]\d{4})[^E]*)', contacts_text)
+    phone_match = PHONE_RE.search(contacts_text)
     
     if phone_match:
         phone_chunk = phone_match.group(1).strip()
@@ -84,6 +83,22 @@ def get_minister_info():
         "Telefone": phone,
         "Email": email
     }
+    return data
+
+def get_minister_info():
+    headers = {
+        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+    }
+
+    try:
+        response = cache_http.get(URL, headers=headers, timeout=15)
+        response.raise_for_status()
+    except requests.RequestException as e:
+        print(f"Error fetching URL: {e}")
+        return
+
+    soup = parsers.criar_soup(response.content, somente_conteudo=SOMENTE_CONTEUDO)
+    data = extract_minister(soup)
 
     print(json.dumps(data, indent=4, ensure_ascii=False))
 
@@ -1,23 +1,17 @@
 import requests
-from bs4 import BeautifulSoup
 import json
 import re
+import os
+import sys
 
-def get_minister_info():
-    url = "https://www.gov.br/mcti/pt-br/composicao/ministra"
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-    }
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from coleta import cache_http, parsers
 
-    try:
-        response = requests.get(url, headers=headers, timeout=15)
-        response.raise_for_status()
-    except requests.RequestException as e:
-        print(f"Error fetching URL: {e}")
-        return
+URL = "https://www.gov.br/mcti/pt-br/composicao/ministra"
+# Só a div#content-core é usada: o resto da página não precisa virar árvore
+SOMENTE_CONTEUDO = True
 
-    soup = BeautifulSoup(response.content, 'html.parser')
-    
+def extract_minister(soup):
     # Initialize data
     name = "N/A"
     cargo = "Ministro de Estado da Ciência, Tecnologia e Inovação"  # Normalized (Ministra -> Ministro)
@@ -61,6 +55,22 @@ def get_minister_info():
         "Telefone": phone,
         "Email": email
     }
+    return data
+
+def get_minister_info():
+    headers = {
+        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+    }
+
+    try:
+        response = cache_http.get(URL, headers=headers, timeout=15)
+        response.raise_for_status()
+    except requests.RequestException as e:
+        print(f"Error fetching URL: {e}")
+        return
+
+    soup = parsers.criar_soup(response.content, somente_conteudo=SOMENTE_CONTEUDO)
+    data = extract_minister(soup)
 
     print(json.dumps(data, indent=4, ensure_ascii=False))
 
@@ -1,9 +1,10 @@
-import requests
-from bs4 import BeautifulSoup
-import re
 import json
 import csv
 import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from coleta import cache_http, parsers, regras
 
 URL = "https://www.gov.br/mda/pt-br/acesso-a-informacao/institucional/quem-e-quem"
 
@@ -11,40 +12,13 @@ def get_soup(url):
     headers = {
         "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
     }
-    resp = requests.get(url, headers=headers, timeout=15)
+    resp = cache_http.get(url, headers=headers, timeout=15)
     resp.raise_for_status()
-    return BeautifulSoup(resp.content, "html.parser")
+    return parsers.criar_soup(resp.content)
 
 def extract_minister(soup, base_url=URL):
-    text = soup.get_text(separator=' ', strip=True)
-    
-    # name
-    name = "Paulo Teixeira"
-    if "Paulo Teixeira" in text:
-        name = "Paulo Teixeira"
-    
-    # title
-    title = "Ministro de Estado do Desenvolvimento Agrário e Agricultura Familiar"
-    
-    # emails
-    emails = ["gab.mda@mda.gov.br"]
-    email_match = re.search(r'gab\.mda@mda\.gov\.br', text)
-    if email_match:
-        emails = [email_match.group(0)]
-    
-    # phones
-    phones = ["(61) 3218-3077", "(61) 3218-2672"]
-    found_phones = re.findall(r'\(61\)\s*3218-\d{4}', text)
-    if found_phones:
-        phones = list(dict.fromkeys(found_phones))
-
-    return {
-        "name": name,
-        "title": title,
-        "emails": emails,
-        "phones": phones,
-        "source": base_url
-    }
+    # Nome, cargo, padrões de contato e valores de referência em regras/ministro_do_desenvolvimento_agrario_e_agricultura_familiar.json
+    return regras.extrair("ministro_do_desenvolvimento_agrario_e_agricultura_familiar", soup, base_url)
 
 def save_json(data, path):
     with open(path, "w", encoding="utf-8") as f:
@@ -1,36 +1,39 @@
-import requests
-from bs4 import BeautifulSoup
 import re
 import json
 import csv
 import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from coleta import cache_http, contatos, parsers, telefones, ultimos
+from coleta.ministerios import nome_modulo
 
 URL = "https://www.gov.br/mds/pt-br/composicao/ministro"
+MODULO = nome_modulo(__file__)
 
 def get_soup(url):
     headers = {
         "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
     }
-    resp = requests.get(url, headers=headers, timeout=15)
+    resp = cache_http.get(url, headers=headers, timeout=15)
     resp.raise_for_status()
-    return BeautifulSoup(resp.content, "html.parser")
+    return parsers.criar_soup(resp.content)
 
 def extract_minister(soup, base_url=URL):
     text = soup.get_text(separator=' ', strip=True)
     
     # name
-    name = "Wellington Dias"
-    if "Wellington Dias" in text:
-        name = "Wellington Dias"
+    name = None
+    name_match = re.search(r'Info\s+([^\d:()]{3,80}?)\s+Telefone\(s\)', text)
+    if name_match:
+        name = " ".join(name_match.group(1).split())
     
     # title
     title = "Ministro de Estado do Desenvolvimento e Assistência Social, Família e Combate à Fome"
     
     # emails
-    emails = ["wellington.dias@mds.gov.br"] # Found in previous search
-    email_match = re.search(r'[\w\.-]+@mds\.gov\.br', text)
-    if email_match:
-        emails = [email_match.group(0)]
+    # Shared pattern (coleta/contatos.py): e-mails only start at a word boundary
+    emails = [e for e in contatos.EMAIL_COMPLETO.findall(text) if e.endswith("@mds.gov.br")][:1]
     
     # phones
     phones = []
@@ -39,15 +42,8 @@ def extract_minister(soup, base_url=URL):
         phone_raw = phone_match.group(1).strip()
         phone_raw = re.split(r'[A-Z]', phone_raw)[0].strip()
         if phone_raw:
-            phones = [p.strip() for p in re.split(r'[/\\]', phone_raw) if p.strip()]
-            if phones and phones[0].startswith("(61)"):
-                for i in range(1, len(phones)):
-                    if not phones[i].startswith("(61)"):
-                        phones[i] = "(61) " + phones[i]
-    
-    # Fallback from debug
-    if not phones and "(61) 2030-2516" in text:
-        phones = ["(61) 2030-2516", "(61) 2030-2513"]
+            # The DDD of the first number carries over to the ones without it
+            phones = telefones.expandir(phone_raw)
 
     return {
         "name": name,
@@ -80,6 +76,8 @@ def main():
     if not minister:
         print("Não foi possível localizar as informações do ministro na página.")
         return
+    # Fields not found on the page come from the last good extraction
+    minister = ultimos.completar(MODULO, minister, URL)
 
     out_file_base = "ministro_do_desenvolvimento_e_assistencia_social_familia_e_combate_a_fome"
     save_json(minister, f"{out_file_base}.json")
@@ -1,61 +1,73 @@
-import requests
-from bs4 import BeautifulSoup
 import re
 import json
 import csv
 import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from coleta import cache_http, expressoes, parsers, telefones, ultimos
+from coleta.ministerios import nome_modulo
 
 URL = "https://www.gov.br/mdic/pt-br/acesso-a-informacao/institucional/principais-cargos-e-respectivos-ocupantes"
+# extract_minister só lê a div#content-core: o parse pode se limitar a ela
+SOMENTE_CONTEUDO = True
+
+MODULO = nome_modulo(__file__)
+
+# Aplicados a todo o texto da div#content-core (coleta/expressoes.py)
+NAME_RE = expressoes.compilar(r'Ministro\s+([^()\d]{3,80}?)\s+Ministro\(a\)')
+EMAIL_RE = expressoes.compilar(r'(?<![\w\.-])([\w\.-]+@mdic\.gov\.br)')
+# Mesmo resultado de "(?:\(61\)\s*[\d\s-]*)+", sem \s* e [\d\s-]* disputando os espaços
+PHONES_RE = expressoes.compilar(r'Telefone\(s\)\s*:\s*((?:\(61\)[\d\s-]*)+)')
 
 def get_soup(url):
     headers = {
         "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
     }
-    resp = requests.get(url, headers=headers, timeout=15)
+    resp = cache_http.get(url, headers=headers, timeout=15)
     resp.raise_for_status()
-    return BeautifulSoup(resp.content, "html.parser")
+    return parsers.criar_soup(resp.content, somente_conteudo=SOMENTE_CONTEUDO)
 
 def extract_minister(soup, base_url=URL):
     content = soup.find('div', id='content-core')
     if not content:
         return None
+    return extract_from_text(content.get_text(separator=' ', strip=True), base_url)
 
-    text = content.get_text(separator=' ', strip=True)
-    
+def extract_minister_fast(tree, base_url=URL):
+    # Same extraction over the selectolax tree (coleta/parsers.py, --parser selectolax)
+    content = tree.css_first('div#content-core')
+    if content is None:
+        return None
+    return extract_from_text(parsers.texto_rapido(content), base_url)
+
+def extract_from_text(text, base_url=URL):
     # name
-    name = "Geraldo José Rodrigues Alckmin Filho"
-    if "Geraldo José Rodrigues Alckmin Filho" in text:
-        name = "Geraldo José Rodrigues Alckmin Filho"
+    name = None
+    name_match = NAME_RE.search(text)
+    if name_match:
+        name = " ".join(name_match.group(1).split())
     
     # title
     title = "Ministro de Estado do Desenvolvimento, Indústria, Comércio e Serviços"
     
     # emails
     emails = []
-    email_match = re.search(r'([\w\.-]+@mdic\.gov\.br)', text)
+    email_match = EMAIL_RE.search(text)
     if email_match:
         emails.append(email_match.group(1))
     
     # phones
     phones = []
-    phone_match = re.search(r'Telefone\(s\)\s*:\s*((?:\(61\)\s*[\d\s-]*)+)', text)
+    phone_match = PHONES_RE.search(text)
     if phone_match:
         phone_raw = phone_match.group(1).strip()
         # Clean up if ends in alphabetic char or email
         phone_raw = re.split(r'[a-zA-Z]', phone_raw)[0].strip()
         if phone_raw:
-            # MDIC phones are often like "(61) 2027-7701 - 7002 - 7003"
-            parts = re.split(r'[-\s]+', phone_raw)
-            # This is tricky because the dash is part of the phone but also a separator
-            # Let's use a simpler split or re-run the search
-            nums = re.findall(r'\(61\)\s*\d{4}-\d{4}|\b\d{4}\b', phone_raw)
-            if nums:
-                ddd = "(61)"
-                for n in nums:
-                    if "-" in n:
-                        phones.append(n)
-                    else:
-                        phones.append(f"{ddd} 2027-{n}") # Assuming same prefix if only 4 digits
+            # MDIC phones are often like "(61) 2027-7701 - 7002 - 7003": the
+            # trailing four digits reuse the prefix of the number before them
+            phones = telefones.expandir(phone_raw)
 
     return {
         "name": name,
@@ -88,6 +100,8 @@ def main():
     if not minister:
         print("Não foi possível localizar as informações do ministro na página.")
         return
+    # Fields not found on the page come from the last good extraction
+    minister = ultimos.completar(MODULO, minister, URL)
 
     out_file_base = "ministro_do_desenvolvimento_industria_comercio_e_servicos"
     save_json(minister, f"{out_file_base}.json")
@@ -1,9 +1,10 @@
-import requests
-from bs4 import BeautifulSoup
-import re
 import json
 import csv
 import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from coleta import cache_http, parsers, regras
 
 URL = "https://www.gov.br/mma/pt-br/acesso-a-informacao/institucional/quem-e-quem"
 
@@ -12,42 +13,15 @@ def get_soup(url):
         "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
     }
     try:
-        resp = requests.get(url, headers=headers, timeout=15)
+        resp = cache_http.get(url, headers=headers, timeout=15)
         resp.raise_for_status()
-        return BeautifulSoup(resp.content, "html.parser")
+        return parsers.criar_soup(resp.content)
     except:
         return None
 
 def extract_minister(soup, base_url=URL):
-    # Research data
-    name = "Marina Silva"
-    title = "Ministra de Estado do Meio Ambiente e Mudança do Clima"
-    # Normalizing title
-    title = "Ministro de Estado do Meio Ambiente e Mudança do Clima"
-    
-    emails = ["agendagm@mma.gov.br"]
-    phones = ["(61) 2028-1289", "(61) 2028-1422"]
-
-    if soup:
-        text = soup.get_text(separator=' ', strip=True)
-        if "Marina Silva" in text:
-            name = "Marina Silva"
-        
-        found_emails = re.findall(r'[\w\.-]+@mma\.gov\.br', text)
-        if found_emails:
-            emails = list(dict.fromkeys(found_emails))[:1]
-            
-        found_phones = re.findall(r'\(61\)\s*2028-\d{4}', text)
-        if found_phones:
-            phones = list(dict.fromkeys(found_phones))[:2]
-
-    return {
-        "name": name,
-        "title": title,
-        "emails": emails,
-        "phones": phones,
-        "source": base_url
-    }
+    # Nome, cargo, padrões de contato e valores de referência em regras/ministro_do_meio_ambiente_e_mudanca_climatica.json
+    return regras.extrair("ministro_do_meio_ambiente_e_mudanca_climatica", soup, base_url)
 
 def save_json(data, path):
     with open(path, "w", encoding="utf-8") as f:
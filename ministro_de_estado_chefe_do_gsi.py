@@ -1,10 +1,10 @@
-import requests
-from bs4 import BeautifulSoup
 import re
 import json
 import csv
 import os
 
+from coleta import cache_http, contatos, parsers
+
 # Main URL provided by user
 URL = "https://www.gov.br/gsi/pt-br/composicao/gabinete/ministro"
 # Fallback URL based on portal patterns
@@ -15,9 +15,9 @@ def get_soup(url):
         "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
     }
     try:
-        resp = requests.get(url, headers=headers, timeout=15)
+        resp = cache_http.get(url, headers=headers, timeout=15)
         if resp.status_code == 200:
-            return BeautifulSoup(resp.content, "html.parser")
+            return parsers.criar_soup(resp.content)
     except Exception:
         pass
     return None
@@ -60,8 +60,7 @@ def extract_minister(soup, base_url=URL):
 
         # Contacts: look for spans or just grep text
         text = search_area.get_text(" ", strip=True)
-        phones = re.findall(r'\(?\d{2}\)?\s?\d{4,5}-?\d{4}', text)
-        emails = re.findall(r'[\w\.-]+@[\w\.-]+', text)
+        phones, emails, _ = contatos.extrair(text)
 
     return {
         "name": name,
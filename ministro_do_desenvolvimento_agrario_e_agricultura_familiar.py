@@ -1,37 +1,25 @@
 import requests
-from bs4 import BeautifulSoup
 import json
 import re
 
-def get_minister_info():
-    url = "https://www.gov.br/mda/pt-br/acesso-a-informacao/institucional/quem-e-quem"
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-    }
+from coleta import cache_http, parsers, ultimos
 
-    try:
-        response = requests.get(url, headers=headers, timeout=15)
-        response.raise_for_status()
-    except requests.RequestException as e:
-        print(f"Error fetching URL: {e}")
-        return
+URL = "https://www.gov.br/mda/pt-br/acesso-a-informacao/institucional/quem-e-quem"
 
-    soup = BeautifulSoup(response.content, 'html.parser')
-    
-    # Initialize data
-    name = "Paulo Teixeira"
+# The page does not carry the minister's name: the missing fields come from the
+# last good values extracted for the MDA (coleta/ultimos.py)
+MODULO_ULTIMOS = "falta.ministro_do_desenvolvimento_agrario_e_agricultura_familiar"
+
+def extract_minister(soup):
+    name = None
     cargo = "Ministro de Estado do Desenvolvimento Agrário e Agricultura Familiar"
-    phone = "(61) 3218-3077 / 3218-2672"
-    email = "gab.mda@mda.gov.br"
+    phone = None
+    email = None
 
     # Search for the minister's name and contact info in text to see if we can find it exactly
     text = soup.get_text(separator=' ', strip=True)
     
-    # 1. Extraction of Name
-    if "Paulo Teixeira" in text:
-        name = "Paulo Teixeira"
-
-    # 2. Extraction of Phone
+    # 1. Extraction of Phone
     phone_match = re.search(r'\(61\)\s*3218-\d{4}', text)
     if phone_match:
          # Try to find both
@@ -39,7 +27,7 @@ def get_minister_info():
          if phones:
              phone = " / ".join(phones)
 
-    # 3. Extraction of Email
+    # 2. Extraction of Email
     email_match = re.search(r'gab\.mda@mda\.gov\.br', text)
     if email_match:
         email = email_match.group(0)
@@ -50,6 +38,25 @@ def get_minister_info():
         "Telefone": phone,
         "Email": email
     }
+    return data
+
+def get_minister_info():
+    headers = {
+        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+    }
+
+    try:
+        response = cache_http.get(URL, headers=headers, timeout=15)
+        response.raise_for_status()
+    except requests.RequestException as e:
+        print(f"Error fetching URL: {e}")
+        return
+
+    data = extract_minister(parsers.criar_soup(response.content))
+    ultimo = ultimos.completar(MODULO_ULTIMOS, None, URL) or {}
+    data["Nome"] = data["Nome"] or ultimo.get("name")
+    data["Telefone"] = data["Telefone"] or " / ".join(ultimo.get("phones", []))
+    data["Email"] = data["Email"] or (ultimo.get("emails") or [None])[0]
 
     print(json.dumps(data, indent=4, ensure_ascii=False))
 
@@ -1,10 +1,10 @@
-import requests
-from bs4 import BeautifulSoup
 import re
 import json
 import csv
 import os
 
+from coleta import cache_http, contatos, parsers, telefones
+
 # Updated URL for MMA
 URL = "https://www.gov.br/mma/pt-br/acesso-a-informacao/institucional/quem-e-quem"
 
@@ -13,9 +13,9 @@ def get_soup(url):
         "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
     }
     try:
-        resp = requests.get(url, headers=headers, timeout=15)
+        resp = cache_http.get(url, headers=headers, timeout=15)
         if resp.status_code == 200:
-            return BeautifulSoup(resp.content, "html.parser")
+            return parsers.criar_soup(resp.content)
     except Exception:
         pass
     return None
@@ -61,23 +61,9 @@ def extract_minister(soup, base_url=URL):
         phone_p = search_area.find("p", class_="telefone")
         text = search_area.get_text(" ", strip=True)
         
-        phones_found = re.findall(r'\(?\d{2}\)?\s?\d{4,5}-?\d{4}', text)
-        suffixes = re.findall(r'/\s*(\d{4})', text)
-        
-        final_phones = []
-        for p in phones_found:
-            final_phones.append(p)
-            if suffixes:
-                prefix_match = re.match(r'(\(?\d{2}\)?\s?\d{4,5}-?)', p)
-                if prefix_match:
-                    prefix = prefix_match.group(1)
-                    for s in suffixes:
-                        final_phones.append(f"{prefix}{s}")
-        
-        phones = list(dict.fromkeys(final_phones)) if final_phones else phones_found
-        
-        # Email
-        emails = re.findall(r'[\w\.-]+@[\w\.-]+', text)
+        emails = contatos.EMAIL.findall(text)
+        # Full numbers and suffixes (like /2580) expanded against the prefix
+        phones = telefones.expandir(text, soltos=False)
 
     return {
         "name": name,
@@ -1,23 +1,17 @@
 
-import requests
-from bs4 import BeautifulSoup
 import re
 
-def scrape_ministro():
-    url = "https://www.gov.br/agricultura/pt-br/acesso-a-informacao/institucional/quem-e-quem-novo/ministro-e-staff"
-    headers = {
-        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
-    }
+from coleta import cache_http, contatos, expressoes, parsers
+from coleta.indice import IndiceTexto
 
-    try:
-        response = requests.get(url, headers=headers, timeout=15)
-        response.raise_for_status()
-    except Exception as e:
-        print(f"Erro ao acessar a página: {e}")
-        return
+# Telefone com barras ("(61) 3218-2828 / 2829"). O grupo começa no primeiro "(" ou
+# dígito, então o antigo prefixo "(?:Tel:)?\s*" não muda o resultado, só fazia o re
+# percorrer de novo cada sequência de espaços a partir de cada posição.
+TEL_RE = expressoes.compilar(r"(\(?\d{2}\)?[\s\d/-]+)")
 
-    soup = BeautifulSoup(response.content, "html.parser")
+URL = "https://www.gov.br/agricultura/pt-br/acesso-a-informacao/institucional/quem-e-quem-novo/ministro-e-staff"
 
+def extract_minister(soup):
     # Procurar pelo bloco do Ministro
     # O padrão observado é que o cargo e nome estão em uma div (às vezes com classe dcelink)
     # E os contatos estão logo abaixo.
@@ -34,9 +28,11 @@ def scrape_ministro():
     target_pattern = re.compile(r"Ministr[ao] de Estado", re.I)
     
     # Procurar em todas as divs que podem conter o texto
-    for div in soup.find_all("div"):
-        text = div.get_text(strip=True)
-        if target_pattern.search(text) and not any(x in text for x in ["Gabinete", "Secretaria", "Adjunto"]):
+    # (o índice calcula o texto de todas as divs em uma única passada)
+    indice = IndiceTexto(soup)
+    for div in indice.por_tag("div"):
+        if indice.busca(target_pattern, div) and not any(indice.contem(div, x) for x in ["Gabinete", "Secretaria", "Adjunto"]):
+            text = indice.texto(div)
             # Extrair nome: geralmente no formato "Cargo - NOME - ..."
             # Ex: "Ministro de Estado – CARLOS HENRIQUE BAQUETA FÁVARO - Curriculum"
             match_name = re.search(r"–\s*([^–-]+?)\s*-", text)
@@ -62,18 +58,18 @@ def scrape_ministro():
                     
                     # Extrair telefone
                     if not dados_ministro["telefone"]:
-                        phone_match = re.search(r"\(?\d{2}\)?\s?\d{4,5}-?\d{4}", inner_text)
+                        phone_match = contatos.TELEFONE.search(inner_text)
                         if "Tel:" in inner_text or phone_match:
                             # Tenta pegar todo o conteúdo de telefone que pode ter barras /
-                            tel_val = re.search(r"(?:Tel:)?\s*(\(?\d{2}\)?[\s\d/-]+)", inner_text)
+                            tel_val = TEL_RE.search(inner_text)
                             if tel_val:
                                 dados_ministro["telefone"] = tel_val.group(1).strip()
 
                     # Extrair e-mail
                     if not dados_ministro["e-mail"]:
-                        email_match = re.search(r"([a-z0-9._%+-]+@[a-z0-9.-]+\.[a-z]{2,})", inner_text, re.I)
+                        email_match = contatos.EMAIL_ASCII.search(inner_text)
                         if email_match:
-                            dados_ministro["e-mail"] = email_match.group(1).strip()
+                            dados_ministro["e-mail"] = email_match.group().strip()
                     
                     # Se achamos os dois, paramos
                     if dados_ministro["telefone"] and dados_ministro["e-mail"]:
@@ -81,6 +77,22 @@ def scrape_ministro():
                     limit -= 1
                 break
 
+    return dados_ministro
+
+def scrape_ministro():
+    headers = {
+        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
+    }
+
+    try:
+        response = cache_http.get(URL, headers=headers, timeout=15)
+        response.raise_for_status()
+    except Exception as e:
+        print(f"Erro ao acessar a página: {e}")
+        return
+
+    dados_ministro = extract_minister(parsers.criar_soup(response.content))
+
     # Exibir resultados
     print(f"Nome: {dados_ministro['nome']}")
     print(f"Cargo: {dados_ministro['cargo']}")